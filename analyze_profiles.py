@@ -0,0 +1,67 @@
+"""
+StarSticks batch analyzer
+Aggregates binding statistics over a directory of exported layouts, without the GUI
+
+Usage:
+    python analyze_profiles.py PROFILE_DIR [--format json|csv] [--output FILE]
+                               [--top N] [--workers N] [--per-file FILE]
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+from src.core.batch_analyzer import analyze_directory
+
+
+def main():
+    """Parse arguments, run the analysis and write the report"""
+    parser = argparse.ArgumentParser(description="Aggregate Star Citizen binding statistics over many profiles")
+    parser.add_argument("directory", type=Path, help="Directory of exported layout XML files (searched recursively)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="Report format (default: json)")
+    parser.add_argument("--output", type=Path, help="Report file (default: stdout)")
+    parser.add_argument("--top", type=int, default=10, help="Entries per device/mode (default: 10)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--pattern", default="*.xml", help="Profile file name pattern (default: *.xml)")
+    parser.add_argument("--per-file", type=Path, help="Also stream one JSON line per profile to this file")
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 1
+
+    per_file = open(args.per_file, "w", encoding="utf-8") if args.per_file else None
+
+    def write_per_file(result):
+        per_file.write(json.dumps({
+            'path': result['path'],
+            'error': result['error'],
+            'bindings': len(result['bindings']),
+            'ms': round(result['seconds'] * 1000, 2),
+        }) + "\n")
+
+    try:
+        stats = analyze_directory(args.directory, args.pattern, args.workers,
+                                  on_result=write_per_file if per_file else None)
+    finally:
+        if per_file:
+            per_file.close()
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            stats.write_csv(out, args.top)
+        else:
+            stats.write_json(out, args.top)
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"Analyzed {stats.files} profile(s) ({len(stats.failed)} failed) in {stats.elapsed:.2f} s "
+          f"- {stats.files_per_second():.1f} files/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
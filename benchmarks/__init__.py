@@ -0,0 +1 @@
+"""Performance benchmarks for StarSticks (run with python -m benchmarks.<name>)"""
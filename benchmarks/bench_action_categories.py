@@ -0,0 +1,107 @@
+"""
+Benchmark: action categorization strategies
+Compares the old nested keyword loops, a combined regex, the flat memoized keyword table and actionmap lookups
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import ACTION_STEMS, ACTIONMAP_NAMES
+from src.core.action_categories import (
+    MODE_KEYWORDS, ActionMode, categorize_action, categorize_actions, categorize_by_keywords
+)
+
+# Extra names that match late modes or nothing at all, the slow paths of a keyword scan
+EXTRA_STEMS = [
+    'pl_exit_seat', 'mining_throttle_up', 'scanning_turret_toggle', 'rover_handbrake',
+    'starmap_zoom', 'visor_wipe', 'spectator_next', 'camera_orbit', 'debug_console',
+]
+
+MODE_SWITCHES = 10
+
+
+def legacy_categorize_action(action_name: str) -> ActionMode:
+    """categorize_action as it was before the keyword table"""
+    action_lower = action_name.lower()
+    for mode, keywords in MODE_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in action_lower:
+                return mode
+    return ActionMode.UI
+
+
+def build_regex_matcher():
+    """One combined regex: an ordered alternation of per-mode lookaheads keeps the mode priority"""
+    modes = tuple(MODE_KEYWORDS)
+    pattern = re.compile('^(?:' + '|'.join(
+        '(?=.*?(?:{}))()'.format('|'.join(map(re.escape, keywords))) for keywords in MODE_KEYWORDS.values()
+    ) + ')', re.DOTALL)
+
+    def regex_categorize_action(action_name: str) -> ActionMode:
+        match = pattern.match(action_name.lower())
+        return modes[match.lastindex - 1] if match else ActionMode.UI
+
+    return regex_categorize_action
+
+
+def action_names(count: int, distinct: int, seed: int = 0):
+    """Binding action names: `distinct` different actions repeated up to `count` bindings"""
+    rng = random.Random(seed)
+    stems = ACTION_STEMS + EXTRA_STEMS
+    pool = [f"{rng.choice(stems)}_{i}" for i in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(func, *args):
+    """Run func and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    regex_categorize_action = build_regex_matcher()
+    uncached = categorize_by_keywords.__wrapped__
+
+    print(f"{MODE_SWITCHES} mode switches, each categorizing every binding\n")
+    print(f"{'bindings':>9} {'distinct':>9} | {'loops s':>8} {'regex s':>8} {'table s':>8} | "
+          f"{'memo s':>8} {'batch s':>8} | {'speedup':>8} | {'same':>5} | {'actionmap s':>11}")
+    print("-" * 106)
+
+    for count, distinct in [(2_000, 1_000), (20_000, 1_000), (20_000, 20_000), (200_000, 5_000)]:
+        names = action_names(count, distinct)
+        actionmaps = [ACTIONMAP_NAMES[i % len(ACTIONMAP_NAMES)] for i in range(len(names))]
+
+        def switches(categorize):
+            return [[categorize(name) for name in names] for _ in range(MODE_SWITCHES)][-1]
+
+        expected, loops_time = timed(switches, legacy_categorize_action)
+        regex_result, regex_time = timed(switches, regex_categorize_action)
+        table_result, table_time = timed(switches, uncached)
+
+        categorize_by_keywords.cache_clear()
+        memo_result, memo_time = timed(switches, categorize_by_keywords)
+        categorize_by_keywords.cache_clear()
+        batch_result, batch_time = timed(
+            lambda: [categorize_actions(names) for _ in range(MODE_SWITCHES)][-1])
+        _, actionmap_time = timed(lambda: [
+            [categorize_action(name, actionmap) for name, actionmap in zip(names, actionmaps)]
+            for _ in range(MODE_SWITCHES)
+        ])
+
+        same = expected == regex_result == table_result == memo_result == batch_result
+        print(f"{count:>9} {distinct:>9} | {loops_time:>8.3f} {regex_time:>8.3f} {table_time:>8.3f} | "
+              f"{memo_time:>8.3f} {batch_time:>8.3f} | {loops_time / batch_time:>7.1f}x | "
+              f"{'yes' if same else 'NO':>5} | {actionmap_time:>11.3f}")
+
+    print("\n'speedup' is batch vs loops. Above the memo size (8192 names) 'memo' degrades toward 'table'.")
+    print("'actionmap' is the lookup bindings with a known actionmap take; it never scans keywords.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: conflict detection on large synthetic profiles
+Compares a full find_conflicts pass with an incremental ConflictIndex update after one file reloads
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import ACTION_STEMS, ACTIONMAP_NAMES, random_input
+from src.core.action_categories import categorize_by_keywords
+from src.core.binding_conflicts import ConflictIndex, find_conflicts
+from src.core.binding_index import BindingIndex
+from src.models.binding_models import Binding
+
+
+def make_bindings(num_bindings: int, seed: int = 0):
+    """Build joystick bindings with realistic action and actionmap names (and so realistic modes)"""
+    rng = random.Random(seed)
+    return [
+        Binding(f"{rng.choice(ACTION_STEMS)}_{i}", random_input(rng, 0.0), '', rng.choice(ACTIONMAP_NAMES))
+        for i in range(num_bindings)
+    ]
+
+
+RELOADED_BINDINGS = 200  # Bindings replaced by one reloaded file
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    print(f"{'bindings':>9} | {'keyword ms':>10} {'actionmap ms':>12} | {'reload ms':>9} | {'conflicts':>9}")
+    print("-" * 61)
+    for num_bindings in [500, 2_000, 10_000, 50_000]:
+        bindings = make_bindings(num_bindings)
+        index = BindingIndex(bindings)
+
+        # Keyword: guess every action's mode from its name; actionmap: look the mode up
+        start = time.perf_counter()
+        find_conflicts(bindings, lambda binding: categorize_by_keywords.__wrapped__(binding.action))
+        keyword = time.perf_counter() - start
+
+        start = time.perf_counter()
+        conflicts = find_conflicts(index.bindings())
+        actionmap = time.perf_counter() - start
+
+        # Reload: one file's bindings are replaced and the conflicts are collected again
+        conflict_index = ConflictIndex(bindings)
+        conflict_index.conflicts()
+        removed = bindings[:RELOADED_BINDINGS]
+        added = [Binding(f"{binding.action}_rebound", binding.input, '', binding.actionmap)
+                 for binding in make_bindings(RELOADED_BINDINGS, seed=1)]
+        start = time.perf_counter()
+        conflict_index.update(added=added, removed=removed)
+        conflict_index.conflicts()
+        reload = time.perf_counter() - start
+
+        print(f"{num_bindings:>9} | {keyword * 1000:>10.1f} {actionmap * 1000:>12.1f} | {reload * 1000:>9.1f} | "
+              f"{len(conflicts):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: ingesting profile snapshots into the SQLite binding history
+Simulates a series of game patches that each touch a few bindings
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import random_input
+from src.core.binding_history import BindingHistory
+from src.models.binding_models import Binding
+
+
+def patch_series(num_snapshots: int, num_bindings: int, seed: int = 0):
+    """Yield successive profiles; every fifth load is a patch that rebinds ~2%"""
+    rng = random.Random(seed)
+    profile = [Binding(f"v_action_{i}", random_input(rng, 0.3)) for i in range(num_bindings)]
+    for snapshot in range(num_snapshots):
+        if snapshot and snapshot % 5 == 0:
+            for i in rng.sample(range(num_bindings), num_bindings // 50):
+                profile[i] = Binding(profile[i].action, random_input(rng, 0.3))
+        yield list(profile)
+
+
+def main():
+    """Run the benchmark and print the results"""
+    num_snapshots = 100
+    num_bindings = 5_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "history.sqlite3"
+        history = BindingHistory(db_path)
+
+        start = time.perf_counter()
+        for i, profile in enumerate(patch_series(num_snapshots, num_bindings)):
+            history.record_snapshot("LIVE", profile, label=f"load {i}", taken_at=1_700_000_000 + i * 3600)
+        elapsed = time.perf_counter() - start
+
+        history.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size = os.path.getsize(db_path)
+
+        query_start = time.perf_counter()
+        change = history.last_change("js2_button5", "LIVE")
+        query_time = time.perf_counter() - query_start
+
+        counts = {
+            table: history.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('snapshots', 'binding_sets', 'bindings', 'binding_set_members')
+        }
+        history.close()
+
+    print(f"Ingested {num_snapshots} snapshots of {num_bindings} bindings in {elapsed:.2f} s "
+          f"({elapsed / num_snapshots * 1000:.1f} ms each)")
+    print(f"Database size: {size / 1e6:.2f} MB "
+          f"(raw snapshots would hold {num_snapshots * num_bindings:,} rows)")
+    print(f"Rows: {counts}")
+    print(f"last_change('js2_button5') in {query_time * 1000:.2f} ms -> "
+          f"{change and {k: change[k] for k in ('label', 'before', 'after')}}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: per-binding dicts vs slotted, interned Binding records
+Compares memory held by a large profile and the cost of filtering it
+"""
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import ACTION_STEMS, random_input
+from src.models.binding_models import Binding, BindingCollection
+
+
+def make_raw_bindings(count: int, seed: int = 0):
+    """Generate (action, input) pairs as fresh strings, like an XML parser would"""
+    rng = random.Random(seed)
+    # ''.join forces new string objects so interning has something to share
+    return [
+        (''.join(rng.choice(ACTION_STEMS)), ''.join(random_input(rng, 0.4)))
+        for _ in range(count)
+    ]
+
+
+def build_dicts(raw):
+    """The old representation"""
+    return [{'action': action, 'input': input_str, 'multiTap': ''} for action, input_str in raw]
+
+
+def build_records(raw):
+    """The new representation"""
+    return BindingCollection(Binding(action, input_str) for action, input_str in raw)
+
+
+def measure_memory(builder, raw) -> int:
+    """Bytes allocated by builder that are still alive after it returns"""
+    tracemalloc.start()
+    result = builder(raw)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def time_loop(func, repeat: int = 5) -> float:
+    """Best-of-N wall time for func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    print(f"{'bindings':>9} | {'dict MB':>8} {'record MB':>10} | {'dict iter ms':>12} {'record iter ms':>15} "
+          f"| {'dict filter ms':>14} {'record filter ms':>17}")
+    print("-" * 100)
+
+    for count in [10_000, 100_000, 500_000]:
+        raw = make_raw_bindings(count)
+        dict_memory = measure_memory(build_dicts, raw)
+        record_memory = measure_memory(build_records, raw)
+
+        dicts = build_dicts(raw)
+        records = build_records(raw)
+
+        dict_iter = time_loop(lambda: [b.get('action', '') for b in dicts])
+        record_iter = time_loop(lambda: [b.action for b in records])
+        dict_filter = time_loop(lambda: [b for b in dicts if 'js' in b.get('input', '').lower()])
+        record_filter = time_loop(lambda: records.filter(device='js'))
+
+        print(f"{count:>9} | {dict_memory / 1e6:>8.2f} {record_memory / 1e6:>10.2f} | "
+              f"{dict_iter * 1000:>12.2f} {record_iter * 1000:>15.2f} | "
+              f"{dict_filter * 1000:>14.2f} {record_filter * 1000:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: extracting only joystick rebinds vs every device
+Shows what the devices={'js'} extraction filter saves on keyboard-heavy profiles
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import write_profile
+from src.core.binding_parser import BindingParser
+
+
+def result_size(result) -> int:
+    """Bytes held by a parse result: its lists, Binding records and their distinct strings"""
+    seen = set()
+    size = 0
+    for bindings in result.values():
+        size += sys.getsizeof(bindings)
+        for binding in bindings:
+            size += sys.getsizeof(binding)
+            for value in (binding.action, binding.input, binding.multi_tap, binding.device):
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    size += sys.getsizeof(value)
+    return size
+
+
+def measure(parser: BindingParser, path: Path, runs: int = 9):
+    """
+    Time full and joystick-only parses, interleaved so machine noise hits both alike
+
+    Returns:
+        (full result, median seconds, joystick result, median seconds)
+    """
+    timings = {None: [], 'js': []}
+    results = {}
+    for _ in range(runs):
+        for key in timings:
+            start = time.perf_counter()
+            results[key] = parser.parse_binding_file(path, streaming=True, devices={key} if key else None)
+            timings[key].append(time.perf_counter() - start)
+
+    median = {key: sorted(values)[runs // 2] for key, values in timings.items()}
+    return results[None], median[None], results['js'], median['js']
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    parser = BindingParser(xml_backend='etree')
+    num_actions = 20_000
+
+    print(f"{'kb share':>8} | {'all s':>7} {'all MB':>7} {'records':>8} | "
+          f"{'js s':>7} {'js MB':>7} {'records':>8} | {'saved':>6} | {'same js':>7}")
+    print("-" * 86)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for keyboard_share in [0.0, 0.3, 0.6, 0.9]:
+            path, _ = write_profile(Path(tmp) / f"bench_{keyboard_share}.xml", num_actions, keyboard_share)
+
+            everything, all_time, joystick, js_time = measure(parser, path)
+            all_mem, js_mem = result_size(everything), result_size(joystick)
+
+            all_records = sum(len(bindings) for bindings in everything.values())
+            js_records = sum(len(bindings) for bindings in joystick.values())
+            same = "yes" if joystick['joystick_bindings'] == everything['joystick_bindings'] else "NO"
+
+            print(f"{keyboard_share:>8.1f} | {all_time:>7.3f} {all_mem / 1e6:>7.2f} {all_records:>8} | "
+                  f"{js_time:>7.3f} {js_mem / 1e6:>7.2f} {js_records:>8} | "
+                  f"{1 - js_time / all_time:>6.0%} | {same:>7}")
+
+    print(f"\n{num_actions} actions per profile; 'MB' is the size of the parse result.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: joystick lookups through the device registry vs a full re-detect
+Measures name lookups with and without an SDL joystick subsystem restart, and blacklist matching
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from src.core.joystick_detector import JoystickDetector
+
+REPEATS = 200
+
+# Device names as SDL reports them, including ones the blacklist should drop
+SAMPLE_NAMES = [
+    'LEFT VPC Stick MT-50CM2', 'RIGHT VPC Stick MT-50CM2', 'VPC Alpha Prime L', 'Thrustmaster T.16000M',
+    'Keychron K8 Pro', 'Logitech G502 Mouse', 'SynPS/2 Synaptics TouchPad', 'Wacom Intuos Pen',
+]
+
+
+def legacy_get_joystick_by_name(detector: JoystickDetector, name: str):
+    """get_joystick_by_name as it was: restart the subsystem and open every device"""
+    pygame.joystick.quit()
+    pygame.joystick.init()
+    for i in range(pygame.joystick.get_count()):
+        joy = pygame.joystick.Joystick(i)
+        joy.init()
+        device_name = joy.get_name()
+        joy.quit()
+        if not detector.is_blacklisted(device_name) and name.lower() in device_name.lower():
+            return device_name
+    return None
+
+
+def legacy_is_blacklisted(device_name: str) -> bool:
+    """is_blacklisted as it was: one substring test per blacklisted word"""
+    name_lower = device_name.lower()
+    return any(blacklisted in name_lower for blacklisted in JoystickDetector.DEVICE_BLACKLIST)
+
+
+def median_ms(func, *args, repeats: int = REPEATS) -> float:
+    """Median time of `repeats` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    detector = JoystickDetector()
+    devices = detector.detect(filter_blacklisted=False)
+    print(f"{len(devices)} connected device(s): {', '.join(device['name'] for device in devices) or 'none'}\n")
+
+    query = devices[0]['name'][:6] if devices else 'vpc'
+    # The legacy lookup closes the registry's handles, so it runs last
+    registry_ms = median_ms(detector.get_joystick_by_name, query)
+    legacy_ms = median_ms(legacy_get_joystick_by_name, detector, query, repeats=20)
+    print(f"get_joystick_by_name({query!r})")
+    print(f"  re-detect {legacy_ms:>10.3f} ms")
+    print(f"  registry  {registry_ms:>10.4f} ms   ({legacy_ms / registry_ms:.0f}x)")
+
+    names = SAMPLE_NAMES * 100
+    legacy_ms = median_ms(lambda: [legacy_is_blacklisted(name) for name in names])
+    compiled_ms = median_ms(lambda: [detector.is_blacklisted(name) for name in names])
+    same = [legacy_is_blacklisted(name) for name in names] == [detector.is_blacklisted(name) for name in names]
+    print(f"\nis_blacklisted over {len(names)} names")
+    print(f"  word loop {legacy_ms:>10.3f} ms")
+    print(f"  compiled  {compiled_ms:>10.3f} ms   (pattern + per-name memo; same result: {'yes' if same else 'NO'})")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
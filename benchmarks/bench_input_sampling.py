@@ -0,0 +1,117 @@
+"""
+Benchmark: short-tap capture of GUI-thread polling vs the background sampler
+Replays synthetic button taps against each sampling schedule and measures ring buffer cost per sample
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.input_buffer import SAMPLE_BUTTON, InputRingBuffer
+
+DURATION = 120.0  # Seconds of simulated input
+FRAME_SECONDS = 0.016  # GUI frame interval the ring is drained at
+STALL_CHANCE = 0.02  # Chance that a GUI tick is followed by a stall (parse, layout, ...)
+STALL_SECONDS = (0.05, 0.4)
+
+
+def make_taps(seed: int = 0):
+    """Button taps as (down, up) times: mostly quick presses, some held ones"""
+    rng = random.Random(seed)
+    taps = []
+    t = 0.0
+    while t < DURATION:
+        t += rng.uniform(0.1, 0.6)
+        held = rng.uniform(0.008, 0.05) if rng.random() < 0.7 else rng.uniform(0.05, 0.3)
+        taps.append((t, t + held))
+        t += held
+    return taps
+
+
+def gui_poll_times(interval: float, seed: int = 1):
+    """Tick times of a GUI-thread timer that stalls now and then"""
+    rng = random.Random(seed)
+    times = []
+    t = 0.0
+    while t < DURATION + 1:
+        times.append(t)
+        t += interval
+        if rng.random() < STALL_CHANCE:
+            t += rng.uniform(*STALL_SECONDS)
+    return times
+
+
+def thread_sample_times(rate_hz: int):
+    """Sample times of the background sampler (unaffected by GUI stalls)"""
+    return [i / rate_hz for i in range(int((DURATION + 1) * rate_hz))]
+
+
+def captured_taps(taps, sample_times) -> int:
+    """Taps that at least one sample saw as pressed"""
+    captured = 0
+    position = 0
+    for down, up in taps:
+        while position < len(sample_times) and sample_times[position] < down:
+            position += 1
+        if position < len(sample_times) and sample_times[position] < up:
+            captured += 1
+    return captured
+
+
+def ring_cost(rate_hz: int, changes_per_sample: int):
+    """Per-sample push cost and per-frame drain cost of the ring, in microseconds"""
+    ring = InputRingBuffer()
+    samples_per_frame = max(1, int(rate_hz * FRAME_SECONDS)) * changes_per_sample
+    frames = 2000
+
+    push_time = drain_time = 0.0
+    drained = 0
+    for frame in range(frames):
+        start = time.perf_counter()
+        for i in range(samples_per_frame):
+            ring.push(frame + i * 1e-6, 1, SAMPLE_BUTTON, i % 32, 1.0)
+        push_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        drained += len(ring.drain())
+        drain_time += time.perf_counter() - start
+
+    assert drained == frames * samples_per_frame and ring.dropped == 0
+    return push_time / drained * 1e6, drain_time / frames * 1e6, samples_per_frame
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    taps = make_taps()
+    short = [tap for tap in taps if tap[1] - tap[0] < 0.05]
+    print(f"{len(taps)} taps over {DURATION:.0f} s, {len(short)} shorter than 50 ms\n")
+
+    print(f"{'schedule':<28} | {'all taps':>9} {'short taps':>11}")
+    print("-" * 54)
+    schedules = [
+        ("GUI timer 33 ms (30 Hz)", gui_poll_times(0.033)),
+        ("GUI timer 16 ms (60 Hz)", gui_poll_times(0.016)),
+        ("sampler thread 250 Hz", thread_sample_times(250)),
+        ("sampler thread 500 Hz", thread_sample_times(500)),
+        ("sampler thread 1000 Hz", thread_sample_times(1000)),
+    ]
+    for name, sample_times in schedules:
+        all_rate = captured_taps(taps, sample_times) / len(taps) * 100
+        short_rate = captured_taps(short, sample_times) / len(short) * 100
+        print(f"{name:<28} | {all_rate:>8.1f}% {short_rate:>10.1f}%")
+
+    print(f"\n{'rate':>6} {'changes':>8} | {'per frame':>9} | {'push us':>8} {'drain us/frame':>15}")
+    print("-" * 56)
+    for rate_hz in [250, 500, 1000]:
+        for changes in [1, 8]:
+            push_us, drain_us, per_frame = ring_cost(rate_hz, changes)
+            print(f"{rate_hz:>6} {changes:>8} | {per_frame:>9} | {push_us:>8.2f} {drain_us:>15.1f}")
+
+    print("\n'changes' is the number of controls changing per sample (axes in motion change every sample).")
+    print("GUI stalls delay the timer's ticks; the sampler thread keeps its schedule and the ring keeps the taps.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: shared input tokenizer vs the old per-character parsers
+Tokenizes a million SC input strings with each implementation
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import random_input
+from src.core.binding_parser import BindingParser
+from src.core.input_tokenizer import tokenize_input
+
+
+def legacy_parse_joystick_input(input_string: str) -> dict:
+    """BindingParser.parse_joystick_input as it was before the tokenizer"""
+    result = {'device': None, 'button': None, 'axis': None, 'hat': None}
+    if not input_string:
+        return result
+    input_lower = input_string.lower()
+    if 'js' in input_lower:
+        try:
+            device_start = input_lower.find('js') + 2
+            device_end = device_start
+            while device_end < len(input_lower) and input_lower[device_end].isdigit():
+                device_end += 1
+            result['device'] = int(input_lower[device_start:device_end])
+        except (ValueError, IndexError):
+            pass
+    if 'button' in input_lower:
+        try:
+            button_start = input_lower.find('button') + 6
+            button_num = ''
+            for char in input_lower[button_start:]:
+                if char.isdigit():
+                    button_num += char
+                else:
+                    break
+            if button_num:
+                result['button'] = int(button_num)
+        except ValueError:
+            pass
+    if 'axis' in input_lower or 'x' in input_lower or 'y' in input_lower or 'z' in input_lower:
+        result['axis'] = input_string
+    if 'hat' in input_lower or 'pov' in input_lower:
+        result['hat'] = input_string
+    return result
+
+
+def legacy_parse_input_string(input_str: str) -> dict:
+    """DualJoystickView.parse_input_string as it was before the tokenizer"""
+    result = {'sc_js_number': None, 'button': None, 'axis': None}
+    if not input_str:
+        return result
+    input_lower = input_str.lower()
+    if 'js' in input_lower:
+        try:
+            device_start = input_lower.find('js') + 2
+            device_end = device_start
+            while device_end < len(input_lower) and input_lower[device_end].isdigit():
+                device_end += 1
+            result['sc_js_number'] = int(input_lower[device_start:device_end])
+        except (ValueError, IndexError):
+            pass
+    if 'button' in input_lower:
+        try:
+            button_start = input_lower.find('button') + 6
+            button_num = ''
+            for char in input_lower[button_start:]:
+                if char.isdigit():
+                    button_num += char
+                else:
+                    break
+            if button_num:
+                result['button'] = int(button_num)
+        except ValueError:
+            pass
+    for axis in ['rotx', 'roty', 'rotz', 'x', 'y', 'z']:
+        if f'_{axis}' in input_lower or input_lower.endswith(axis):
+            result['axis'] = axis
+            break
+    return result
+
+
+def run(label: str, func, inputs):
+    """Time func over every input and print the throughput"""
+    start = time.perf_counter()
+    for input_string in inputs:
+        func(input_string)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:>7.3f} s  {len(inputs) / elapsed / 1e6:>6.2f} M tokens/s")
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    rng = random.Random(0)
+    count = 1_000_000
+    # Real profiles reuse a few hundred distinct inputs many times over
+    inputs = [random_input(rng, keyboard_share=0.2) for _ in range(count)]
+    distinct = len(set(inputs))
+
+    print(f"{count:,} inputs, {distinct} distinct\n")
+    run("legacy parse_joystick_input", legacy_parse_joystick_input, inputs)
+    run("legacy parse_input_string", legacy_parse_input_string, inputs)
+
+    tokenize_input.cache_clear()
+    run("tokenize_input (memoized)", tokenize_input, inputs)
+    run("tokenize_input (no memo)", tokenize_input.__wrapped__, inputs)
+    run("BindingParser.parse_joystick_input", BindingParser().parse_joystick_input, inputs)
+    print(f"\nMemo: {tokenize_input.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
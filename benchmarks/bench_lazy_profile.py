@@ -0,0 +1,51 @@
+"""
+Benchmark: lazy per-actionmap parsing vs a full parse
+Measures the cost of indexing a profile and of materializing one mode versus the whole file
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import write_profile
+from src.core.action_categories import ActionMode
+from src.core.binding_parser import BindingParser
+
+
+def timed(func, *args, **kwargs):
+    """Run func and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    parser = BindingParser()
+    mode = ActionMode.MINING
+
+    print(f"{'actions':>8} {'file MB':>8} | {'full s':>7} | {'index s':>7} {f'{mode.value} s':>9} "
+          f"{'maps':>7} | {'rest s':>7} | {'same':>5}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_actions in [1_000, 10_000, 50_000]:
+            path, size = write_profile(Path(tmp) / f"bench_{num_actions}.xml", num_actions, grouped=True)
+
+            full, full_time = timed(parser.parse_binding_file, path, streaming=True)
+            profile, index_time = timed(parser.open_profile, path)
+            _, mode_time = timed(profile.materialize, mode)
+            maps = f"{profile.parsed_count()}/{len(profile.actionmap_names())}"
+            _, rest_time = timed(profile.materialize, ActionMode.ALL)
+            same = "yes" if profile.bindings() == full else "NO"
+
+            print(f"{num_actions:>8} {size / 1e6:>8.2f} | {full_time:>7.3f} | {index_time:>7.3f} "
+                  f"{mode_time:>9.3f} {maps:>7} | {rest_time:>7.3f} | {same:>5}")
+
+    print("\n'index' + 'mode' is what a mode switch costs on a cold load; 'rest' completes the file later.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: serial vs pooled parsing of a Mappings directory
+Finds the file count at which a worker pool starts to pay off
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import write_profile
+import src.core.binding_parser as binding_parser
+from src.core.binding_parser import BindingParser
+
+
+def timed_parse(parser: BindingParser, directory: Path, names, use_processes: bool, force_pool: bool) -> float:
+    """Parse all files once, forcing either the serial or the pooled path"""
+    binding_parser.PARALLEL_MIN_FILES = 0 if force_pool else len(names) + 1
+    start = time.perf_counter()
+    parser.parse_binding_files(directory, names, use_processes=use_processes, use_cache=False)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    parser = BindingParser()
+    original_threshold = binding_parser.PARALLEL_MIN_FILES
+    file_counts = [1, 2, 4, 8, 16, 32, 64]
+    actions_per_file = 2_000
+
+    print(f"CPU cores: {os.cpu_count()}, {actions_per_file} actions per file\n")
+    print(f"{'files':>6} | {'serial s':>9} {'threads s':>10} {'processes s':>12}")
+    print("-" * 44)
+
+    crossover = None
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        names = []
+        for i in range(max(file_counts)):
+            path, _ = write_profile(directory / f"layout_{i:03d}.xml", actions_per_file, seed=i)
+            names.append(path.name)
+
+        for count in file_counts:
+            subset = names[:count]
+            serial = timed_parse(parser, directory, subset, use_processes=False, force_pool=False)
+            threads = timed_parse(parser, directory, subset, use_processes=False, force_pool=True)
+            processes = timed_parse(parser, directory, subset, use_processes=True, force_pool=True)
+            print(f"{count:>6} | {serial:>9.3f} {threads:>10.3f} {processes:>12.3f}")
+
+            if crossover is None and processes < serial:
+                crossover = count
+
+    binding_parser.PARALLEL_MIN_FILES = original_threshold
+
+    if crossover is None:
+        print("\nThe process pool never beat serial parsing on this machine.")
+    else:
+        print(f"\nThe process pool pays off from {crossover} files "
+              f"(PARALLEL_MIN_FILES is {original_threshold}).")
+
+
+if __name__ == "__main__":
+    main()
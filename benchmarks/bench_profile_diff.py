@@ -0,0 +1,54 @@
+"""
+Benchmark: diff_profiles on large synthetic profiles
+Checks that comparing two profiles scales linearly with their size
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import random_input
+from src.core.binding_diff import diff_profiles
+from src.models.binding_models import Binding
+
+
+def make_profiles(num_bindings: int, change_share: float = 0.05, seed: int = 0):
+    """Build a profile and a copy with a share of its bindings moved or dropped"""
+    rng = random.Random(seed)
+    old = [
+        Binding(f"v_action_{i}", random_input(rng, 0.0))
+        for i in range(num_bindings)
+    ]
+    new = []
+    for binding in old:
+        roll = rng.random()
+        if roll < change_share / 2:
+            new.append(Binding(binding.action, random_input(rng, 0.0)))
+        elif roll < change_share:
+            continue
+        else:
+            new.append(binding)
+    new.extend(
+        Binding(f"v_new_action_{i}", random_input(rng, 0.0))
+        for i in range(int(num_bindings * change_share / 2))
+    )
+    return old, new
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    print(f"{'bindings':>9} | {'diff ms':>8} {'us/binding':>11} | {'added':>6} {'removed':>8} {'rebound':>8}")
+    print("-" * 62)
+    for num_bindings in [1_000, 10_000, 50_000, 100_000]:
+        old, new = make_profiles(num_bindings)
+        start = time.perf_counter()
+        result = diff_profiles(old, new)
+        elapsed = time.perf_counter() - start
+        print(f"{num_bindings:>9} | {elapsed * 1000:>8.1f} {elapsed / num_bindings * 1e6:>11.2f} | "
+              f"{len(result['added']):>6} {len(result['removed']):>8} {len(result['rebound']):>8}")
+
+
+if __name__ == "__main__":
+    main()
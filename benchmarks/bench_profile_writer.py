@@ -0,0 +1,86 @@
+"""
+Benchmark: surgical rebind patches vs re-serializing the whole tree
+Measures the cost of saving a few edited bindings back to layouts of growing size
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import write_profile
+from src.core.binding_parser import BindingParser
+from src.core.binding_writer import ProfileWriter
+
+
+def timed(func, *args, **kwargs):
+    """Run func and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def rewrite_tree(path: Path, edits):
+    """Baseline: parse the tree, change the rebinds, serialize everything and rename it into place"""
+    tree = ET.parse(path)
+    wanted = {(binding.action, binding.input): new_input for binding, new_input in edits}
+    for action in tree.getroot().iter('action'):
+        for rebind in action.iter('rebind'):
+            new_input = wanted.get((action.get('name'), rebind.get('input')))
+            if new_input is not None:
+                rebind.set('input', new_input)
+    temp_path = path.with_suffix('.xml.tmp')
+    tree.write(temp_path, encoding='utf-8')
+    os.replace(temp_path, path)
+
+
+def patch_file(writer: ProfileWriter, edits) -> int:
+    """Queue the edits on an open writer and save them; returns the size of the rendered patches"""
+    for binding, new_input in edits:
+        writer.rebind(binding, new_input)
+    moved = sum(len(replacement) for _, _, replacement in writer.patches())
+    writer.save()
+    return moved
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    parser = BindingParser()
+
+    print(f"{'actions':>8} {'file MB':>8} {'edits':>6} | {'tree s':>7} | {'open s':>7} {'save s':>7} "
+          f"{'speedup':>8} | {'bytes moved':>11} | {'same':>5}")
+    print("-" * 86)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_actions in [1_000, 10_000, 50_000]:
+            source, size = write_profile(Path(tmp) / f"bench_{num_actions}.xml", num_actions)
+            joystick = parser.read_binding_file(source)['joystick_bindings']
+
+            for num_edits in [1, 10, 100]:
+                step = max(1, len(joystick) // num_edits)
+                edits = [(binding, f"js2_button{100 + i}") for i, binding in enumerate(joystick[::step][:num_edits])]
+
+                tree_path = Path(tmp) / "tree.xml"
+                patch_path = Path(tmp) / "patch.xml"
+                shutil.copyfile(source, tree_path)
+                shutil.copyfile(source, patch_path)
+
+                _, tree_time = timed(rewrite_tree, tree_path, edits)
+                writer, open_time = timed(ProfileWriter, patch_path)
+                moved, save_time = timed(patch_file, writer, edits)
+                same = parser.read_binding_file(tree_path) == parser.read_binding_file(patch_path)
+
+                print(f"{num_actions:>8} {size / 1e6:>8.2f} {num_edits:>6} | {tree_time:>7.3f} | "
+                      f"{open_time:>7.3f} {save_time:>7.4f} {tree_time / save_time:>7.0f}x | "
+                      f"{moved:>11} | {'yes' if same else 'NO':>5}")
+
+    print("\n'open' is paid once when editing starts; every later 'save' only renders the changed tags.")
+    print("'bytes moved' is the size of the rendered patches; the rest of the file is copied verbatim.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: tree-building vs streaming parse of actionmaps XML
+Compares wall time and peak Python memory on synthetic profiles
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import write_profile
+from src.core.binding_parser import BindingParser
+
+
+def measure(func, *args, **kwargs):
+    """Run func once for timing and once under tracemalloc for peak memory"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed, peak
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    parser = BindingParser()
+    sizes = [1_000, 10_000, 50_000]
+
+    print(f"{'actions':>8} {'file MB':>8} | {'tree s':>8} {'tree MB':>8} | "
+          f"{'stream s':>8} {'stream MB':>9} | {'gen MB':>7}")
+    print("-" * 74)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_actions in sizes:
+            path, size = write_profile(Path(tmp) / f"bench_{num_actions}.xml", num_actions)
+
+            tree_result, tree_time, tree_peak = measure(parser.parse_binding_file, path)
+            stream_result, stream_time, stream_peak = measure(
+                parser.parse_binding_file, path, streaming=True
+            )
+
+            _, _, generator_peak = measure(lambda: sum(1 for _ in parser.iter_bindings(path)))
+
+            if tree_result != stream_result:
+                print(f"MISMATCH: streaming output differs for {num_actions} actions")
+
+            print(f"{num_actions:>8} {size / 1e6:>8.2f} | {tree_time:>8.3f} {tree_peak / 1e6:>8.2f} | "
+                  f"{stream_time:>8.3f} {stream_peak / 1e6:>9.2f} | {generator_peak / 1e6:>7.2f}")
+
+    print("\n'gen MB' consumes iter_bindings() without keeping the bindings, which is flat in file size.")
+
+
+if __name__ == "__main__":
+    main()
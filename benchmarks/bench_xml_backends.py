@@ -0,0 +1,92 @@
+"""
+Benchmark: stdlib ElementTree vs lxml XML backends
+Compares parse time and memory of both backends on synthetic profiles, tree and streaming
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_profiles import write_profile
+from src.core.binding_parser import BindingParser
+from src.core.xml_backend import available_backends
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 where unsupported)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def measure(path: str, backend: str, streaming: bool):
+    """
+    Parse a profile in a fresh process so peak RSS belongs to this run only
+
+    Returns:
+        (best of 3 seconds, peak RSS growth in MB, peak traced Python MB, parsed bindings)
+    """
+    parser = BindingParser(xml_backend=backend)
+    baseline = peak_rss_mb()
+
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        result = parser.parse_binding_file(Path(path), streaming=streaming)
+        best = min(best, time.perf_counter() - start)
+    rss = peak_rss_mb() - baseline
+
+    tracemalloc.start()
+    parser.parse_binding_file(Path(path), streaming=streaming)
+    _, traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, rss, traced / 1e6, result
+
+
+def run_isolated(path: str, backend: str, streaming: bool):
+    """Run measure() in a single-use worker process"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(measure, path, backend, streaming).result()
+
+
+def main():
+    """Run the benchmark and print a results table"""
+    backends = available_backends()
+    if 'lxml' not in backends:
+        print("lxml is not installed - only the stdlib backend will be measured (pip install lxml)\n")
+
+    print(f"{'actions':>8} {'file MB':>8} {'mode':>7} | {'backend':>7} | {'best s':>7} "
+          f"{'RSS MB':>7} {'py MB':>7} | {'same':>5}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_actions in [1_000, 10_000, 50_000]:
+            path, size = write_profile(Path(tmp) / f"bench_{num_actions}.xml", num_actions)
+            for streaming in (False, True):
+                reference = None
+                for backend in reversed(backends):
+                    best, rss, traced, result = run_isolated(str(path), backend, streaming)
+                    if reference is None:
+                        reference = result
+                    same = "yes" if result == reference else "NO"
+                    print(f"{num_actions:>8} {size / 1e6:>8.2f} {'stream' if streaming else 'tree':>7} | "
+                          f"{backend:>7} | {best:>7.3f} {rss:>7.1f} {traced:>7.1f} | {same:>5}")
+
+    print("\n'RSS MB' is peak resident growth (includes lxml's C memory); "
+          "'py MB' is Python allocations only (tracemalloc).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Synthetic Star Citizen actionmaps profiles for benchmarking
+Generates layout XML files shaped like the ones the game writes
+"""
+import random
+from pathlib import Path
+from typing import Tuple
+
+
+ACTIONMAP_NAMES = [
+    'spaceship_general', 'spaceship_movement', 'spaceship_targeting',
+    'spaceship_weapons', 'spaceship_missiles', 'spaceship_defensive',
+    'spaceship_power', 'spaceship_radar', 'spaceship_hud', 'spaceship_mining',
+    'turret_movement', 'turret_main', 'player', 'player_choice', 'prone',
+    'zero_gravity_eva', 'vehicle_general', 'vehicle_driver', 'mapui',
+    'ui_textfield', 'stopwatch', 'player_emotes', 'debug',
+]
+
+ACTION_STEMS = [
+    'v_pitch', 'v_yaw', 'v_roll', 'v_strafe_up', 'v_strafe_left',
+    'v_ifcs_toggle_cruise_control', 'v_weapon_cycle_fwd', 'v_shield_raise_level_front',
+    'v_target_cycle_hostile_fwd', 'v_power_toggle', 'v_toggle_quantum_mode',
+    'v_attack1_group1', 'mining_toggle_laser', 'turret_fire', 'player_sprint',
+    'fps_reload', 'eva_roll_left', 'vehicle_brake', 'ui_toggle_mobiglas',
+    'foip_pushtotalk', 'pc_interaction_select', 'emote_wave',
+]
+
+JOYSTICK_INPUTS = [
+    'button{n}', 'button{n}', 'button{n}', 'x', 'y', 'z', 'rotx', 'roty', 'rotz',
+    'slider1', 'hat1_up', 'hat1_down', 'hat1_left', 'hat1_right',
+]
+
+KEYBOARD_KEYS = [
+    'w', 'a', 's', 'd', 'q', 'e', 'f', 'space', 'lshift', 'lctrl+f', 'lalt+1',
+    'f1', 'tab', 'np_1', 'insert', 'home',
+]
+
+
+def random_input(rng: random.Random, keyboard_share: float) -> str:
+    """
+    Pick a random rebind input string
+
+    Args:
+        rng: Random number generator
+        keyboard_share: Fraction of inputs that should be keyboard/mouse
+
+    Returns:
+        Input string such as "js1_button12" or "kb1_lctrl+f"
+    """
+    if rng.random() < keyboard_share:
+        if rng.random() < 0.85:
+            return f"kb1_{rng.choice(KEYBOARD_KEYS)}"
+        return f"mo1_mouse{rng.randint(1, 5)}"
+
+    device = rng.randint(1, 2)
+    suffix = rng.choice(JOYSTICK_INPUTS).format(n=rng.randint(1, 32))
+    return f"js{device}_{suffix}"
+
+
+def profile_xml(num_actions: int, keyboard_share: float = 0.3, seed: int = 0, grouped: bool = False) -> str:
+    """
+    Build the text of a synthetic actionmaps profile
+
+    Args:
+        num_actions: Number of <action> elements to generate
+        keyboard_share: Fraction of rebinds that are keyboard/mouse
+        seed: Random seed, so runs are repeatable
+        grouped: Give every action of an actionmap the same stem, so each
+            actionmap belongs to a single mode like in real profiles
+
+    Returns:
+        XML document text
+    """
+    rng = random.Random(seed)
+    lines = [
+        '<ActionMaps version="1" optionsVersion="2" rebindVersion="2" profileName="bench">',
+        ' <CustomisationUIHeader label="bench" description="" image="">',
+        '  <devices>',
+        '   <keyboard instance="1"/>',
+        '   <mouse instance="1"/>',
+        '   <joystick instance="1"/>',
+        '   <joystick instance="2"/>',
+        '  </devices>',
+        ' </CustomisationUIHeader>',
+        ' <options type="joystick" instance="1" Product="L-VPC Stick MT-50CM3  {0194x3344-0000-0000-0000-504944564944}"/>',
+        ' <options type="joystick" instance="2" Product="R-VPC Stick MT-50CM3  {0195x3344-0000-0000-0000-504944564944}"/>',
+        ' <modifiers />',
+    ]
+
+    per_map = max(1, num_actions // len(ACTIONMAP_NAMES))
+    written = 0
+    map_index = 0
+    while written < num_actions:
+        map_name = ACTIONMAP_NAMES[map_index % len(ACTIONMAP_NAMES)]
+        if map_index >= len(ACTIONMAP_NAMES):
+            map_name = f"{map_name}_{map_index // len(ACTIONMAP_NAMES)}"
+        lines.append(f' <actionmap name="{map_name}">')
+        for _ in range(min(per_map, num_actions - written)):
+            stem = ACTION_STEMS[map_index % len(ACTION_STEMS)] if grouped else rng.choice(ACTION_STEMS)
+            action = f"{stem}_{written}"
+            lines.append(f'  <action name="{action}">')
+            for _ in range(rng.randint(1, 2)):
+                multitap = ' multiTap="2"' if rng.random() < 0.05 else ''
+                lines.append(f'   <rebind input="{random_input(rng, keyboard_share)}"{multitap}/>')
+            lines.append('  </action>')
+            written += 1
+        lines.append(' </actionmap>')
+        map_index += 1
+
+    lines.append('</ActionMaps>')
+    return '\n'.join(lines) + '\n'
+
+
+def write_profile(path: Path, num_actions: int, keyboard_share: float = 0.3, seed: int = 0,
+                  grouped: bool = False) -> Tuple[Path, int]:
+    """
+    Write a synthetic profile to disk
+
+    Args:
+        path: Destination file
+        num_actions: Number of <action> elements to generate
+        keyboard_share: Fraction of rebinds that are keyboard/mouse
+        seed: Random seed
+        grouped: One mode per actionmap (see profile_xml)
+
+    Returns:
+        (path, size in bytes)
+    """
+    text = profile_xml(num_actions, keyboard_share, seed, grouped)
+    path.write_text(text, encoding='utf-8')
+    return path, path.stat().st_size
@@ -3,6 +3,7 @@ StarSticks - Star Citizen Joystick Binding Visualizer
 Main entry point for the application
 """
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from src.gui.main_window import MainWindow
 
@@ -23,4 +24,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed so the frozen .exe can start binding-parser worker processes
+    multiprocessing.freeze_support()
     main()
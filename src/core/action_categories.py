@@ -3,7 +3,9 @@ Star Citizen action categorization
 Categorizes SC actions into modes: Flight, Ground, EVA, Mining, etc.
 """
 from enum import Enum
-from typing import Set
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Tuple
 
 
 class ActionMode(Enum):
@@ -58,28 +60,150 @@ MODE_KEYWORDS = {
 }
 
 
-def categorize_action(action_name: str) -> ActionMode:
+# Actionmaps of the game's layout files and the mode their actions belong to.
+# Actions in other actionmaps are categorized by MODE_KEYWORDS.
+ACTIONMAP_MODES = MappingProxyType({
+    'seat_general': ActionMode.FLIGHT,
+    'spaceship_general': ActionMode.FLIGHT,
+    'spaceship_view': ActionMode.FLIGHT,
+    'spaceship_movement': ActionMode.FLIGHT,
+    'spaceship_quantum': ActionMode.FLIGHT,
+    'spaceship_docking': ActionMode.FLIGHT,
+    'spaceship_targeting': ActionMode.FLIGHT,
+    'spaceship_targeting_advanced': ActionMode.FLIGHT,
+    'spaceship_target_hailing': ActionMode.FLIGHT,
+    'spaceship_scanning': ActionMode.FLIGHT,
+    'spaceship_ping': ActionMode.FLIGHT,
+    'spaceship_radar': ActionMode.FLIGHT,
+    'spaceship_weapons': ActionMode.FLIGHT,
+    'spaceship_missiles': ActionMode.FLIGHT,
+    'spaceship_defensive': ActionMode.FLIGHT,
+    'spaceship_auto_weapons': ActionMode.FLIGHT,
+    'spaceship_salvage': ActionMode.FLIGHT,
+    'spaceship_power': ActionMode.FLIGHT,
+    'spaceship_hud': ActionMode.FLIGHT,
+    'spaceship_mining': ActionMode.MINING,
+    'turret_main': ActionMode.TURRET,
+    'turret_movement': ActionMode.TURRET,
+    'turret_advanced': ActionMode.TURRET,
+    'player': ActionMode.GROUND,
+    'player_choice': ActionMode.GROUND,
+    'prone': ActionMode.GROUND,
+    'tractor_beam': ActionMode.GROUND,
+    'zero_gravity_eva': ActionMode.EVA,
+    'zero_gravity_traversal': ActionMode.EVA,
+    'vehicle_general': ActionMode.VEHICLE,
+    'vehicle_driver': ActionMode.VEHICLE,
+    'mapui': ActionMode.UI,
+    'ui_textfield': ActionMode.UI,
+    'ui_notification': ActionMode.UI,
+    'player_emotes': ActionMode.UI,
+    'stopwatch': ActionMode.UI,
+    'character_customizer': ActionMode.UI,
+    'incoming_call': ActionMode.UI,
+    'spectator': ActionMode.UI,
+    'default': ActionMode.UI,
+    'debug': ActionMode.UI,
+})
+
+
+def build_keyword_table(mode_keywords: Dict[ActionMode, List[str]]) -> Tuple[Tuple[str, ActionMode], ...]:
     """
-    Categorize a Star Citizen action into a mode
+    Flatten mode keywords into one list in match priority order
+
+    A keyword containing an earlier keyword can never decide a match (the
+    earlier one always hits first), so it is dropped.
+
+    Args:
+        mode_keywords: Mode -> keywords, in priority order (like MODE_KEYWORDS)
+
+    Returns:
+        (keyword, mode) pairs; the first keyword found in an action decides its mode
+    """
+    table = []
+    for mode, keywords in mode_keywords.items():
+        for keyword in keywords:
+            if not any(earlier in keyword for earlier, _ in table):
+                table.append((keyword, mode))
+    return tuple(table)
+
+
+KEYWORD_TABLE = build_keyword_table(MODE_KEYWORDS)
+
+
+@lru_cache(maxsize=8192)
+def categorize_by_keywords(action_name: str) -> ActionMode:
+    """
+    Guess the mode of an action from its name
+
+    Modes are tried in MODE_KEYWORDS order and the first one with a keyword
+    in the action name wins. Results are memoized, since the same few
+    thousand actions are categorized again on every load and mode change.
 
     Args:
         action_name: The action name from SC binding XML
 
     Returns:
-        The ActionMode this action belongs to
+        The ActionMode this action most likely belongs to
     """
     action_lower = action_name.lower()
 
-    # Check each mode's keywords
-    for mode, keywords in MODE_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in action_lower:
-                return mode
+    for keyword, mode in KEYWORD_TABLE:
+        if keyword in action_lower:
+            return mode
 
     # Default to UI/General if no specific category found
     return ActionMode.UI
 
 
+def categorize_action(action_name: str, actionmap: str = '') -> ActionMode:
+    """
+    Categorize a Star Citizen action into a mode
+
+    Args:
+        action_name: The action name from SC binding XML
+        actionmap: Name of the <actionmap> the action is in ('' if unknown)
+
+    Returns:
+        The mode of the actionmap, or a keyword guess for unknown actionmaps
+    """
+    mode = ACTIONMAP_MODES.get(actionmap)
+    if mode is None:
+        mode = categorize_by_keywords(action_name)
+    return mode
+
+
+def categorize_binding(binding) -> ActionMode:
+    """
+    Categorize a Binding record into a mode
+
+    Args:
+        binding: Binding record
+
+    Returns:
+        The ActionMode of its action
+    """
+    return categorize_action(binding.action, binding.actionmap)
+
+
+def categorize_actions(action_names: Iterable[str], actionmap: str = '') -> List[ActionMode]:
+    """
+    Categorize many actions at once
+
+    Each distinct name is categorized once, however often it repeats.
+
+    Args:
+        action_names: Action names from SC binding XML
+        actionmap: Name of the <actionmap> the actions are in ('' if unknown)
+
+    Returns:
+        The ActionMode of each action, in the same order
+    """
+    action_names = list(action_names)
+    modes = {name: categorize_action(name, actionmap) for name in dict.fromkeys(action_names)}
+    return [modes[name] for name in action_names]
+
+
 def get_mode_description(mode: ActionMode) -> str:
     """
     Get a user-friendly description of a mode
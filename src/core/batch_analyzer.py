@@ -0,0 +1,225 @@
+"""
+Headless batch profile analyzer
+Parses whole directories of exported layouts on a process pool and aggregates binding statistics
+"""
+import csv
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+from src.core.action_categories import categorize_binding
+from src.core.binding_parser import BINDING_TYPES, BindingParser
+from src.core.input_tokenizer import KIND_UNBOUND, tokenize_input
+
+
+# Jobs kept in flight per worker, so huge directories are never queued up front
+IN_FLIGHT_PER_WORKER = 4
+
+
+def iter_profile_files(directory: Path, pattern: str = "*.xml") -> Iterator[Path]:
+    """
+    Walk a directory tree lazily, yielding profile files
+
+    Args:
+        directory: Root directory to search
+        pattern: Glob pattern profile file names must match
+
+    Yields:
+        Profile file paths, in directory order
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(root) / name
+            if path.match(pattern):
+                yield path
+
+
+def analyze_profile(file_path: str) -> Dict:
+    """
+    Parse and summarize one profile (runs in a pool worker)
+
+    Only the small summary crosses the process boundary, never the parsed records.
+    Any error is reported in the result, so one bad file cannot stop a batch.
+
+    Args:
+        file_path: Path to the profile XML
+
+    Returns:
+        {'path', 'error', 'seconds', 'bindings'} where bindings is a list of
+        (device, mode, normalized input, action) tuples
+    """
+    start = time.perf_counter()
+    rows = []
+    try:
+        parsed = BindingParser().read_binding_file(Path(file_path))
+        for binding_type in BINDING_TYPES:
+            for binding in parsed[binding_type]:
+                token = tokenize_input(binding.input)
+                if token.kind == KIND_UNBOUND:
+                    continue
+                device = f"{token.device}{token.device_index}" if token.device else 'other'
+                rows.append((device, categorize_binding(binding).value, token.normalized, binding.action))
+    except (ET.ParseError, OSError) as e:
+        return {'path': file_path, 'error': str(e), 'seconds': time.perf_counter() - start, 'bindings': []}
+    except Exception as e:
+        # Malformed content the parser does not anticipate (bad attribute values, ...)
+        return {'path': file_path, 'error': f"{type(e).__name__}: {e}",
+                'seconds': time.perf_counter() - start, 'bindings': []}
+
+    return {'path': file_path, 'error': None, 'seconds': time.perf_counter() - start, 'bindings': rows}
+
+
+class ProfileStats:
+    """Running aggregate of analyzed profiles; its size depends on distinct bindings, not files"""
+
+    def __init__(self):
+        self.files = 0
+        self.failed = []  # (path, error)
+        self.total_bindings = 0
+        self.binding_counts = Counter()  # (device, mode, input, action) -> profiles using it
+        self.action_counts = Counter()  # (mode, action) -> profiles binding it
+        self.elapsed = 0.0
+
+    def add(self, result: Dict):
+        """
+        Fold one analyze_profile result into the totals
+
+        Args:
+            result: Result of analyze_profile
+        """
+        self.files += 1
+        if result['error']:
+            self.failed.append((result['path'], result['error']))
+            return
+
+        rows = set(result['bindings'])
+        self.total_bindings += len(result['bindings'])
+        self.binding_counts.update(rows)
+        self.action_counts.update({(mode, action) for _, mode, _, action in rows})
+
+    def files_per_second(self) -> float:
+        """Throughput of the last run"""
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    def top_bindings(self, top: int = 10) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+        """
+        Get the most common bindings per device and per mode
+
+        Args:
+            top: Entries to keep per group
+
+        Returns:
+            (by device, by mode); each maps the group name to a list of
+            {'device', 'mode', 'input', 'action', 'profiles'} dictionaries, most common first
+        """
+        by_device = {}
+        by_mode = {}
+        for (device, mode, input_str, action), count in self.binding_counts.most_common():
+            entry = {'device': device, 'mode': mode, 'input': input_str, 'action': action, 'profiles': count}
+            for groups, group in ((by_device, device), (by_mode, mode)):
+                entries = groups.setdefault(group, [])
+                if len(entries) < top:
+                    entries.append(entry)
+        return by_device, by_mode
+
+    def to_dict(self, top: int = 10) -> Dict:
+        """
+        Summarize the aggregate
+
+        Args:
+            top: Entries to keep per group
+
+        Returns:
+            JSON-serializable summary dictionary
+        """
+        by_device, by_mode = self.top_bindings(top)
+        top_actions = {}
+        for (mode, action), count in self.action_counts.most_common():
+            entries = top_actions.setdefault(mode, [])
+            if len(entries) < top:
+                entries.append({'action': action, 'profiles': count})
+
+        return {
+            'files': self.files,
+            'failed': [{'path': path, 'error': error} for path, error in self.failed],
+            'bindings': self.total_bindings,
+            'seconds': round(self.elapsed, 3),
+            'files_per_second': round(self.files_per_second(), 1),
+            'top_bindings_by_device': by_device,
+            'top_bindings_by_mode': by_mode,
+            'top_actions_by_mode': top_actions,
+        }
+
+    def write_json(self, out: TextIO, top: int = 10):
+        """Write the summary as JSON"""
+        json.dump(self.to_dict(top), out, indent=2)
+        out.write("\n")
+
+    def write_csv(self, out: TextIO, top: int = 10):
+        """Write the top bindings as CSV rows, one per (group, binding)"""
+        by_device, by_mode = self.top_bindings(top)
+        writer = csv.writer(out)
+        writer.writerow(['group_by', 'group', 'device', 'mode', 'input', 'action', 'profiles'])
+        for group_by, groups in (('device', by_device), ('mode', by_mode)):
+            for group, entries in groups.items():
+                for entry in entries:
+                    writer.writerow([group_by, group, entry['device'], entry['mode'],
+                                     entry['input'], entry['action'], entry['profiles']])
+
+
+def analyze_directory(directory: Path, pattern: str = "*.xml", max_workers: Optional[int] = None,
+                      on_result: Optional[Callable[[Dict], None]] = None) -> ProfileStats:
+    """
+    Analyze every profile under a directory on a process pool
+
+    Results are folded into the aggregate as they complete and only a
+    bounded window of jobs is in flight, so memory stays flat no matter how
+    many profiles there are.
+
+    Args:
+        directory: Root directory to search
+        pattern: Glob pattern profile file names must match
+        max_workers: Worker processes (defaults to every core)
+        on_result: Called with each analyze_profile result, e.g. to stream per-file output
+
+    Returns:
+        The aggregated ProfileStats
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    window = max_workers * IN_FLIGHT_PER_WORKER
+    stats = ProfileStats()
+    start = time.perf_counter()
+
+    def collect(futures):
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself failed (e.g. it was killed), so the file never reported back
+                result = {'path': paths[future], 'error': f"{type(e).__name__}: {e}", 'seconds': 0.0,
+                          'bindings': []}
+            del paths[future]
+            stats.add(result)
+            if on_result:
+                on_result(result)
+
+    paths = {}  # In-flight future -> profile path
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for path in iter_profile_files(directory, pattern):
+            future = executor.submit(analyze_profile, str(path))
+            paths[future] = str(path)
+            pending.add(future)
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(pending)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
@@ -0,0 +1,234 @@
+"""
+Persistent cache of parsed binding files
+Stores parse results on disk keyed by a fingerprint of the source XML
+"""
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+# Default cap on the total size of the cache directory (bytes)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+CACHE_SUFFIX = '.bin'
+
+# Bump when the shape of cached parse results changes, so old entries miss
+CACHE_FORMAT_VERSION = 3
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the per-user cache directory for StarSticks
+
+    Returns:
+        %LOCALAPPDATA%/StarSticks/cache on Windows, ~/.cache/starsticks elsewhere
+    """
+    local_app_data = os.environ.get('LOCALAPPDATA')
+    if local_app_data:
+        return Path(local_app_data) / "StarSticks" / "cache"
+    return Path.home() / ".cache" / "starsticks"
+
+
+def default_data_dir() -> Path:
+    """
+    Get the per-user data directory for StarSticks (files that are not disposable cache)
+
+    Returns:
+        %LOCALAPPDATA%/StarSticks on Windows, $XDG_DATA_HOME/starsticks
+        (~/.local/share/starsticks) elsewhere
+    """
+    local_app_data = os.environ.get('LOCALAPPDATA')
+    if local_app_data:
+        return Path(local_app_data) / "StarSticks"
+    data_home = os.environ.get('XDG_DATA_HOME')
+    return (Path(data_home) if data_home else Path.home() / ".local" / "share") / "starsticks"
+
+
+def hash_file(file_path: Path) -> str:
+    """
+    Hash the contents of a file
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_file(file_path: Path, content_hash: Optional[str] = None) -> Tuple:
+    """
+    Fingerprint a source file
+
+    Take it before parsing the file, so a rewrite during the parse leaves
+    the stored entry out of date instead of passing it off as current.
+
+    Args:
+        file_path: The XML binding file
+        content_hash: Precomputed content hash, computed if not given
+
+    Returns:
+        (cache format version, resolved path, size, mtime in ns, content hash)
+    """
+    stat = os.stat(file_path)
+    if content_hash is None:
+        content_hash = hash_file(file_path)
+    return (CACHE_FORMAT_VERSION, str(Path(file_path).resolve()), stat.st_size,
+            stat.st_mtime_ns, content_hash)
+
+
+class BindingCache:
+    """On-disk cache of parsed bindings keyed by path, size, mtime and content hash"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for cache entries (defaults to default_cache_dir())
+            max_bytes: Total size the cache may grow to before old entries are evicted
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, file_path: Path, variant: str = '') -> Path:
+        """
+        Get the cache entry path for a source file
+
+        Args:
+            file_path: The XML binding file
+            variant: Distinguishes differently filtered parses of the same file
+
+        Returns:
+            Path of the cache entry
+        """
+        key = hashlib.blake2b(str(Path(file_path).resolve()).encode('utf-8'), digest_size=16)
+        if variant:
+            key.update(b'\0' + variant.encode('utf-8'))
+        return self.cache_dir / f"{key.hexdigest()}{CACHE_SUFFIX}"
+
+    def load(self, file_path: Path, variant: str = '') -> Optional[Dict]:
+        """
+        Load cached bindings for a file if they are still valid
+
+        A matching path, size and mtime is a hit without touching the XML.
+        If only the mtime moved, the content hash decides.
+
+        Args:
+            file_path: The XML binding file
+            variant: Cache variant the bindings were stored under
+
+        Returns:
+            Parsed bindings dictionary, or None on a miss
+        """
+        entry = self.entry_path(file_path, variant)
+        try:
+            stat = os.stat(file_path)
+            with open(entry, 'rb') as f:
+                cached_fingerprint, payload = pickle.loads(f.read())
+            version, path, size, mtime_ns, content_hash = cached_fingerprint
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+
+        if (version != CACHE_FORMAT_VERSION or path != str(Path(file_path).resolve())
+                or size != stat.st_size):
+            self.misses += 1
+            return None
+
+        if mtime_ns != stat.st_mtime_ns:
+            # Touched but possibly unchanged - compare contents before giving up
+            if hash_file(file_path) != content_hash:
+                self.misses += 1
+                return None
+            self._write_entry(entry, fingerprint_file(file_path, content_hash), payload)
+
+        try:
+            bindings = pickle.loads(zlib.decompress(payload))
+        except (zlib.error, pickle.UnpicklingError, EOFError, ValueError):
+            self.misses += 1
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return bindings
+
+    def store(self, file_path: Path, bindings: Dict, fingerprint: Tuple, variant: str = ''):
+        """
+        Store parsed bindings for a file
+
+        Call evict() once after a batch of stores to keep the cache in max_bytes.
+
+        Args:
+            file_path: The XML binding file
+            bindings: Parsed bindings dictionary
+            fingerprint: fingerprint_file() result taken before the file was parsed
+            variant: Distinguishes differently filtered parses of the same file
+        """
+        try:
+            payload = zlib.compress(pickle.dumps(bindings, protocol=pickle.HIGHEST_PROTOCOL))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write_entry(self.entry_path(file_path, variant), fingerprint, payload)
+        except OSError as e:
+            print(f"Could not write binding cache for {file_path}: {e}")
+
+    def _write_entry(self, entry: Path, fingerprint: Tuple, payload: bytes):
+        """Atomically write a cache entry"""
+        temp_path = entry.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(pickle.dumps((fingerprint, payload), protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(temp_path, entry)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Delete every cache entry"""
+        for entry in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache hit/miss counters
+
+        Returns:
+            Dictionary with hits and misses
+        """
+        return {'hits': self.hits, 'misses': self.misses}
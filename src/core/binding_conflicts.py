@@ -0,0 +1,171 @@
+"""
+Binding conflict detection
+Finds physical inputs bound to more than one action in the same context
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.core.action_categories import ActionMode, categorize_binding
+from src.core.binding_index import Control, binding_control
+from src.core.input_tokenizer import KIND_UNBOUND, KIND_UNKNOWN, tokenize_input
+from src.models.binding_models import Binding
+
+
+class ConflictIndex:
+    """
+    Bindings grouped by input and context, kept current as bindings change
+
+    Two actions only conflict if they share the normalized input, the
+    multiTap count and the context, so a tap and a double tap of one button
+    or a flight and an FPS action on the same button are fine. Like
+    BindingIndex, a reload only touches the groups of the changed bindings.
+    """
+
+    def __init__(self, bindings: Iterable[Binding] = (),
+                 context_of: Callable[[Binding], object] = categorize_binding):
+        """
+        Build the index
+
+        Args:
+            bindings: Binding records to index
+            context_of: Maps a binding to its context; defaults to
+                categorize_binding (its actionmap's mode)
+        """
+        self.context_of = context_of
+        # (normalized input, multi_tap, context) -> action -> {(action, input): Binding}
+        self._groups = {}
+        self._group_of = {}  # (action, input) -> group key
+        self._conflicting = set()  # Group keys with more than one action
+        self._reports = {}  # Group key -> conflict dictionary, rebuilt only for changed groups
+        self._dirty = set()  # Group keys changed since the last conflicts() call
+
+        for binding in bindings:
+            self.add(binding)
+
+    def __len__(self) -> int:
+        return len(self._conflicting)
+
+    def add(self, binding: Binding):
+        """
+        Add a binding (replacing any binding with the same action and input)
+
+        Args:
+            binding: Binding record to add
+        """
+        key = binding.key()
+        if key in self._group_of:
+            self.remove(binding)
+
+        token = tokenize_input(binding.input)
+        if token.kind in (KIND_UNBOUND, KIND_UNKNOWN):
+            return
+        group_key = (token.normalized, binding.multi_tap, self.context_of(binding))
+        by_action = self._groups.setdefault(group_key, {})
+        by_action.setdefault(binding.action, {})[key] = binding
+        self._group_of[key] = group_key
+        if len(by_action) > 1:
+            if len(by_action) == 2:
+                self._conflicting.add(group_key)
+            self._dirty.add(group_key)
+
+    def remove(self, binding: Binding):
+        """
+        Remove the binding with the same action and input, if indexed
+
+        Args:
+            binding: Binding record to remove
+        """
+        key = binding.key()
+        group_key = self._group_of.pop(key, None)
+        if group_key is None:
+            return
+
+        by_action = self._groups[group_key]
+        action_bindings = by_action[binding.action]
+        del action_bindings[key]
+        if not action_bindings:
+            del by_action[binding.action]
+        if len(by_action) < 2:
+            self._conflicting.discard(group_key)
+            self._reports.pop(group_key, None)
+        else:
+            self._dirty.add(group_key)
+        if not by_action:
+            del self._groups[group_key]
+
+    def update(self, added: Iterable[Binding] = (), removed: Iterable[Binding] = ()):
+        """
+        Apply a binding diff incrementally
+
+        Args:
+            added: Bindings to add (or replace)
+            removed: Bindings to remove
+        """
+        for binding in removed:
+            self.remove(binding)
+        for binding in added:
+            self.add(binding)
+
+    def conflicts(self) -> List[Dict]:
+        """
+        Get the current collisions
+
+        Only the groups changed since the last call are rebuilt, so the cost
+        depends on the number of conflicts, not on the number of bindings.
+
+        Returns:
+            List of {'input', 'multi_tap', 'context', 'actions', 'bindings'} dictionaries,
+            sorted by input, with actions in first-seen order
+        """
+        for group_key in self._dirty & self._conflicting:
+            input_str, multi_tap, context = group_key
+            by_action = self._groups[group_key]
+            self._reports[group_key] = {
+                'input': input_str,
+                'multi_tap': multi_tap,
+                'context': context,
+                'actions': list(by_action),
+                'bindings': [next(iter(action_bindings.values())) for action_bindings in by_action.values()],
+            }
+        self._dirty.clear()
+
+        conflicts = list(self._reports.values())
+        conflicts.sort(key=lambda conflict: (conflict['input'], conflict['multi_tap']))
+        return conflicts
+
+
+def find_conflicts(bindings: Iterable[Binding],
+                   context_of: Callable[[Binding], object] = categorize_binding) -> List[Dict]:
+    """
+    Group bindings by input and context in one pass and report the collisions
+
+    Args:
+        bindings: Binding records to check
+        context_of: Maps a binding to its context; defaults to
+            categorize_binding (its actionmap's mode)
+
+    Returns:
+        ConflictIndex.conflicts() of the bindings
+    """
+    return ConflictIndex(bindings, context_of).conflicts()
+
+
+def conflict_controls(conflicts: List[Dict],
+                      mode: Optional[ActionMode] = None) -> Dict[Tuple[int, Control], List[str]]:
+    """
+    Get the joystick controls involved in conflicts
+
+    Args:
+        conflicts: Result of find_conflicts
+        mode: Only conflicts in this mode (all of them for None or ActionMode.ALL)
+
+    Returns:
+        (SC js number, control) -> conflicting action names, each listed once
+    """
+    controls = {}
+    for conflict in conflicts:
+        if mode not in (None, ActionMode.ALL) and conflict['context'] != mode:
+            continue
+        located = binding_control(conflict['bindings'][0])
+        if located:
+            # One control can be in several conflicts (multiTap counts, modes) sharing actions
+            controls.setdefault(located, {}).update(dict.fromkeys(conflict['actions']))
+    return {located: list(actions) for located, actions in controls.items()}
@@ -0,0 +1,116 @@
+"""
+Binding and profile diffs
+Compares parsed binding lists from BindingParser
+"""
+from typing import Dict, List
+from src.models.binding_models import Binding
+
+
+def diff_bindings(old_bindings: List[Binding], new_bindings: List[Binding]) -> Dict[str, List[Binding]]:
+    """
+    Compute which bindings were added, removed or changed
+
+    Bindings are matched on (action, input); a matched binding whose other
+    attributes differ (e.g. multiTap) is reported as changed.
+
+    Args:
+        old_bindings: Bindings before the change
+        new_bindings: Bindings after the change
+
+    Returns:
+        Dictionary with 'added', 'removed' and 'changed' binding lists
+        ('changed' holds the new versions)
+    """
+    old_by_key = {binding.key(): binding for binding in old_bindings}
+    new_by_key = {binding.key(): binding for binding in new_bindings}
+
+    added = [binding for key, binding in new_by_key.items() if key not in old_by_key]
+    removed = [binding for key, binding in old_by_key.items() if key not in new_by_key]
+    changed = [
+        binding for key, binding in new_by_key.items()
+        if key in old_by_key and old_by_key[key] != binding
+    ]
+
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def index_bindings(bindings: List[Binding]) -> tuple:
+    """
+    Index bindings by action and by input in one pass
+
+    Args:
+        bindings: Binding records
+
+    Returns:
+        (action -> set of inputs, input -> set of actions)
+    """
+    inputs_by_action = {}
+    actions_by_input = {}
+    for binding in bindings:
+        action = binding.action
+        input_str = binding.input.strip().lower()
+        inputs_by_action.setdefault(action, set()).add(input_str)
+        actions_by_input.setdefault(input_str, set()).add(action)
+    return inputs_by_action, actions_by_input
+
+
+def diff_profiles(old_bindings: List[Binding], new_bindings: List[Binding]) -> Dict[str, List[Dict]]:
+    """
+    Compare two profiles action by action and input by input
+
+    Both sides are indexed once with hash maps and compared key by key, so
+    the cost is linear in the number of bindings (plus sorting the
+    differences for display).
+
+    Args:
+        old_bindings: Bindings of the left/reference profile
+        new_bindings: Bindings of the right/compared profile
+
+    Returns:
+        Dictionary with
+            'added': actions only bound in the new profile
+            'removed': actions only bound in the old profile
+            'rebound': actions bound in both but to different inputs
+            'inputs_changed': inputs whose set of actions differs
+        Action entries are {'action', 'old_inputs', 'new_inputs'} and input
+        entries are {'input', 'old_actions', 'new_actions'}, all lists sorted.
+    """
+    old_inputs, old_actions = index_bindings(old_bindings)
+    new_inputs, new_actions = index_bindings(new_bindings)
+
+    result = {'added': [], 'removed': [], 'rebound': [], 'inputs_changed': []}
+
+    for action in old_inputs.keys() | new_inputs.keys():
+        before = old_inputs.get(action)
+        after = new_inputs.get(action)
+        if before == after:
+            continue
+
+        entry = {
+            'action': action,
+            'old_inputs': sorted(before or ()),
+            'new_inputs': sorted(after or ()),
+        }
+        if before is None:
+            result['added'].append(entry)
+        elif after is None:
+            result['removed'].append(entry)
+        else:
+            result['rebound'].append(entry)
+
+    for input_str in old_actions.keys() | new_actions.keys():
+        before = old_actions.get(input_str, set())
+        after = new_actions.get(input_str, set())
+        if before != after:
+            result['inputs_changed'].append({
+                'input': input_str,
+                'old_actions': sorted(before),
+                'new_actions': sorted(after),
+            })
+
+    # Only the differences are sorted, for stable display order
+    for key in ('added', 'removed', 'rebound'):
+        result[key].sort(key=lambda entry: entry['action'])
+    result['inputs_changed'].sort(key=lambda entry: entry['input'])
+
+    return result
@@ -0,0 +1,302 @@
+"""
+Binding history store
+Keeps SQLite snapshots of every profile load so bindings can be traced across game patches
+"""
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from src.core.binding_cache import default_data_dir
+from src.models.binding_models import Binding
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS inputs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS bindings (
+    id INTEGER PRIMARY KEY,
+    action_id INTEGER NOT NULL REFERENCES actions(id),
+    input_id INTEGER NOT NULL REFERENCES inputs(id),
+    multi_tap TEXT NOT NULL DEFAULT '',
+    UNIQUE (action_id, input_id, multi_tap)
+);
+CREATE INDEX IF NOT EXISTS bindings_by_input ON bindings(input_id);
+
+-- A binding set is stored once per distinct content (keyed by digest)
+CREATE TABLE IF NOT EXISTS binding_sets (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS binding_set_members (
+    set_id INTEGER NOT NULL REFERENCES binding_sets(id),
+    binding_id INTEGER NOT NULL REFERENCES bindings(id),
+    PRIMARY KEY (set_id, binding_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS members_by_binding ON binding_set_members(binding_id, set_id);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    instance TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    set_id INTEGER NOT NULL REFERENCES binding_sets(id)
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_instance ON snapshots(instance, taken_at);
+"""
+
+
+def default_history_path() -> Path:
+    """
+    Get the default location of the history database
+
+    Returns:
+        Path to bindings_history.sqlite3 in the StarSticks data directory
+    """
+    return default_data_dir() / "bindings_history.sqlite3"
+
+
+def binding_set_digest(bindings: Iterable[Binding]) -> str:
+    """
+    Content address of a set of bindings (order-independent)
+
+    Args:
+        bindings: Binding records
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for line in sorted({f"{b.action}\0{b.input}\0{b.multi_tap}" for b in bindings}):
+        digest.update(line.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class BindingHistory:
+    """SQLite store of binding snapshots with deduplicated actions, inputs and sets"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (or create) the history database
+
+        Args:
+            db_path: Database file, defaults to default_history_path(); ':memory:' works too
+        """
+        self.db_path = str(db_path) if db_path else str(default_history_path())
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        # name/key -> row id, loaded on first write
+        self._action_ids = None
+        self._input_ids = None
+        self._binding_ids = None
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def _load_id_maps(self):
+        """Load the dedup tables into memory so writes need no lookups"""
+        if self._action_ids is not None:
+            return
+        cursor = self.connection.cursor()
+        self._action_ids = {name: row_id for row_id, name in cursor.execute("SELECT id, name FROM actions")}
+        self._input_ids = {name: row_id for row_id, name in cursor.execute("SELECT id, name FROM inputs")}
+        self._binding_ids = {
+            (action_id, input_id, multi_tap): row_id
+            for row_id, action_id, input_id, multi_tap
+            in cursor.execute("SELECT id, action_id, input_id, multi_tap FROM bindings")
+        }
+
+    def _intern(self, cursor, table: str, ids: Dict[str, int], name: str) -> int:
+        """Get the id of a name, inserting it if new"""
+        row_id = ids.get(name)
+        if row_id is None:
+            cursor.execute(f"INSERT INTO {table} (name) VALUES (?)", (name,))
+            row_id = ids[name] = cursor.lastrowid
+        return row_id
+
+    def record_snapshot(self, instance: str, bindings: Iterable[Binding],
+                        label: str = '', taken_at: Optional[float] = None) -> int:
+        """
+        Store a snapshot of a profile load
+
+        A profile identical to one seen before only adds a snapshot row; its
+        binding set is shared.
+
+        Args:
+            instance: SC instance the bindings came from (LIVE, PTU, ...)
+            bindings: Every binding of the load
+            label: Free text, e.g. the game version
+            taken_at: Unix timestamp (defaults to now)
+
+        Returns:
+            The new snapshot id
+        """
+        bindings = list(bindings)
+        digest = binding_set_digest(bindings)
+        taken_at = time.time() if taken_at is None else taken_at
+
+        try:
+            with self.connection:
+                return self._insert_snapshot(instance, bindings, digest, label, taken_at)
+        except Exception:
+            # Ids interned during the rolled-back transaction were never committed; reload them on the next write
+            self._action_ids = self._input_ids = self._binding_ids = None
+            raise
+
+    def _insert_snapshot(self, instance: str, bindings: List[Binding], digest: str, label: str,
+                         taken_at: float) -> int:
+        """Write one snapshot (inside the caller's transaction)"""
+        cursor = self.connection.cursor()
+        row = cursor.execute("SELECT id FROM binding_sets WHERE digest = ?", (digest,)).fetchone()
+
+        if row:
+            set_id = row[0]
+        else:
+            self._load_id_maps()
+            binding_ids = set()
+            for binding in bindings:
+                action_id = self._intern(cursor, 'actions', self._action_ids, binding.action)
+                input_id = self._intern(cursor, 'inputs', self._input_ids, binding.input)
+                key = (action_id, input_id, binding.multi_tap)
+                binding_id = self._binding_ids.get(key)
+                if binding_id is None:
+                    cursor.execute(
+                        "INSERT INTO bindings (action_id, input_id, multi_tap) VALUES (?, ?, ?)", key
+                    )
+                    binding_id = self._binding_ids[key] = cursor.lastrowid
+                binding_ids.add(binding_id)
+
+            cursor.execute(
+                "INSERT INTO binding_sets (digest, size) VALUES (?, ?)", (digest, len(binding_ids))
+            )
+            set_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT INTO binding_set_members (set_id, binding_id) VALUES (?, ?)",
+                ((set_id, binding_id) for binding_id in binding_ids)
+            )
+
+        cursor.execute(
+            "INSERT INTO snapshots (instance, taken_at, label, set_id) VALUES (?, ?, ?, ?)",
+            (instance, taken_at, label, set_id)
+        )
+        return cursor.lastrowid
+
+    def list_snapshots(self, instance: Optional[str] = None) -> List[Dict]:
+        """
+        List snapshots, oldest first
+
+        Args:
+            instance: Only snapshots of this instance (all if None)
+
+        Returns:
+            List of {'id', 'instance', 'taken_at', 'label', 'set_id'} dictionaries
+        """
+        query = "SELECT id, instance, taken_at, label, set_id FROM snapshots"
+        params = ()
+        if instance is not None:
+            query += " WHERE instance = ?"
+            params = (instance,)
+        query += " ORDER BY taken_at, id"
+        return [
+            {'id': row[0], 'instance': row[1], 'taken_at': row[2], 'label': row[3], 'set_id': row[4]}
+            for row in self.connection.execute(query, params)
+        ]
+
+    def snapshot_bindings(self, snapshot_id: int) -> List[Binding]:
+        """
+        Get the bindings of a snapshot
+
+        Args:
+            snapshot_id: Snapshot id
+
+        Returns:
+            List of Binding records
+        """
+        rows = self.connection.execute("""
+            SELECT a.name, i.name, b.multi_tap
+            FROM snapshots s
+            JOIN binding_set_members m ON m.set_id = s.set_id
+            JOIN bindings b ON b.id = m.binding_id
+            JOIN actions a ON a.id = b.action_id
+            JOIN inputs i ON i.id = b.input_id
+            WHERE s.id = ?
+        """, (snapshot_id,))
+        return [Binding(action, input_str, multi_tap) for action, input_str, multi_tap in rows]
+
+    def input_history(self, input_str: str, instance: str) -> List[Dict]:
+        """
+        Trace what an input was bound to across an instance's snapshots
+
+        Args:
+            input_str: SC input string, e.g. "js2_button5"
+            instance: SC instance
+
+        Returns:
+            One entry per change, oldest first:
+            {'snapshot_id', 'taken_at', 'label', 'actions'} where actions is the
+            sorted list of actions on the input from that snapshot on
+        """
+        actions_by_set = {}
+        rows = self.connection.execute("""
+            SELECT m.set_id, a.name
+            FROM inputs i
+            JOIN bindings b ON b.input_id = i.id
+            JOIN binding_set_members m ON m.binding_id = b.id
+            JOIN actions a ON a.id = b.action_id
+            WHERE i.name = ?
+        """, (input_str,))
+        for set_id, action in rows:
+            actions_by_set.setdefault(set_id, set()).add(action)
+
+        changes = []
+        previous = None
+        for snapshot in self.list_snapshots(instance):
+            actions = sorted(actions_by_set.get(snapshot['set_id'], ()))
+            if actions != previous:
+                changes.append({
+                    'snapshot_id': snapshot['id'],
+                    'taken_at': snapshot['taken_at'],
+                    'label': snapshot['label'],
+                    'actions': actions,
+                })
+                previous = actions
+        return changes
+
+    def last_change(self, input_str: str, instance: str) -> Optional[Dict]:
+        """
+        Find when an input's binding last changed
+
+        Args:
+            input_str: SC input string, e.g. "js2_button5"
+            instance: SC instance
+
+        Returns:
+            {'snapshot_id', 'taken_at', 'label', 'before', 'after'}, or None if
+            the input never changed after the first snapshot
+        """
+        changes = self.input_history(input_str, instance)
+        if len(changes) < 2:
+            return None
+        before, after = changes[-2], changes[-1]
+        return {
+            'snapshot_id': after['snapshot_id'],
+            'taken_at': after['taken_at'],
+            'label': after['label'],
+            'before': before['actions'],
+            'after': after['actions'],
+        }
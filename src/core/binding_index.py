@@ -0,0 +1,249 @@
+"""
+Multi-key binding index
+Built once per load so views can look bindings up instead of scanning them
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.core.action_categories import ActionMode, categorize_binding
+from src.core.input_tokenizer import KIND_AXIS, KIND_BUTTON, KIND_HAT, tokenize_input
+from src.models.binding_models import Binding
+
+
+# A physical control on a device: ('button', 3), ('axis', 'rotz') or ('hat', 'hat1_up')
+Control = Tuple[str, object]
+
+
+def binding_control(binding: Binding) -> Optional[Tuple[int, Control]]:
+    """
+    Get the joystick control a binding sits on
+
+    Args:
+        binding: Binding record
+
+    Returns:
+        (SC js number, control), or None for non-joystick or unbound inputs
+    """
+    token = tokenize_input(binding.input)
+    if not token.is_joystick:
+        return None
+    if token.kind == KIND_BUTTON:
+        return token.device_index, (KIND_BUTTON, token.index)
+    if token.kind == KIND_AXIS:
+        return token.device_index, (KIND_AXIS, token.axis)
+    if token.kind == KIND_HAT:
+        return token.device_index, (KIND_HAT, f"hat{token.index}_{token.direction}")
+    return None
+
+
+class BindingIndex:
+    """Bindings indexed by device/control, action and mode"""
+
+    def __init__(self, bindings: Iterable[Binding] = ()):
+        """
+        Build the index
+
+        Args:
+            bindings: Binding records to index
+        """
+        self._bindings = {}  # (action, input) -> Binding
+        self._inputs_by_action = {}  # action -> {input: None}, insertion ordered
+        self._by_mode = {}  # ActionMode -> {(action, input): Binding}
+        # ActionMode -> SC js number -> control -> bindings on it (last one displayed)
+        self._controls = {}
+
+        for binding in bindings:
+            self.add(binding)
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+    def __contains__(self, binding: Binding) -> bool:
+        return binding.key() in self._bindings
+
+    def mode_of(self, binding: Binding) -> ActionMode:
+        """
+        Get the mode a binding is bucketed under
+
+        Args:
+            binding: Binding record
+
+        Returns:
+            The ActionMode of its actionmap (or a keyword guess)
+        """
+        return categorize_binding(binding)
+
+    def add(self, binding: Binding):
+        """
+        Add a binding (replacing any binding with the same action and input)
+
+        Args:
+            binding: Binding record to add
+        """
+        key = binding.key()
+        if key in self._bindings:
+            self.remove(self._bindings[key])
+
+        self._bindings[key] = binding
+        self._inputs_by_action.setdefault(binding.action, {})[binding.input] = None
+
+        mode = self.mode_of(binding)
+        located = binding_control(binding)
+        for bucket_mode in (ActionMode.ALL, mode):
+            self._by_mode.setdefault(bucket_mode, {})[key] = binding
+            if located:
+                device, control = located
+                device_controls = self._controls.setdefault(bucket_mode, {}).setdefault(device, {})
+                device_controls.setdefault(control, []).append(binding)
+
+    def remove(self, binding: Binding):
+        """
+        Remove the binding with the same action and input, if indexed
+
+        Args:
+            binding: Binding record to remove
+        """
+        key = binding.key()
+        stored = self._bindings.pop(key, None)
+        if stored is None:
+            return
+
+        inputs = self._inputs_by_action.get(stored.action)
+        if inputs is not None:
+            inputs.pop(stored.input, None)
+            if not inputs:
+                del self._inputs_by_action[stored.action]
+
+        mode = self.mode_of(stored)
+        located = binding_control(stored)
+        for bucket_mode in (ActionMode.ALL, mode):
+            self._by_mode.get(bucket_mode, {}).pop(key, None)
+            if located:
+                device, control = located
+                mode_controls = self._controls.get(bucket_mode, {})
+                device_controls = mode_controls.get(device, {})
+                on_control = device_controls.get(control, [])
+                if stored in on_control:
+                    on_control.remove(stored)
+                if not on_control:
+                    device_controls.pop(control, None)
+                if not device_controls:
+                    mode_controls.pop(device, None)
+
+    def update(self, added: Iterable[Binding] = (), removed: Iterable[Binding] = ()):
+        """
+        Apply a binding diff incrementally
+
+        Args:
+            added: Bindings to add (or replace)
+            removed: Bindings to remove
+        """
+        for binding in removed:
+            self.remove(binding)
+        for binding in added:
+            self.add(binding)
+
+    def bindings(self) -> List[Binding]:
+        """Get every indexed binding in insertion order"""
+        return list(self._bindings.values())
+
+    def bindings_for_mode(self, mode: ActionMode) -> List[Binding]:
+        """
+        Get the bindings that belong to a mode
+
+        Args:
+            mode: ActionMode to look up (ActionMode.ALL for everything)
+
+        Returns:
+            List of Binding records
+        """
+        return list(self._by_mode.get(mode, {}).values())
+
+    def count_for_mode(self, mode: ActionMode) -> int:
+        """Number of bindings in a mode"""
+        return len(self._by_mode.get(mode, {}))
+
+    def inputs_for_action(self, action: str) -> List[str]:
+        """
+        Get every input an action is bound to
+
+        Args:
+            action: SC action name
+
+        Returns:
+            List of input strings
+        """
+        return list(self._inputs_by_action.get(action, ()))
+
+    def devices(self, mode: ActionMode = ActionMode.ALL) -> List[int]:
+        """SC js numbers that have bindings in a mode"""
+        return sorted(self._controls.get(mode, {}))
+
+    def controls(self, device: int, mode: ActionMode = ActionMode.ALL) -> Dict[Control, List[Binding]]:
+        """
+        Get every bound control of a device
+
+        Args:
+            device: SC js number (1-based)
+            mode: ActionMode to restrict to
+
+        Returns:
+            Control -> bindings on that control (last one is displayed)
+        """
+        return self._controls.get(mode, {}).get(device, {})
+
+    def bindings_on(self, device: int, control: Control, mode: ActionMode = ActionMode.ALL) -> List[Binding]:
+        """
+        Get the bindings on a single control
+
+        Args:
+            device: SC js number (1-based)
+            control: Control key, e.g. ('button', 3)
+            mode: ActionMode to restrict to
+
+        Returns:
+            List of Binding records
+        """
+        return self.controls(device, mode).get(control, [])
+
+    def changed_controls(self, old_mode: ActionMode, new_mode: ActionMode) -> List[Tuple[int, Control]]:
+        """
+        Find the controls whose displayed binding differs between two modes
+
+        Only the bound controls of the two modes are compared, so the cost
+        depends on the number of controls, not on the number of bindings.
+
+        Args:
+            old_mode: ActionMode currently shown
+            new_mode: ActionMode about to be shown
+
+        Returns:
+            (SC js number, control) pairs to redraw
+        """
+        if old_mode == new_mode:
+            return []
+
+        old_controls = self._controls.get(old_mode, {})
+        new_controls = self._controls.get(new_mode, {})
+        changed = []
+        for device in old_controls.keys() | new_controls.keys():
+            old_device = old_controls.get(device, {})
+            new_device = new_controls.get(device, {})
+            for control in old_device.keys() | new_device.keys():
+                old_on = old_device.get(control)
+                new_on = new_device.get(control)
+                if (old_on[-1] if old_on else None) is not (new_on[-1] if new_on else None):
+                    changed.append((device, control))
+        return changed
+
+    def actions_for_button(self, device: int, button: int, mode: ActionMode = ActionMode.ALL) -> List[str]:
+        """
+        Get the actions bound to a button
+
+        Args:
+            device: SC js number (1-based)
+            button: Button number (1-based)
+            mode: ActionMode to restrict to
+
+        Returns:
+            List of action names
+        """
+        return [binding.action for binding in self.bindings_on(device, (KIND_BUTTON, button), mode)]
@@ -2,23 +2,144 @@
 Star Citizen binding file parser
 Parses XML binding files from Star Citizen installations
 """
-import os
+import sqlite3
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.core.action_categories import ActionMode
+from src.core.binding_cache import BindingCache, fingerprint_file
+from src.core.input_tokenizer import KIND_BUTTON, KIND_HAT, tokenize_input
+from src.core.lazy_profile import LazyProfile
+from src.core.sc_discovery import InstallationDiscovery
+from src.core.xml_backend import get_backend
+from src.models.binding_models import Binding, BindingCollection
+
+
+# Binding lists produced for every parsed file
+BINDING_TYPES = ('joystick_bindings', 'keyboard_bindings', 'mouse_bindings')
+
+# Binding list for each rebind input's device prefix (its first two characters, lowercased)
+DEVICE_BINDING_TYPES = {'js': 'joystick_bindings', 'kb': 'keyboard_bindings', 'mo': 'mouse_bindings'}
+
+# Below this many files a worker pool costs more to start than it saves.
+# Re-measure with: python -m benchmarks.bench_parallel_load
+PARALLEL_MIN_FILES = 8
+
+
+def _parse_file_worker(file_path: str, xml_backend: Optional[str] = None,
+                       devices: Optional[Tuple[str, ...]] = None,
+                       fingerprint: bool = False) -> Tuple[str, Dict, float, bool, Optional[Tuple]]:
+    """
+    Parse one binding file in a pool worker
+
+    Args:
+        file_path: Path to the XML binding file
+        xml_backend: XML backend name, so workers parse like the parent
+        devices: Extraction filter, so workers parse like the parent
+        fingerprint: Fingerprint the file for the cache before parsing it
+
+    Returns:
+        (file_path, bindings, seconds spent parsing, True if the parse succeeded,
+        cache fingerprint or None); a failed parse returns empty bindings that must not be cached
+    """
+    start = time.perf_counter()
+    parser = BindingParser(xml_backend=xml_backend)
+    parser.devices = devices
+    file_fingerprint = None
+    try:
+        if fingerprint:
+            file_fingerprint = fingerprint_file(Path(file_path))
+        bindings = parser.read_binding_file(Path(file_path))
+        succeeded = True
+    except ET.ParseError as e:
+        print(f"Error parsing XML file {file_path}: {e}")
+        bindings, succeeded = parser.empty_bindings(), False
+    except Exception as e:
+        print(f"Unexpected error parsing {file_path}: {e}")
+        bindings, succeeded = parser.empty_bindings(), False
+    return file_path, bindings, time.perf_counter() - start, succeeded, file_fingerprint
+
+
+def merge_bindings(file_bindings: Dict[str, Dict], precedence: List[str]) -> Dict:
+    """
+    Merge the parsed bindings of several files into one result
+
+    An action is taken from the highest-precedence file that binds it (per
+    binding type); lower-precedence files only fill in actions that are
+    still unbound.
+
+    Args:
+        file_bindings: File name -> parsed bindings dictionary
+        precedence: File names, highest precedence first
+
+    Returns:
+        Merged bindings dictionary
+    """
+    merged = {binding_type: BindingCollection() for binding_type in BINDING_TYPES}
+    claimed = set()
+
+    for file_name in precedence:
+        bindings = file_bindings.get(file_name)
+        if not bindings:
+            continue
+
+        file_claims = set()
+        for binding_type in BINDING_TYPES:
+            for binding in bindings.get(binding_type, []):
+                key = (binding_type, binding.action)
+                if key in claimed:
+                    continue
+                file_claims.add(key)
+                merged[binding_type].append(binding)
+
+        claimed |= file_claims
+
+    return merged
 
 
 class BindingParser:
     """Parse Star Citizen joystick binding XML files"""
 
-    def __init__(self):
-        """Initialize the binding parser"""
-        self.sc_base_paths = [
-            r"C:\Program Files\Roberts Space Industries\StarCitizen",
-            r"D:\Program Files\Roberts Space Industries\StarCitizen",
-            r"E:\Program Files\Roberts Space Industries\StarCitizen",
-        ]
+    def __init__(self, cache: Optional[BindingCache] = None, history=None,
+                 discovery: Optional[InstallationDiscovery] = None, default_profile=None,
+                 xml_backend: Optional[str] = None):
+        """
+        Initialize the binding parser
+
+        Args:
+            cache: Parse-result cache to use (defaults to the per-user cache)
+            history: Optional BindingHistory that records a snapshot of every load
+            discovery: Installation discovery to use (defaults to the standard roots)
+            default_profile: Optional DefaultProfile the user rebinds are layered over
+            xml_backend: 'lxml', 'etree', or None to use lxml when it is installed
+        """
+        self.discovery = discovery if discovery is not None else InstallationDiscovery()
         self.bindings = {}
+        self.precedence = []  # File names that win merges, highest first
+        self.file_bindings = {}  # File name -> parsed bindings from the last load
+        self.file_timings = {}  # File name -> parse time in seconds from the last load
+        self.bindings_path = None  # Mappings directory of the last load
+        self.lazy_profiles = {}  # File name -> LazyProfile still missing actionmaps
+        self.pending_snapshot = None  # Instance whose history snapshot waits for a complete load
+        self.cache = cache if cache is not None else BindingCache()
+        self.use_cache = True  # Set False to always re-parse the XML
+        self.history = history
+        self.default_profile = default_profile
+        self.xml_backend = get_backend(xml_backend)
+        # Device prefixes to extract ('js', 'kb', 'mo'); None keeps every device
+        self.devices = None
+
+    @property
+    def sc_base_paths(self) -> List[str]:
+        """Candidate SC install folders; assigning new ones clears the discovery cache"""
+        return self.discovery.roots
+
+    @sc_base_paths.setter
+    def sc_base_paths(self, paths: List[str]):
+        self.discovery.roots = paths
 
     def find_sc_installation(self) -> Optional[Path]:
         """
@@ -27,31 +148,16 @@ class BindingParser:
         Returns:
             Path to SC installation, or None if not found
         """
-        for base_path in self.sc_base_paths:
-            if os.path.exists(base_path):
-                return Path(base_path)
-        return None
+        return self.discovery.find_installation()
 
     def detect_installed_instances(self) -> List[str]:
         """
-        Detect which SC instances are actually installed (LIVE, PTU, HOTFIX)
+        Detect which SC instances are actually installed (LIVE, PTU, HOTFIX, EPTU, TECH-PREVIEW)
 
         Returns:
             List of installed instance names
         """
-        installed = []
-        sc_path = self.find_sc_installation()
-
-        if not sc_path:
-            return installed
-
-        # Check for each possible instance
-        for instance in ["LIVE", "PTU", "HOTFIX"]:
-            instance_path = sc_path / instance
-            if instance_path.exists():
-                installed.append(instance)
-
-        return installed
+        return self.discovery.instances()
 
     def get_bindings_path(self, instance: str = "LIVE") -> Optional[Path]:
         """
@@ -63,15 +169,7 @@ class BindingParser:
         Returns:
             Path to the bindings directory, or None if not found
         """
-        sc_path = self.find_sc_installation()
-        if not sc_path:
-            return None
-
-        bindings_path = sc_path / instance / "USER" / "Client" / "0" / "Controls" / "Mappings"
-
-        if bindings_path.exists():
-            return bindings_path
-        return None
+        return self.discovery.bindings_path(instance)
 
     def list_binding_files(self, instance: str = "LIVE") -> List[str]:
         """
@@ -90,55 +188,160 @@ class BindingParser:
         xml_files = list(bindings_path.glob("*.xml"))
         return [f.name for f in xml_files]
 
-    def parse_binding_file(self, file_path: Path) -> Dict:
+    def empty_bindings(self) -> Dict[str, BindingCollection]:
         """
-        Parse a single binding XML file
+        Create an empty parse result
+
+        Returns:
+            Dictionary with an empty BindingCollection per binding type
+        """
+        return {binding_type: BindingCollection() for binding_type in BINDING_TYPES}
+
+    def device_prefixes(self, devices: Optional[Iterable[str]] = None) -> Optional[Tuple[str, ...]]:
+        """
+        Resolve an extraction filter to a tuple of lowercase device prefixes
+
+        Args:
+            devices: Device prefixes to keep, e.g. {'js'} (defaults to self.devices)
+
+        Returns:
+            Sorted prefix tuple, or None to keep every device
+        """
+        if devices is None:
+            devices = self.devices
+        return tuple(sorted({device.lower() for device in devices})) if devices is not None else None
+
+    def cache_variant(self) -> str:
+        """Cache key suffix, so filtered and full parse results are stored apart"""
+        prefixes = self.device_prefixes()
+        return ','.join(prefixes) if prefixes is not None else ''
+
+    def classify_input(self, input_type: str) -> Optional[str]:
+        """
+        Work out which binding list a rebind input belongs to
+
+        Args:
+            input_type: The rebind input string (e.g. "js1_button3")
+
+        Returns:
+            'joystick_bindings', 'keyboard_bindings', 'mouse_bindings', or None
+        """
+        return DEVICE_BINDING_TYPES.get(input_type[:2].lower())
+
+    def make_binding(self, binding_type: str, action_name: str, rebind, actionmap: str = '') -> Binding:
+        """
+        Build the binding record for a single rebind element
+
+        Args:
+            binding_type: Result of classify_input for this rebind
+            action_name: Name of the enclosing action
+            rebind: The <rebind> element
+            actionmap: Name of the enclosing actionmap
+
+        Returns:
+            Binding record
+        """
+        multi_tap = rebind.get('multiTap', '') if binding_type == 'joystick_bindings' else ''
+        return Binding(action_name, rebind.get('input', ''), multi_tap, actionmap)
+
+    def iter_bindings(self, file_path: Path, devices: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Binding]]:
+        """
+        Stream bindings out of a binding XML file
+
+        Bindings are yielded as each <rebind> element closes and every
+        finished element is cleared and detached from its parent, so memory
+        use stays flat regardless of the size of the file.
 
         Args:
             file_path: Path to the XML binding file
+            devices: Device prefixes to keep, e.g. {'js'} (defaults to self.devices);
+                other rebinds are dropped by a prefix test before anything is built
+
+        Yields:
+            (binding_type, binding) tuples, where binding_type is one of
+            'joystick_bindings', 'keyboard_bindings' or 'mouse_bindings'
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        open_elements = []
+        action_names = []
+        actionmap_names = []
+        prefixes = self.device_prefixes(devices)
+
+        for event, elem in self.xml_backend.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                open_elements.append(elem)
+                if elem.tag == 'action':
+                    action_names.append(elem.get('name', 'Unknown'))
+                elif elem.tag == 'actionmap':
+                    actionmap_names.append(elem.get('name', ''))
+                continue
+
+            open_elements.pop()
+
+            if elem.tag == 'rebind' and action_names:
+                device = elem.get('input', '')[:2].lower()
+                if prefixes is None or device in prefixes:
+                    binding_type = DEVICE_BINDING_TYPES.get(device)
+                    if binding_type:
+                        actionmap = actionmap_names[-1] if actionmap_names else ''
+                        yield binding_type, self.make_binding(binding_type, action_names[-1], elem, actionmap)
+            elif elem.tag == 'action':
+                action_names.pop()
+            elif elem.tag == 'actionmap':
+                actionmap_names.pop()
+
+            # Drop the consumed subtree; it is always the last open child
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+
+    def read_binding_file(self, file_path: Path, devices: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Stream-parse a binding file, letting parse errors propagate
+
+        Used where a half-written file must be told apart from an empty one.
+
+        Args:
+            file_path: Path to the XML binding file
+            devices: Device prefixes to keep (defaults to self.devices)
 
         Returns:
             Dictionary containing parsed bindings
+
+        Raises:
+            ET.ParseError: If the file is not (yet) well-formed XML
+            OSError: If the file cannot be read
         """
-        bindings = {
-            'joystick_bindings': [],
-            'keyboard_bindings': [],
-            'mouse_bindings': []
-        }
+        bindings = self.empty_bindings()
+        for binding_type, binding_info in self.iter_bindings(file_path, devices):
+            bindings[binding_type].append(binding_info)
+        return bindings
 
-        try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+    def parse_binding_file(self, file_path: Path, streaming: bool = False,
+                           devices: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Parse a single binding XML file
 
-            # Parse joystick bindings
-            for action in root.findall('.//action'):
-                action_name = action.get('name', 'Unknown')
+        Args:
+            file_path: Path to the XML binding file
+            streaming: If True, parse incrementally with iter_bindings instead
+                of building the whole tree in memory
+            devices: Device prefixes to keep, e.g. {'js'} (defaults to self.devices);
+                the binding lists of other devices stay empty
 
-                # Look for joystick rebinds
-                for rebind in action.findall('.//rebind'):
-                    input_type = rebind.get('input', '')
-
-                    if 'js' in input_type.lower():  # Joystick binding
-                        binding_info = {
-                            'action': action_name,
-                            'input': rebind.get('input', ''),
-                            'multiTap': rebind.get('multiTap', ''),
-                        }
-                        bindings['joystick_bindings'].append(binding_info)
-
-                    elif 'kb' in input_type.lower():  # Keyboard binding
-                        binding_info = {
-                            'action': action_name,
-                            'input': rebind.get('input', ''),
-                        }
-                        bindings['keyboard_bindings'].append(binding_info)
-
-                    elif 'mouse' in input_type.lower():  # Mouse binding
-                        binding_info = {
-                            'action': action_name,
-                            'input': rebind.get('input', ''),
-                        }
-                        bindings['mouse_bindings'].append(binding_info)
+        Returns:
+            Dictionary containing parsed bindings
+        """
+        bindings = self.empty_bindings()
+
+        try:
+            if streaming:
+                bindings = self.read_binding_file(file_path, devices)
+            else:
+                root = self.xml_backend.parse(file_path)
+                bindings = self.extract_bindings(root, devices)
 
         except ET.ParseError as e:
             print(f"Error parsing XML file {file_path}: {e}")
@@ -147,16 +350,208 @@ class BindingParser:
 
         return bindings
 
-    def load_bindings(self, instance: str = "LIVE") -> Dict:
+    def extract_bindings(self, root, devices: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Collect the bindings below a parsed element (a whole file or one actionmap)
+
+        Args:
+            root: Parsed element from the XML backend
+            devices: Device prefixes to keep (defaults to self.devices)
+
+        Returns:
+            Dictionary containing parsed bindings
+        """
+        bindings = self.empty_bindings()
+        prefixes = self.device_prefixes(devices)
+
+        if root.tag == 'actionmap':
+            actionmaps = [root]
+        else:
+            # A file without actionmaps is read as one unnamed group
+            actionmaps = self.xml_backend.actionmaps(root) or [root]
+
+        for actionmap in actionmaps:
+            actionmap_name = actionmap.get('name', '') if actionmap.tag == 'actionmap' else ''
+
+            for action in self.xml_backend.actions(actionmap):
+                action_name = action.get('name', 'Unknown')
+
+                for rebind in self.xml_backend.rebinds(action):
+                    device = rebind.get('input', '')[:2].lower()
+                    if prefixes is not None and device not in prefixes:
+                        continue
+                    binding_type = DEVICE_BINDING_TYPES.get(device)
+                    if binding_type:
+                        bindings[binding_type].append(
+                            self.make_binding(binding_type, action_name, rebind, actionmap_name)
+                        )
+
+        return bindings
+
+    def order_binding_files(self, bindings_path: Path, file_names: List[str]) -> List[str]:
+        """
+        Sort binding files by merge precedence, highest first
+
+        Files named in self.precedence come first, in that order. The rest
+        follow newest first, so the layout saved most recently wins.
+
+        Args:
+            bindings_path: Directory holding the files
+            file_names: Binding file names to order
+
+        Returns:
+            Ordered list of file names
         """
-        Load all bindings for a specific Star Citizen instance
+        preferred = [name for name in self.precedence if name in file_names]
+        remaining = [name for name in file_names if name not in preferred]
+
+        def modified_time(name):
+            try:
+                return (bindings_path / name).stat().st_mtime
+            except OSError:
+                return 0
+
+        remaining.sort(key=lambda name: (-modified_time(name), name))
+        return preferred + remaining
+
+    def parse_binding_files(self, bindings_path: Path, file_names: List[str],
+                            max_workers: Optional[int] = None,
+                            use_processes: bool = True,
+                            use_cache: Optional[bool] = None,
+                            mode: Optional[ActionMode] = None) -> Dict[str, Dict]:
+        """
+        Parse several binding files, on a worker pool when there are enough
+
+        Unchanged files are served from the parse-result cache. Per-file load
+        times are stored in self.file_timings.
+
+        Args:
+            bindings_path: Directory holding the files
+            file_names: Binding file names to parse
+            max_workers: Pool size (defaults to the executor's own default)
+            use_processes: Use a process pool (True) or a thread pool (False)
+            use_cache: Override self.use_cache for this call
+            mode: Only parse the actionmaps this mode needs; the rest of each
+                file is left in self.lazy_profiles for load_mode()
+
+        Returns:
+            File name -> parsed bindings dictionary
+        """
+        if use_cache is None:
+            use_cache = self.use_cache
+
+        results = {}
+        self.file_timings = {}
+        paths = []
+
+        for name in file_names:
+            file_path = bindings_path / name
+            if use_cache:
+                start = time.perf_counter()
+                cached = self.cache.load(file_path, self.cache_variant())
+                if cached is not None:
+                    results[name] = cached
+                    self.file_timings[name] = time.perf_counter() - start
+                    continue
+            paths.append(str(file_path))
+
+        if mode not in (None, ActionMode.ALL):
+            for file_path in paths:
+                self._open_lazy(Path(file_path), mode, results, use_cache)
+            if use_cache and paths:
+                self.cache.evict()
+            return results
+
+        worker_args = (repeat(self.xml_backend.name), repeat(self.device_prefixes()), repeat(use_cache))
+        if len(paths) < PARALLEL_MIN_FILES:
+            parsed = self._collect_parse_results(map(_parse_file_worker, paths, *worker_args), results)
+        else:
+            executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor_class(max_workers=max_workers) as executor:
+                parsed = self._collect_parse_results(executor.map(_parse_file_worker, paths, *worker_args), results)
+
+        # Failed files are left out, so a file caught mid-write is parsed again on the next load
+        if use_cache and parsed:
+            for file_path, fingerprint in parsed.items():
+                self.cache.store(Path(file_path), results[Path(file_path).name], fingerprint,
+                                 self.cache_variant())
+            self.cache.evict()
+
+        return results
+
+    def open_profile(self, file_path: Path, fingerprint: Optional[Tuple] = None) -> LazyProfile:
+        """
+        Index a binding file for on-demand parsing
+
+        Args:
+            file_path: Path to the XML binding file
+            fingerprint: Cache fingerprint taken before the file is indexed
+
+        Returns:
+            LazyProfile with no actionmaps parsed yet
+        """
+        return LazyProfile(file_path, self, fingerprint)
+
+    def _open_lazy(self, file_path: Path, mode: ActionMode, results: Dict[str, Dict], use_cache: bool):
+        """Parse the actionmaps of one file a mode needs and keep the rest for later"""
+        name = file_path.name
+        start = time.perf_counter()
+        try:
+            fingerprint = fingerprint_file(file_path) if use_cache else None
+            profile = self.open_profile(file_path, fingerprint)
+            if profile.needs_full_parse():
+                # The index does not see the file's bindings the way the parser does
+                profile = None
+                bindings = self.read_binding_file(file_path)
+            else:
+                profile.materialize(mode)
+                bindings = profile.bindings()
+        except (ET.ParseError, OSError) as e:
+            print(f"Error parsing XML file {file_path}: {e}")
+            results[name] = self.empty_bindings()
+            return
+
+        results[name] = bindings
+        self.file_timings[name] = time.perf_counter() - start
+        if profile is not None and not profile.is_complete():
+            self.lazy_profiles[name] = profile
+        elif use_cache:
+            self.cache.store(file_path, results[name], fingerprint, self.cache_variant())
+
+    def _collect_parse_results(self, outcomes, results: Dict[str, Dict]) -> Dict[str, Optional[Tuple]]:
+        """Store worker outcomes by file name and record their timings; returns path -> fingerprint of the parsed"""
+        parsed = {}
+        for file_path, bindings, elapsed, succeeded, fingerprint in outcomes:
+            name = Path(file_path).name
+            results[name] = bindings
+            self.file_timings[name] = elapsed
+            if succeeded:
+                parsed[file_path] = fingerprint
+        return parsed
+
+    def load_bindings(self, instance: str = "LIVE", max_workers: Optional[int] = None,
+                      use_processes: bool = True, use_cache: Optional[bool] = None,
+                      mode: Optional[ActionMode] = None) -> Dict:
+        """
+        Load and merge all binding files for a specific Star Citizen instance
 
         Args:
             instance: The SC instance (LIVE, PTU, HOTFIX)
+            max_workers: Pool size used when parsing many files
+            use_processes: Use a process pool (True) or a thread pool (False)
+            use_cache: Override self.use_cache for this call
+            mode: Only parse what this mode needs now; call load_mode() to fill in others
 
         Returns:
-            Dictionary containing all bindings
+            Dictionary containing all bindings, merged by file precedence
         """
+        # Forget the previous instance first, so a failed load cannot leave its files behind
+        self.bindings = {}
+        self.file_bindings = {}
+        self.bindings_path = None
+        self.lazy_profiles = {}
+        self.pending_snapshot = None
+
         bindings_path = self.get_bindings_path(instance)
         if not bindings_path:
             print(f"Could not find bindings path for {instance}")
@@ -167,77 +562,149 @@ class BindingParser:
             print(f"No binding files found for {instance}")
             return {}
 
-        # Parse the first binding file found (can be extended to support multiple)
-        first_file = bindings_path / binding_files[0]
-        self.bindings = self.parse_binding_file(first_file)
+        self.bindings_path = bindings_path
+        ordered_files = self.order_binding_files(bindings_path, binding_files)
+        self.file_bindings = self.parse_binding_files(
+            bindings_path, ordered_files, max_workers, use_processes, use_cache, mode
+        )
+        self.bindings = self.merge_file_bindings(ordered_files)
+
+        for name in ordered_files:
+            print(f"Loaded {name} in {self.file_timings.get(name, 0) * 1000:.1f} ms")
 
+        # Partial loads are only recorded once load_mode() has filled them in
+        self.pending_snapshot = instance
+        if not self.lazy_profiles:
+            self.record_snapshot()
+
+        return self.bindings
+
+    def load_mode(self, mode: ActionMode) -> Dict:
+        """
+        Parse whatever a mode still needs from lazily loaded files and re-merge
+
+        Args:
+            mode: The ActionMode about to be shown (ActionMode.ALL completes every file)
+
+        Returns:
+            The merged bindings dictionary (unchanged if nothing was pending)
+        """
+        if not self.lazy_profiles:
+            return self.bindings
+
+        parsed = 0
+        stored = False
+        for name, profile in list(self.lazy_profiles.items()):
+            try:
+                parsed += profile.materialize(mode)
+                if profile.needs_full_parse():
+                    # Rewritten since it was indexed into a file the index cannot stand in for
+                    file_bindings = self.read_binding_file(profile.file_path)
+                else:
+                    file_bindings = profile.bindings()
+            except (ET.ParseError, OSError) as e:
+                print(f"Error parsing XML file {profile.file_path}: {e}")
+                continue
+
+            self.file_bindings[name] = file_bindings
+            if profile.needs_full_parse() or profile.is_complete():
+                del self.lazy_profiles[name]
+                # A file that changed since it was opened has no fingerprint matching what was parsed
+                if self.use_cache and profile.fingerprint is not None:
+                    self.cache.store(profile.file_path, self.file_bindings[name], profile.fingerprint,
+                                     self.cache_variant())
+                    stored = True
+
+        if stored:
+            self.cache.evict()
+        print(f"Parsed {parsed} more actionmap(s) for {mode.value}")
+        self.bindings = self.merge_file_bindings(self.ordered_loaded_files())
+        if not self.lazy_profiles:
+            self.record_snapshot()
+        return self.bindings
+
+    def record_snapshot(self):
+        """Record the pending load in the binding history, if there is one"""
+        instance, self.pending_snapshot = self.pending_snapshot, None
+        if self.history is None or instance is None:
+            return
+        try:
+            all_bindings = [b for binding_type in BINDING_TYPES for b in self.bindings[binding_type]]
+            self.history.record_snapshot(instance, all_bindings)
+        except sqlite3.Error as e:
+            print(f"Could not record binding history: {e}")
+
+    def update_file_bindings(self, file_name: str, file_bindings: Optional[Dict]) -> Dict:
+        """
+        Replace the bindings of one file and re-merge, without re-parsing the others
+
+        Args:
+            file_name: Binding file name within the loaded Mappings directory
+            file_bindings: Newly parsed bindings, or None if the file was deleted
+
+        Returns:
+            The new merged bindings dictionary
+        """
+        if file_bindings is None:
+            self.file_bindings.pop(file_name, None)
+        else:
+            self.file_bindings[file_name] = file_bindings
+        # The reload read the whole file, so nothing is left to parse lazily
+        self.lazy_profiles.pop(file_name, None)
+
+        self.bindings = self.merge_file_bindings(self.ordered_loaded_files())
+        if not self.lazy_profiles and self.pending_snapshot:
+            self.record_snapshot()
         return self.bindings
 
-    def get_joystick_bindings(self) -> List[Dict]:
+    def ordered_loaded_files(self) -> List[str]:
+        """Names of the loaded files, highest merge precedence first"""
+        ordered_files = list(self.file_bindings)
+        if self.bindings_path:
+            ordered_files = self.order_binding_files(self.bindings_path, ordered_files)
+        return ordered_files
+
+    def merge_file_bindings(self, ordered_files: List[str]) -> Dict:
+        """
+        Merge the loaded files and layer the result over the default profile
+
+        Args:
+            ordered_files: Loaded file names, highest precedence first
+
+        Returns:
+            Effective bindings dictionary (just the user rebinds if no default profile is available)
+        """
+        merged = merge_bindings(self.file_bindings, ordered_files)
+        if self.default_profile is not None and self.default_profile.available():
+            return self.default_profile.resolve(merged)
+        return merged
+
+    def get_joystick_bindings(self) -> BindingCollection:
         """
         Get all joystick bindings
 
         Returns:
-            List of joystick binding dictionaries
+            Collection of joystick Binding records
         """
-        return self.bindings.get('joystick_bindings', [])
+        return self.bindings.get('joystick_bindings', BindingCollection())
 
     def parse_joystick_input(self, input_string: str) -> Dict:
         """
         Parse a joystick input string to extract device and button info
 
-        Example: "js1_button10" -> {'device': 1, 'button': 10}
+        Example: "js1_button10" -> {'device': 1, 'button': 10, ...}
 
         Args:
             input_string: The input string from the binding
 
         Returns:
-            Dictionary with device and button/axis information
+            Dictionary with device and button/axis/hat information
         """
-        result = {
-            'device': None,
-            'button': None,
-            'axis': None,
-            'hat': None
+        token = tokenize_input(input_string)
+        return {
+            'device': token.device_index if token.is_joystick else None,
+            'button': token.index if token.kind == KIND_BUTTON else None,
+            'axis': token.axis,
+            'hat': token.index if token.kind == KIND_HAT else None,
+            'direction': token.direction,
         }
-
-        if not input_string:
-            return result
-
-        input_lower = input_string.lower()
-
-        # Extract device number
-        if 'js' in input_lower:
-            try:
-                device_start = input_lower.find('js') + 2
-                device_end = device_start
-                while device_end < len(input_lower) and input_lower[device_end].isdigit():
-                    device_end += 1
-                result['device'] = int(input_lower[device_start:device_end])
-            except (ValueError, IndexError):
-                pass
-
-        # Extract button number
-        if 'button' in input_lower:
-            try:
-                button_start = input_lower.find('button') + 6
-                button_num = ''
-                for char in input_lower[button_start:]:
-                    if char.isdigit():
-                        button_num += char
-                    else:
-                        break
-                if button_num:
-                    result['button'] = int(button_num)
-            except ValueError:
-                pass
-
-        # Extract axis information
-        if 'axis' in input_lower or 'x' in input_lower or 'y' in input_lower or 'z' in input_lower:
-            result['axis'] = input_string  # Store raw for now
-
-        # Extract hat information
-        if 'hat' in input_lower or 'pov' in input_lower:
-            result['hat'] = input_string  # Store raw for now
-
-        return result
@@ -0,0 +1,186 @@
+"""
+Binding search
+Trigram index over action names, display names and inputs for search-as-you-type
+"""
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set
+from src.models.binding_models import Binding
+
+
+# Share of a term's trigrams a binding must contain to count as a fuzzy (typo) match
+FUZZY_MIN_SIMILARITY = 0.6
+
+
+def display_name(action: str) -> str:
+    """
+    Format a Star Citizen action name for display
+
+    Args:
+        action: Raw action name from XML, e.g. "v_toggle_quantum_mode"
+
+    Returns:
+        Readable name, e.g. "Toggle Quantum Mode"
+    """
+    action = action.replace('v_', '').replace('spaceship_', '')
+    return action.replace('_', ' ').title()
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Get the distinct three-character substrings of a text
+
+    Args:
+        text: Lowercase text
+
+    Returns:
+        Set of trigrams (empty for texts shorter than three characters)
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def search_text(binding: Binding) -> str:
+    """
+    Get the text a binding is found by
+
+    Args:
+        binding: Binding record
+
+    Returns:
+        Lowercase action name, display name and input, separated by newlines
+    """
+    return f"{binding.action}\n{display_name(binding.action)}\n{binding.input}".lower()
+
+
+class BindingSearchIndex:
+    """Inverted trigram index over bindings, updated incrementally like BindingIndex"""
+
+    def __init__(self, bindings: Iterable[Binding] = ()):
+        """
+        Build the index
+
+        Args:
+            bindings: Binding records to index
+        """
+        self._ids = {}  # (action, input) -> document id
+        self._bindings = {}  # document id -> Binding
+        self._texts = {}  # document id -> search text
+        self._postings = {}  # trigram -> document ids containing it
+        self._next_id = 0
+
+        for binding in bindings:
+            self.add(binding)
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+    def add(self, binding: Binding):
+        """
+        Index a binding (replacing any binding with the same action and input)
+
+        Args:
+            binding: Binding record to add
+        """
+        key = binding.key()
+        if key in self._ids:
+            self.remove(binding)
+
+        doc_id = self._next_id
+        self._next_id += 1
+        text = search_text(binding)
+        self._ids[key] = doc_id
+        self._bindings[doc_id] = binding
+        self._texts[doc_id] = text
+        for trigram in trigrams(text):
+            self._postings.setdefault(trigram, set()).add(doc_id)
+
+    def remove(self, binding: Binding):
+        """
+        Drop the binding with the same action and input, if indexed
+
+        Args:
+            binding: Binding record to remove
+        """
+        doc_id = self._ids.pop(binding.key(), None)
+        if doc_id is None:
+            return
+
+        del self._bindings[doc_id]
+        for trigram in trigrams(self._texts.pop(doc_id)):
+            posting = self._postings[trigram]
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[trigram]
+
+    def update(self, added: Iterable[Binding] = (), removed: Iterable[Binding] = ()):
+        """
+        Apply a binding diff incrementally
+
+        Args:
+            added: Bindings to add (or replace)
+            removed: Bindings to remove
+        """
+        for binding in removed:
+            self.remove(binding)
+        for binding in added:
+            self.add(binding)
+
+    def match_term(self, term: str) -> Dict[int, float]:
+        """
+        Find the documents matching one search term
+
+        Exact substring matches are looked up by intersecting the term's
+        trigram postings. Only if there are none, documents sharing most
+        of the term's trigrams are returned as fuzzy matches.
+
+        Args:
+            term: Lowercase search term
+
+        Returns:
+            Document id -> similarity (1.0 for an exact substring match)
+        """
+        grams = trigrams(term)
+        if not grams:
+            # Too short for trigrams; a scan is still cheap at this size
+            return {doc_id: 1.0 for doc_id, text in self._texts.items() if term in text}
+
+        postings = sorted((self._postings.get(trigram, ()) for trigram in grams), key=len)
+        if postings[0]:
+            candidates = set(postings[0]).intersection(*postings[1:])
+            exact = {doc_id: 1.0 for doc_id in candidates if term in self._texts[doc_id]}
+            if exact:
+                return exact
+
+        counts = Counter(chain.from_iterable(postings))
+        needed = FUZZY_MIN_SIMILARITY * len(grams)
+        return {doc_id: count / len(grams) for doc_id, count in counts.items() if count >= needed}
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Binding]:
+        """
+        Find the bindings matching every term of a query
+
+        Args:
+            query: Search text, e.g. "quantum" or "js1 button3"
+            limit: Maximum number of results (all of them for None)
+
+        Returns:
+            Matching Binding records, best match first (exact before fuzzy,
+            then in the order they were indexed)
+        """
+        scores = None
+        for term in query.lower().split():
+            matches = self.match_term(term)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {doc_id: score + matches[doc_id] for doc_id, score in scores.items() if doc_id in matches}
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self._bindings[doc_id] for doc_id in ranked]
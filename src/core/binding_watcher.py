@@ -0,0 +1,246 @@
+"""
+Mappings directory watcher
+Notices when the game rewrites a binding file so it can be reloaded on its own
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+
+# inotify event flags (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+INOTIFY_EVENT_HEADER = struct.Struct('iIII')
+
+# Marks a pending file whose size/mtime has not been sampled yet
+_UNSAMPLED = object()
+
+
+class InotifyBackend:
+    """Linux inotify change source"""
+
+    def __init__(self, directory: Path):
+        """
+        Start watching a directory
+
+        Args:
+            directory: Directory to watch
+
+        Raises:
+            OSError: If inotify is unavailable on this system
+        """
+        library = ctypes.util.find_library('c')
+        if not library:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        watch = libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), IN_WATCH_MASK)
+        if watch < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Wait for changes
+
+        Args:
+            timeout: Maximum time to block, in seconds
+
+        Returns:
+            Names of files that changed
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+            _, _, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+            if name:
+                changed.add(os.fsdecode(name))
+        return changed
+
+    def close(self):
+        """Stop watching"""
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Portable change source that compares file sizes and mtimes"""
+
+    def __init__(self, directory: Path, interval: float = 1.0):
+        """
+        Start watching a directory
+
+        Args:
+            directory: Directory to watch
+            interval: Seconds between directory scans
+        """
+        self.directory = directory
+        self.interval = interval
+        self.signatures = self.scan()
+
+    def scan(self) -> Dict[str, tuple]:
+        """Get (size, mtime) for every file in the directory"""
+        signatures = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return signatures
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Wait for changes
+
+        Args:
+            timeout: Maximum time to block, in seconds
+
+        Returns:
+            Names of files that changed
+        """
+        time.sleep(min(timeout, self.interval))
+        signatures = self.scan()
+        changed = {
+            name for name in signatures.keys() | self.signatures.keys()
+            if signatures.get(name) != self.signatures.get(name)
+        }
+        self.signatures = signatures
+        return changed
+
+    def close(self):
+        """Stop watching"""
+
+
+class BindingWatcher:
+    """Watches a Mappings directory and reports binding files once they settle"""
+
+    def __init__(self, directory: Path, on_change: Callable[[Path], bool],
+                 debounce: float = 0.3, poll_interval: float = 1.0, max_retries: int = 5):
+        """
+        Initialize the watcher
+
+        A file is reported only after it has stopped changing for a full
+        debounce window, so a save in progress is never handed out.
+
+        Args:
+            directory: Mappings directory to watch
+            on_change: Called from the watcher thread with the changed file's
+                path (which may no longer exist). Return False if the file
+                could not be read yet and should be retried.
+            debounce: Quiet time required before a change is reported (seconds)
+            poll_interval: Scan interval when falling back to polling (seconds)
+            max_retries: How often a file that fails to load is retried
+        """
+        self.directory = Path(directory)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.max_retries = max_retries
+        self.backend = None
+        self._pending = {}  # name -> (deadline, last signature, retries)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread:
+            return
+
+        try:
+            self.backend = InotifyBackend(self.directory)
+        except (OSError, AttributeError):
+            self.backend = PollingBackend(self.directory, self.poll_interval)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="BindingWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching and wait for the thread to finish"""
+        if not self._thread:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.backend.close()
+        self.backend = None
+        self._pending = {}
+
+    def file_signature(self, name: str) -> Optional[tuple]:
+        """Get (size, mtime) for a file, or None if it does not exist"""
+        try:
+            stat = os.stat(self.directory / name)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _run(self):
+        """Watcher thread main loop"""
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            timeout = self.poll_interval
+            if self._pending:
+                next_deadline = min(deadline for deadline, _, _ in self._pending.values())
+                timeout = max(0.0, min(timeout, next_deadline - now))
+
+            for name in self.backend.wait(timeout):
+                if name.lower().endswith('.xml'):
+                    retries = self._pending.get(name, (0, None, 0))[2]
+                    self._pending[name] = (time.monotonic() + self.debounce, _UNSAMPLED, retries)
+
+            self._process_pending()
+
+    def _process_pending(self):
+        """Report pending files whose size and mtime held still for a debounce window"""
+        now = time.monotonic()
+        for name, (deadline, last_signature, retries) in list(self._pending.items()):
+            if now < deadline:
+                continue
+
+            signature = self.file_signature(name)
+            if signature != last_signature:
+                # Still being written (or first sample) - wait another window
+                self._pending[name] = (now + self.debounce, signature, retries)
+                continue
+
+            del self._pending[name]
+            try:
+                loaded = self.on_change(self.directory / name)
+            except Exception as e:
+                print(f"Error reloading {name}: {e}")
+                loaded = True
+
+            if loaded is False and retries < self.max_retries:
+                self._pending[name] = (now + self.debounce, _UNSAMPLED, retries + 1)
@@ -0,0 +1,328 @@
+"""
+Surgical binding file writer
+Edits rebinds in a layout file by patching their byte spans instead of re-serializing the XML
+"""
+import os
+import re
+import shutil
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+from src.models.binding_models import Binding
+
+
+# Whole <rebind ...> start tag, matched at the offset expat reports for it
+REBIND_TAG = re.compile(rb'<rebind\b(?:\s+[\w:.-]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*/?>')
+# One attribute of a start tag, with the whitespace in front of it
+ATTRIBUTE = re.compile(rb'\s+([\w:.-]+)\s*=\s*(?:"[^"]*"|\'[^\']*\')')
+
+
+def _encode(value: str) -> bytes:
+    """Encode an attribute value for a double-quoted attribute"""
+    return escape(value, {'"': '&quot;'}).encode('utf-8')
+
+
+class RebindSpan:
+    """A <rebind> start tag and where it sits in the file"""
+
+    __slots__ = ('action', 'attributes', 'start', 'end')
+
+    def __init__(self, action: str, attributes: Dict[str, str], start: int, end: int):
+        self.action = action
+        self.attributes = attributes  # Attribute name -> value, as last written
+        self.start = start  # Byte offset of '<rebind'
+        self.end = end  # Byte offset just past the closing '>' of the start tag
+
+    @property
+    def input(self) -> str:
+        return self.attributes.get('input', '')
+
+    @property
+    def multi_tap(self) -> str:
+        return self.attributes.get('multiTap', '')
+
+    def __repr__(self) -> str:
+        return f"RebindSpan({self.action!r}, {self.input!r}, {self.start}:{self.end})"
+
+
+def scan_rebinds(data: bytes) -> List[RebindSpan]:
+    """
+    Parse a layout file, recording the byte span of every <rebind> start tag
+
+    Args:
+        data: File contents (UTF-8 encoded XML)
+
+    Returns:
+        RebindSpan list in document order
+
+    Raises:
+        ET.ParseError: If the data is not well-formed XML
+    """
+    rebinds = []
+    action_names = []
+    parser = expat.ParserCreate()
+
+    def start_element(tag, attributes):
+        if tag == 'action':
+            action_names.append(attributes.get('name', 'Unknown'))
+        elif tag == 'rebind' and action_names:
+            offset = parser.CurrentByteIndex
+            match = REBIND_TAG.match(data, offset)
+            if match:
+                rebinds.append(RebindSpan(action_names[-1], attributes, offset, match.end()))
+
+    def end_element(tag):
+        if tag == 'action' and action_names:
+            action_names.pop()
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    try:
+        parser.Parse(data, True)
+    except expat.ExpatError as e:
+        raise ET.ParseError(str(e)) from e
+    return rebinds
+
+
+def render_tag(tag: bytes, changes: Dict[str, Optional[str]]) -> bytes:
+    """
+    Apply attribute changes to one start tag, leaving everything else byte for byte
+
+    Args:
+        tag: Original start tag bytes, e.g. b'<rebind input="js1_button3"/>'
+        changes: Attribute name -> new value, or None to remove the attribute
+
+    Returns:
+        The patched start tag
+    """
+    pending = dict(changes)
+    parts = []
+    position = 0
+    for match in ATTRIBUTE.finditer(tag):
+        name = match.group(1).decode('utf-8')
+        if name not in pending:
+            continue
+        value = pending.pop(name)
+        parts.append(tag[position:match.start()])
+        if value is not None:
+            parts.append(b' ' + match.group(1) + b'="' + _encode(value) + b'"')
+        position = match.end()
+
+    # Attributes the tag did not have yet go before the closing '/>' or '>'
+    close = len(tag) - (2 if tag.endswith(b'/>') else 1)
+    tail = tag[position:close]
+    head = tail.rstrip()
+    parts.append(head)
+    for name, value in pending.items():
+        if value is not None:
+            parts.append(f' {name}="'.encode('utf-8') + _encode(value) + b'"')
+    parts.append(tail[len(head):])
+    parts.append(tag[close:])
+    return b''.join(parts)
+
+
+class ProfileWriter:
+    """Edits the rebinds of one layout file and saves them as byte patches"""
+
+    def __init__(self, file_path: Path):
+        """
+        Read and index a layout file
+
+        Args:
+            file_path: Path to the XML binding file
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+            OSError: If the file cannot be read
+        """
+        self.file_path = Path(file_path)
+        self._data = b''
+        self._stat_key = None
+        self._rebinds = []
+        self._by_key = {}  # (action, input) -> RebindSpan list
+        self._changes = {}  # RebindSpan start -> (RebindSpan, attribute changes)
+        self.reload()
+
+    def reload(self):
+        """Re-read the file, dropping unsaved changes"""
+        with open(self.file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._data = f.read()
+        self._stat_key = (stat.st_size, stat.st_mtime_ns)
+        self._rebinds = scan_rebinds(self._data)
+        self._changes = {}
+        self._by_key = {}
+        for rebind in self._rebinds:
+            self._by_key.setdefault((rebind.action, rebind.input), []).append(rebind)
+
+    def rebinds(self) -> List[RebindSpan]:
+        """Every rebind in the file, in document order"""
+        return list(self._rebinds)
+
+    def find(self, action: str, input: Optional[str] = None) -> List[RebindSpan]:
+        """
+        Find the rebinds of an action
+
+        Args:
+            action: SC action name
+            input: Only return rebinds of this input (as last saved)
+
+        Returns:
+            Matching RebindSpan records in document order
+        """
+        if input is not None:
+            return list(self._by_key.get((action, input), []))
+        return [rebind for rebind in self._rebinds if rebind.action == action]
+
+    def update(self, rebind: RebindSpan, changes: Dict[str, Optional[str]]):
+        """
+        Queue attribute changes for a rebind
+
+        Args:
+            rebind: RebindSpan from find() or rebinds()
+            changes: Attribute name -> new value, or None to remove the attribute
+        """
+        _, queued = self._changes.get(rebind.start, (rebind, {}))
+        queued.update(changes)
+        self._changes[rebind.start] = (rebind, queued)
+
+    def rebind(self, binding: Binding, new_input: str, multi_tap: Optional[str] = None) -> int:
+        """
+        Move a binding to another input
+
+        Args:
+            binding: The binding as parsed from this file
+            new_input: SC input string, e.g. "js2_button4"
+            multi_tap: New multiTap value ('' removes it, None leaves it alone)
+
+        Returns:
+            Number of rebinds changed (0 if the binding is not in the file)
+        """
+        changes = {'input': new_input}
+        if multi_tap is not None:
+            changes['multiTap'] = multi_tap or None
+
+        rebinds = self.find(binding.action, binding.input)
+        for rebind in rebinds:
+            self.update(rebind, changes)
+        return len(rebinds)
+
+    def unbind(self, binding: Binding) -> int:
+        """
+        Clear a binding the way the game does, with a blank input on the same device ("js1_ ")
+
+        Args:
+            binding: The binding as parsed from this file
+
+        Returns:
+            Number of rebinds changed
+        """
+        device = binding.input.split('_', 1)[0]
+        return self.rebind(binding, f"{device}_ ", '')
+
+    def has_changes(self) -> bool:
+        """True while there are queued changes"""
+        return bool(self._changes)
+
+    def discard(self):
+        """Drop every queued change"""
+        self._changes = {}
+
+    def patches(self) -> List[Tuple[int, int, bytes]]:
+        """
+        Render the queued changes
+
+        Returns:
+            (start, end, replacement bytes) per changed start tag, in file order
+        """
+        return [
+            (rebind.start, rebind.end, render_tag(self._data[rebind.start:rebind.end], changes))
+            for _, (rebind, changes) in sorted(self._changes.items())
+        ]
+
+    def save(self) -> bool:
+        """
+        Write the queued changes to disk
+
+        The untouched bytes between patches are copied as they are, so the
+        work besides the copy scales with the number of edits. The result is
+        written to a temporary file and renamed over the original, so the game
+        and the file watcher never see a half-written layout.
+
+        Returns:
+            True if the file was written (or there was nothing to write)
+        """
+        if not self._changes:
+            return True
+
+        try:
+            stat = os.stat(self.file_path)
+        except OSError as e:
+            print(f"Could not save {self.file_path}: {e}")
+            return False
+        if (stat.st_size, stat.st_mtime_ns) != self._stat_key:
+            print(f"Not saving {self.file_path}: it changed on disk since it was read")
+            return False
+
+        patches = self.patches()
+        parts = []
+        position = 0
+        for start, end, replacement in patches:
+            parts.append(self._data[position:start])
+            parts.append(replacement)
+            position = end
+        parts.append(self._data[position:])
+        data = b''.join(parts)
+
+        temp_path = self.file_path.with_suffix(self.file_path.suffix + '.tmp')
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(self.file_path, temp_path)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            print(f"Could not save {self.file_path}: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return False
+
+        stat = os.stat(self.file_path)
+        self._stat_key = (stat.st_size, stat.st_mtime_ns)
+        self._data = data
+        self._apply_saved(patches)
+        return True
+
+    def _apply_saved(self, patches: List[Tuple[int, int, bytes]]):
+        """Move the recorded spans to where the saved patches left them"""
+        changed = {start: changes for start, (_, changes) in self._changes.items()}
+        self._changes = {}
+        patch_index = 0
+        shift = 0
+        for rebind in self._rebinds:
+            # Every patch is one whole start tag, so spans only ever shift
+            while patch_index < len(patches) and patches[patch_index][0] < rebind.start:
+                start, end, replacement = patches[patch_index]
+                shift += len(replacement) - (end - start)
+                patch_index += 1
+
+            changes = changed.get(rebind.start)
+            rebind.start += shift
+            if changes is None:
+                rebind.end += shift
+                continue
+
+            start, end, replacement = patches[patch_index]
+            rebind.end = rebind.start + len(replacement)
+            self._by_key[(rebind.action, rebind.input)].remove(rebind)
+            for name, value in changes.items():
+                if value is None:
+                    rebind.attributes.pop(name, None)
+                else:
+                    rebind.attributes[name] = value
+            self._by_key.setdefault((rebind.action, rebind.input), []).append(rebind)
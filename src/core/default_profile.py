@@ -0,0 +1,239 @@
+"""
+Default profile resolution
+Layers the user's rebinds over the game's defaultProfile.xml to get the effective bindings
+"""
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from src.core.binding_cache import BindingCache, default_data_dir, fingerprint_file
+from src.core.xml_backend import get_backend
+from src.models.binding_models import Binding, BindingCollection
+
+
+DEFAULT_PROFILE_NAME = "defaultProfile.xml"
+
+# Device attributes/elements of a default action and the SC device prefix they bind on
+DEVICE_PREFIXES = {
+    'joystick': 'js1',
+    'keyboard': 'kb1',
+    'mouse': 'mo1',
+    'gamepad': 'gp1',
+}
+
+# Device prefix of a Binding -> binding list it is merged into
+DEVICE_BINDING_TYPES = {
+    'js': 'joystick_bindings',
+    'kb': 'keyboard_bindings',
+    'mo': 'mouse_bindings',
+}
+
+# Inputs that already carry a device prefix, e.g. "js2_button1"
+_PREFIXED_INPUT = re.compile(r'^(?:js|kb|mo|gp)\d+_', re.IGNORECASE)
+
+
+def default_profile_path() -> Path:
+    """
+    Get the default location of the user-provided defaultProfile.xml
+
+    Returns:
+        Path in the StarSticks data directory (the file is extracted from the game data by the user)
+    """
+    return default_data_dir() / DEFAULT_PROFILE_NAME
+
+
+def is_unbound(binding: Binding) -> bool:
+    """
+    Check whether a binding clears its action (e.g. input "js1_ ")
+
+    Args:
+        binding: Binding record
+
+    Returns:
+        True if the input names no control
+    """
+    return binding.input.strip().endswith('_')
+
+
+def _default_binding(action_name: str, device: str, value: str, multi_tap: str = '',
+                     actionmap: str = '') -> Optional[Binding]:
+    """Build the binding for one default input value, or None if it is blank"""
+    value = value.strip()
+    if not value:
+        return None
+    if not _PREFIXED_INPUT.match(value):
+        value = f"{DEVICE_PREFIXES[device]}_{value}"
+    return Binding(action_name, value, multi_tap, actionmap)
+
+
+def parse_default_profile(file_path: Path, xml_backend: Optional[str] = None) -> Dict[str, List[Binding]]:
+    """
+    Stream-parse a defaultProfile.xml into default bindings by action
+
+    Defaults appear either as device attributes (joystick="button1") or as
+    device child elements holding an input attribute or <inputdata> entries.
+
+    Args:
+        file_path: Path to defaultProfile.xml
+        xml_backend: 'lxml', 'etree', or None to use lxml when it is installed
+
+    Returns:
+        Action name -> default Binding records
+
+    Raises:
+        ET.ParseError: If the file is not well-formed XML
+    """
+    defaults = {}
+    open_elements = []
+    action_names = []
+    actionmap_names = []
+    device_names = []
+
+    backend = get_backend(xml_backend)
+    for event, elem in backend.iterparse(file_path, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            open_elements.append(elem)
+            if tag == 'action':
+                action_name = elem.get('name', 'Unknown')
+                action_names.append(action_name)
+                actionmap = actionmap_names[-1] if actionmap_names else ''
+                for device in DEVICE_PREFIXES:
+                    binding = _default_binding(action_name, device, elem.get(device, ''), '', actionmap)
+                    if binding:
+                        defaults.setdefault(action_name, []).append(binding)
+            elif tag == 'actionmap':
+                actionmap_names.append(elem.get('name', ''))
+            elif tag in DEVICE_PREFIXES and action_names:
+                device_names.append(tag)
+            continue
+
+        open_elements.pop()
+
+        if action_names:
+            device = None
+            if tag in DEVICE_PREFIXES:
+                device = device_names.pop()
+            elif tag == 'inputdata' and device_names:
+                device = device_names[-1]
+
+            if device and elem.get('input') is not None:
+                binding = _default_binding(action_names[-1], device, elem.get('input'),
+                                           elem.get('multiTap', ''),
+                                           actionmap_names[-1] if actionmap_names else '')
+                if binding:
+                    defaults.setdefault(action_names[-1], []).append(binding)
+
+            if tag == 'action':
+                action_names.pop()
+        elif tag == 'actionmap' and actionmap_names:
+            actionmap_names.pop()
+
+        # Drop the consumed subtree; it is always the last open child
+        elem.clear()
+        if open_elements:
+            open_elements[-1].remove(elem)
+
+    return defaults
+
+
+def resolve_bindings(defaults: Dict[str, List[Binding]], overrides: Dict[str, Iterable[Binding]]) -> Dict:
+    """
+    Apply user rebinds on top of the default bindings
+
+    A rebind replaces every default of its action on the same kind of device
+    (a joystick rebind leaves the keyboard default alone); a blank rebind
+    ("js1_ ") clears them. Runs in one pass over each side.
+
+    Args:
+        defaults: Action name -> default bindings (from parse_default_profile)
+        overrides: Merged user bindings, binding type -> bindings
+
+    Returns:
+        Effective bindings dictionary, binding type -> BindingCollection
+    """
+    resolved = {binding_type: BindingCollection() for binding_type in DEVICE_BINDING_TYPES.values()}
+    overridden = set()
+    for bindings in overrides.values():
+        for binding in bindings:
+            overridden.add((binding.action, binding.device))
+
+    for action_defaults in defaults.values():
+        for binding in action_defaults:
+            binding_type = DEVICE_BINDING_TYPES.get(binding.device)
+            if binding_type and (binding.action, binding.device) not in overridden:
+                resolved[binding_type].append(binding)
+
+    for binding_type, bindings in overrides.items():
+        target = resolved.setdefault(binding_type, BindingCollection())
+        target.extend(binding for binding in bindings if not is_unbound(binding))
+
+    return resolved
+
+
+class DefaultProfile:
+    """The game's default bindings, parsed once and cached in memory and on disk"""
+
+    def __init__(self, file_path: Optional[Path] = None, cache: Optional[BindingCache] = None):
+        """
+        Initialize the default profile
+
+        Args:
+            file_path: Path to defaultProfile.xml (defaults to default_profile_path())
+            cache: Parse-result cache to use (defaults to the per-user cache)
+        """
+        self.file_path = Path(file_path) if file_path else default_profile_path()
+        self.cache = cache if cache is not None else BindingCache()
+        self._defaults = None
+        self._stat_key = None  # (size, mtime_ns) the in-memory defaults were loaded from
+
+    def available(self) -> bool:
+        """Check whether the defaultProfile.xml exists"""
+        return self.file_path.is_file()
+
+    def defaults(self) -> Dict[str, List[Binding]]:
+        """
+        Get the default bindings by action
+
+        Served from memory while the file is unchanged, then from the disk
+        cache, and only parsed when both miss.
+
+        Returns:
+            Action name -> default Binding records (empty if the file is missing or invalid)
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            self._defaults, self._stat_key = None, None
+            return {}
+
+        stat_key = (stat.st_size, stat.st_mtime_ns)
+        if self._defaults is not None and stat_key == self._stat_key:
+            return self._defaults
+
+        defaults = self.cache.load(self.file_path)
+        if defaults is None:
+            try:
+                fingerprint = fingerprint_file(self.file_path)
+                defaults = parse_default_profile(self.file_path)
+            except (ET.ParseError, OSError) as e:
+                print(f"Error parsing {self.file_path}: {e}")
+                return {}
+            self.cache.store(self.file_path, defaults, fingerprint)
+            self.cache.evict()
+
+        self._defaults, self._stat_key = defaults, stat_key
+        return defaults
+
+    def resolve(self, overrides: Dict[str, Iterable[Binding]]) -> Dict:
+        """
+        Get the effective bindings for a set of user rebinds
+
+        Args:
+            overrides: Merged user bindings, binding type -> bindings
+
+        Returns:
+            Effective bindings dictionary, binding type -> BindingCollection
+        """
+        return resolve_bindings(self.defaults(), overrides)
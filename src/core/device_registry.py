@@ -0,0 +1,332 @@
+"""
+Joystick device registry
+Keeps connected joysticks open and current from SDL hotplug events, without restarting the joystick subsystem
+"""
+import threading
+import pygame
+from typing import Callable, Dict, List, Optional
+
+
+# Notification kinds passed to registry listeners
+DEVICE_ADDED = 'added'
+DEVICE_REMOVED = 'removed'
+
+# Joystick state is polled, so nothing reads these from the event queue. They are
+# dropped on every poll so a moving axis cannot fill the queue and crowd out hotplug events.
+JOYSTICK_INPUT_EVENTS = (
+    pygame.JOYAXISMOTION, pygame.JOYBALLMOTION, pygame.JOYHATMOTION,
+    pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+)
+
+# Called with (DEVICE_ADDED or DEVICE_REMOVED, device info dict)
+DeviceListener = Callable[[str, Dict], None]
+
+
+def device_info(joy, device_index: int) -> Dict:
+    """
+    Describe an open joystick
+
+    Args:
+        joy: Initialized pygame Joystick
+        device_index: SDL device index the joystick was opened at
+
+    Returns:
+        Dictionary containing joystick information
+    """
+    return {
+        'id': device_index,
+        'name': joy.get_name(),
+        'guid': joy.get_guid(),
+        'buttons': joy.get_numbuttons(),
+        'axes': joy.get_numaxes(),
+        'hats': joy.get_numhats(),
+        'instance_id': joy.get_instance_id()
+    }
+
+
+class DeviceRegistry:
+    """
+    Open joystick handles keyed by instance id and GUID, updated from hotplug events
+
+    Handles are opened, closed and read from more than one thread (the GUI
+    and an InputSampler), so every change and every read of joystick state
+    happens under `lock`. Listeners are called on whichever thread made the
+    change.
+    """
+
+    def __init__(self):
+        """Initialize the registry (devices are opened by scan() or poll_events())"""
+        if not pygame.joystick.get_init():
+            pygame.joystick.init()
+
+        # Held while handles are opened or closed; hold it to read joystick state safely
+        self.lock = threading.RLock()
+
+        self._devices = {}  # instance id -> device info
+        self._handles = {}  # instance id -> open pygame Joystick
+        self._by_guid = {}  # GUID -> instance ids (identical sticks share a GUID)
+        self._names = {}  # instance id -> lowercase name
+        self._ordered = None  # devices() result, rebuilt after a hotplug
+        self._name_lookups = {}  # lowercase query -> matching instance ids, cleared on hotplug
+        self._listeners = []
+        self.scanned = False  # True once scan() has enumerated the connected devices
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, instance_id: int) -> bool:
+        return instance_id in self._devices
+
+    def add_listener(self, listener: DeviceListener):
+        """
+        Get notified when a device is added or removed
+
+        Args:
+            listener: Called with (DEVICE_ADDED or DEVICE_REMOVED, device info)
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: DeviceListener):
+        """
+        Stop notifying a listener
+
+        Args:
+            listener: Previously added listener
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def invalidate(self):
+        """Drop the cached lookups after the set of devices changed"""
+        self._ordered = None
+        self._name_lookups.clear()
+
+    def notify(self, event: str, device: Dict):
+        """Pass a device change to every listener"""
+        for listener in list(self._listeners):
+            try:
+                listener(event, device)
+            except Exception as e:
+                print(f"Error in device listener for {device['name']}: {e}")
+
+    def open_device(self, device_index: int) -> Optional[Dict]:
+        """
+        Open a device and register it (a device that is already open is left as is)
+
+        Listeners are only notified for a device that was not registered yet.
+
+        Args:
+            device_index: SDL device index
+
+        Returns:
+            Device info, or None if the device could not be opened
+        """
+        with self.lock:
+            try:
+                joy = pygame.joystick.Joystick(device_index)
+                if not joy.get_init():
+                    joy.init()
+                instance_id = joy.get_instance_id()
+                if instance_id in self._devices:
+                    device = self._devices[instance_id]
+                    if device['id'] != device_index:
+                        device['id'] = device_index
+                        self._ordered = None
+                    return device
+                device = device_info(joy, device_index)
+            except pygame.error as e:
+                print(f"Error initializing joystick {device_index}: {e}")
+                return None
+
+            self._devices[instance_id] = device
+            self._handles[instance_id] = joy
+            self._by_guid.setdefault(device['guid'], []).append(instance_id)
+            self._names[instance_id] = device['name'].lower()
+            self.invalidate()
+            self.notify(DEVICE_ADDED, device)
+            return device
+
+    def close_device(self, instance_id: int) -> Optional[Dict]:
+        """
+        Close a device and unregister it
+
+        Args:
+            instance_id: SDL instance id of the device
+
+        Returns:
+            Device info of the removed device, or None if it was not registered
+        """
+        with self.lock:
+            device = self._devices.pop(instance_id, None)
+            if device is None:
+                return None
+
+            # Under the lock, so no other thread is reading the handle while it is closed
+            joy = self._handles.pop(instance_id)
+            try:
+                joy.quit()
+            except pygame.error:
+                pass  # Already gone with the device
+
+            same_guid = self._by_guid.get(device['guid'], [])
+            if instance_id in same_guid:
+                same_guid.remove(instance_id)
+            if not same_guid:
+                self._by_guid.pop(device['guid'], None)
+            del self._names[instance_id]
+
+            # SDL shifts the indices of the devices enumerated after the removed one
+            for other in self._devices.values():
+                if other['id'] > device['id']:
+                    other['id'] -= 1
+
+            self.invalidate()
+            self.notify(DEVICE_REMOVED, device)
+            return device
+
+    def scan(self) -> List[Dict]:
+        """
+        Reconcile the registry with every connected device
+
+        Devices that are already open keep their handle; only new or
+        vanished devices are opened, closed and notified.
+
+        Returns:
+            Info of every registered device
+        """
+        with self.lock:
+            seen = set()
+            for device_index in range(pygame.joystick.get_count()):
+                device = self.open_device(device_index)
+                if device is not None:
+                    seen.add(device['instance_id'])
+
+            for instance_id in [known for known in self._devices if known not in seen]:
+                self.close_device(instance_id)
+
+            self.scanned = True
+            return self.devices()
+
+    def poll_events(self, pump: bool = True) -> int:
+        """
+        Apply pending SDL hotplug events
+
+        Call regularly from the one thread that pumps SDL (the InputSampler's
+        thread while it runs), so SDL is never pumped from two threads.
+
+        Args:
+            pump: Pump SDL first; pass False when the caller has just pumped it
+
+        Returns:
+            Number of devices added or removed
+        """
+        changes = 0
+        with self.lock:
+            try:
+                events = pygame.event.get((pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED), pump=pump)
+                pygame.event.clear(JOYSTICK_INPUT_EVENTS, pump=pump)
+            except pygame.error as e:
+                print(f"Error reading joystick events: {e}")
+                return 0
+
+            for event in events:
+                if event.type == pygame.JOYDEVICEADDED:
+                    # SDL also reports the devices that were present at startup; those are already open
+                    known = len(self._devices)
+                    self.open_device(event.device_index)
+                    changes += len(self._devices) - known
+                elif self.close_device(event.instance_id) is not None:
+                    changes += 1
+        return changes
+
+    def devices(self) -> List[Dict]:
+        """Get the info of every registered device, in SDL device index order"""
+        with self.lock:
+            if self._ordered is None:
+                self._ordered = sorted(self._devices.values(), key=lambda device: device['id'])
+            return list(self._ordered)
+
+    def device(self, instance_id: int) -> Optional[Dict]:
+        """
+        Get a device by SDL instance id
+
+        Args:
+            instance_id: SDL instance id
+
+        Returns:
+            Device info, or None if not registered
+        """
+        return self._devices.get(instance_id)
+
+    def devices_for_guid(self, guid: str) -> List[Dict]:
+        """
+        Get the devices with a GUID
+
+        Args:
+            guid: SDL joystick GUID string
+
+        Returns:
+            Device infos, in the order they were connected
+        """
+        return [self._devices[instance_id] for instance_id in self._by_guid.get(guid, ())]
+
+    def find_by_name(self, name: str) -> List[Dict]:
+        """
+        Get the devices whose name contains a text
+
+        Results are cached per query until the next hotplug, so repeated
+        lookups never touch SDL or rescan the names.
+
+        Args:
+            name: Case-insensitive part of the device name
+
+        Returns:
+            Device infos, in SDL device index order
+        """
+        query = name.lower()
+        with self.lock:
+            matches = self._name_lookups.get(query)
+            if matches is None:
+                matches = tuple(device['instance_id'] for device in self.devices()
+                                if query in self._names[device['instance_id']])
+                self._name_lookups[query] = matches
+            return [self._devices[instance_id] for instance_id in matches]
+
+    def handles(self) -> Dict[int, object]:
+        """
+        Get a snapshot of the open handles, safe to iterate from another thread
+
+        Hold `lock` while reading from the handles, or one may be closed mid-read.
+
+        Returns:
+            Instance id -> open pygame Joystick
+        """
+        with self.lock:
+            return dict(self._handles)
+
+    def handle(self, instance_id: int):
+        """
+        Get the open pygame Joystick of a device
+
+        Args:
+            instance_id: SDL instance id
+
+        Returns:
+            pygame Joystick, or None if not registered
+        """
+        return self._handles.get(instance_id)
+
+    def close(self):
+        """Close every open handle without notifying listeners"""
+        with self.lock:
+            for joy in self._handles.values():
+                try:
+                    joy.quit()
+                except pygame.error:
+                    pass
+            self._devices.clear()
+            self._handles.clear()
+            self._by_guid.clear()
+            self._names.clear()
+            self.invalidate()
+            self.scanned = False
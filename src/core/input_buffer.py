@@ -0,0 +1,134 @@
+"""
+Input sample ring buffer
+Array-backed ring the sampling thread writes and the GUI drains once per frame, without a lock
+"""
+from array import array
+from typing import List, NamedTuple
+
+
+# Sample kinds
+SAMPLE_BUTTON = 0
+SAMPLE_AXIS = 1
+SAMPLE_HAT = 2
+
+DEFAULT_CAPACITY = 16384
+
+
+class InputSample(NamedTuple):
+    """One control changing value on one device"""
+    timestamp: float  # time.perf_counter() when the change was sampled
+    device: int  # SDL instance id
+    kind: int  # SAMPLE_BUTTON, SAMPLE_AXIS or SAMPLE_HAT
+    index: int  # 0-based button, axis or hat number
+    value: float  # 1.0/0.0 for buttons, -1.0..1.0 for axes, encode_hat() for hats
+
+
+def encode_hat(position) -> float:
+    """
+    Pack a hat position into a sample value
+
+    Args:
+        position: (x, y) with each of -1, 0 or 1, as pygame reports it
+
+    Returns:
+        Value from 0.0 to 8.0 (4.0 is centered)
+    """
+    x, y = position
+    return float((y + 1) * 3 + (x + 1))
+
+
+def decode_hat(value: float):
+    """
+    Unpack a hat sample value
+
+    Args:
+        value: Value from encode_hat()
+
+    Returns:
+        (x, y) with each of -1, 0 or 1
+    """
+    y, x = divmod(int(value), 3)
+    return x - 1, y - 1
+
+
+class InputRingBuffer:
+    """
+    Fixed-size ring of input samples for one writer and one reader
+
+    The writer fills a slot and then publishes it by advancing `written`;
+    the reader only advances `read`. Each counter has a single writer, so
+    no lock is needed. When the reader falls more than a full ring behind,
+    the oldest samples are overwritten and counted in `dropped`.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Allocate the ring
+
+        Args:
+            capacity: Number of samples held (rounded up to a power of two)
+        """
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.capacity = size
+        self._mask = size - 1
+
+        # One typed array per field instead of a list of objects, so the ring allocates nothing per sample
+        self._timestamps = array('d', [0.0]) * size
+        self._devices = array('l', [0]) * size
+        self._kinds = array('B', [0]) * size
+        self._indices = array('H', [0]) * size
+        self._values = array('f', [0.0]) * size
+
+        self.written = 0  # Samples ever written (writer only)
+        self.read = 0  # Samples ever consumed (reader only)
+        self.dropped = 0  # Samples overwritten before the reader got to them (reader only)
+
+    def __len__(self) -> int:
+        return min(self.written - self.read, self.capacity)
+
+    def push(self, timestamp: float, device: int, kind: int, index: int, value: float):
+        """
+        Append a sample (writer thread only)
+
+        Args:
+            timestamp: time.perf_counter() of the sample
+            device: SDL instance id
+            kind: SAMPLE_BUTTON, SAMPLE_AXIS or SAMPLE_HAT
+            index: 0-based control number
+            value: Sample value
+        """
+        slot = self.written & self._mask
+        self._timestamps[slot] = timestamp
+        self._devices[slot] = device
+        self._kinds[slot] = kind
+        self._indices[slot] = index
+        self._values[slot] = value
+        self.written += 1  # Publish only once the slot is complete
+
+    def drain(self) -> List[InputSample]:
+        """
+        Take every sample written since the last drain (reader thread only)
+
+        Returns:
+            InputSample records, oldest first
+        """
+        written = self.written
+        start = max(self.read, written - self.capacity)
+        self.dropped += start - self.read
+
+        samples = []
+        for position in range(start, written):
+            slot = position & self._mask
+            samples.append(InputSample(self._timestamps[slot], self._devices[slot], self._kinds[slot],
+                                       self._indices[slot], self._values[slot]))
+
+        # Slots the writer lapped while they were being copied may mix two samples
+        overwritten = min(self.written - self.capacity - start, len(samples))
+        if overwritten > 0:
+            del samples[:overwritten]
+            self.dropped += overwritten
+
+        self.read = written
+        return samples
@@ -0,0 +1,196 @@
+"""
+Joystick input sampler
+Samples every registered joystick on a background thread and records timestamped changes in a ring buffer
+"""
+import threading
+import time
+import pygame
+from typing import Dict, Optional
+from src.core.device_registry import DeviceRegistry
+from src.core.input_buffer import SAMPLE_AXIS, SAMPLE_BUTTON, SAMPLE_HAT, InputRingBuffer, encode_hat
+
+
+DEFAULT_RATE_HZ = 500
+MAX_RATE_HZ = 1000
+
+# Axis movement smaller than this is sensor noise, not a change worth recording
+AXIS_EPSILON = 0.002
+
+# Seconds between hotplug checks; connecting a stick needs no faster response
+HOTPLUG_INTERVAL = 0.25
+
+
+class InputSampler:
+    """
+    Samples button, axis and hat state of every registered device at a fixed rate
+
+    Only changes are written to the ring buffer, so a press and release
+    shorter than a GUI frame still arrive as two samples. The sampling
+    thread initializes SDL's event handling and is the only one that pumps
+    it (SDL only allows pumping from the thread that initialized video): it
+    pumps once per sample and applies hotplug events every HOTPLUG_INTERVAL,
+    so registry listeners are called on it. The GUI thread only drains the
+    ring.
+    """
+
+    def __init__(self, registry: DeviceRegistry, rate_hz: int = DEFAULT_RATE_HZ,
+                 buffer: Optional[InputRingBuffer] = None):
+        """
+        Set up the sampler (call start() to begin sampling)
+
+        Args:
+            registry: Device registry whose open joysticks are sampled
+            rate_hz: Samples per second, up to MAX_RATE_HZ
+            buffer: Ring buffer to write to (a new one by default)
+
+        Raises:
+            ValueError: If rate_hz is not between 1 and MAX_RATE_HZ
+        """
+        if not 1 <= rate_hz <= MAX_RATE_HZ:
+            raise ValueError(f"Sample rate must be between 1 and {MAX_RATE_HZ} Hz, got {rate_hz}")
+
+        self.registry = registry
+        self.rate_hz = rate_hz
+        self.buffer = buffer if buffer is not None else InputRingBuffer()
+        self._state = {}  # instance id -> (buttons, axes, hats) as last sampled
+        self._next_hotplug = 0.0  # time.perf_counter() of the next hotplug check
+        self.event_thread = None  # Ident of the thread that initialized SDL events and pumps them
+        self._thread = None
+        self._stop = threading.Event()
+
+        # Statistics (written by the sampling thread)
+        self.samples_taken = 0
+        self.overruns = 0  # Samples that started more than a period late
+        self.busy_seconds = 0.0  # Time spent sampling, to derive the thread's load
+
+    @property
+    def running(self) -> bool:
+        """True while the sampling thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sampling thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="InputSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread and wait for it to finish"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def init_events(self):
+        """
+        Initialize SDL's event handling on the calling thread, which becomes the one that pumps it
+
+        pygame's event functions need the video subsystem; no window is opened.
+        """
+        try:
+            with self.registry.lock:
+                if self.event_thread is not None and pygame.display.get_init():
+                    pygame.display.quit()  # Initialized by an earlier sampling thread, which has exited
+                if not pygame.display.get_init():
+                    pygame.display.init()
+                self.event_thread = threading.get_ident()
+        except pygame.error as e:
+            print(f"Error initializing joystick events: {e}")
+
+    def run(self):
+        """Sampling loop (runs on the sampling thread)"""
+        self.init_events()
+        period = 1.0 / self.rate_hz
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            self.sample(start)
+            self.busy_seconds += time.perf_counter() - start
+            self.samples_taken += 1
+
+            # Keep a fixed schedule; after a stall, skip ahead instead of sampling in a burst
+            deadline += period
+            now = time.perf_counter()
+            if now - deadline > period:
+                self.overruns += 1
+                deadline = now
+            elif deadline > now:
+                self._stop.wait(deadline - now)
+
+    def sample(self, timestamp: float):
+        """
+        Pump SDL, apply due hotplug events, read every device once and record what changed
+
+        On any thread but event_thread (e.g. the GUI thread while the sampling
+        thread is stopped) SDL is not pumped, and the state SDL last saw is read.
+
+        Args:
+            timestamp: time.perf_counter() to stamp the changes with
+        """
+        states = []
+        # Handles are only closed under the registry lock, so none is closed mid-read
+        with self.registry.lock:
+            if threading.get_ident() == self.event_thread:
+                try:
+                    pygame.event.pump()
+                except pygame.error as e:
+                    print(f"Error pumping joystick events: {e}")
+                    return
+
+                if timestamp >= self._next_hotplug:
+                    self._next_hotplug = timestamp + HOTPLUG_INTERVAL
+                    self.registry.poll_events(pump=False)
+
+            handles = self.registry.handles()
+            for instance_id, joy in handles.items():
+                try:
+                    states.append((instance_id,
+                                   [joy.get_button(i) for i in range(joy.get_numbuttons())],
+                                   [joy.get_axis(i) for i in range(joy.get_numaxes())],
+                                   [joy.get_hat(i) for i in range(joy.get_numhats())]))
+                except pygame.error:
+                    continue  # Unplugged; the registry drops it on its next hotplug check
+
+        for instance_id in [known for known in self._state if known not in handles]:
+            del self._state[instance_id]
+
+        push = self.buffer.push
+        for instance_id, buttons, axes, hats in states:
+            previous = self._state.get(instance_id)
+            self._state[instance_id] = (buttons, axes, hats)
+            if previous is None:
+                # First sample of a device: record its whole state
+                previous = ([None] * len(buttons), [None] * len(axes), [None] * len(hats))
+            old_buttons, old_axes, old_hats = previous
+
+            for i, pressed in enumerate(buttons):
+                if pressed != old_buttons[i]:
+                    push(timestamp, instance_id, SAMPLE_BUTTON, i, 1.0 if pressed else 0.0)
+            for i, value in enumerate(axes):
+                old = old_axes[i]
+                if old is None or abs(value - old) >= AXIS_EPSILON:
+                    push(timestamp, instance_id, SAMPLE_AXIS, i, value)
+                else:
+                    axes[i] = old  # Compare later samples against the last recorded value
+            for i, position in enumerate(hats):
+                if position != old_hats[i]:
+                    push(timestamp, instance_id, SAMPLE_HAT, i, encode_hat(position))
+
+    def get_stats(self) -> Dict:
+        """
+        Get sampling statistics
+
+        Returns:
+            Dictionary with samples taken, overruns, samples dropped by the
+            ring buffer and the sampling thread's load (0.0-1.0)
+        """
+        elapsed = self.samples_taken / self.rate_hz
+        return {
+            'rate_hz': self.rate_hz,
+            'samples': self.samples_taken,
+            'overruns': self.overruns,
+            'dropped': self.buffer.dropped,
+            'load': self.busy_seconds / elapsed if elapsed else 0.0,
+        }
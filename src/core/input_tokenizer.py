@@ -0,0 +1,124 @@
+"""
+Star Citizen input string tokenizer
+Turns rebind inputs like "js1_button10" or "js2_rotz" into typed tokens
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+# Kinds of physical input a token can describe
+KIND_BUTTON = 'button'
+KIND_AXIS = 'axis'
+KIND_HAT = 'hat'
+KIND_KEY = 'key'
+KIND_WHEEL = 'wheel'
+KIND_UNBOUND = 'unbound'
+KIND_UNKNOWN = 'unknown'
+
+# Device prefixes used by SC: joystick, keyboard, mouse, gamepad
+DEVICE_PREFIXES = ('js', 'kb', 'mo', 'gp')
+
+# Whole SC input grammar, e.g. "js1_button10", "js2_hat1_up", "kb1_lctrl+f", "js1_ "
+INPUT_PATTERN = re.compile(
+    r"""
+    ^(?P<device>js|kb|mo|gp)(?P<device_index>\d+)_
+    (?P<modifiers>(?:[lr](?:alt|ctrl|shift)\+)*)
+    (?:
+        button(?P<button>\d+)
+      | hat(?P<hat>\d+)_(?P<hat_direction>up|down|left|right)
+      | (?P<axis>rot[xyz]|[xyz]|slider\d+|maxis_[xy])
+      | mouse(?P<mouse_button>\d+)
+      | mwheel_(?P<wheel_direction>up|down)
+      | (?P<key>\S+)
+    )?
+    \s*$
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class InputToken:
+    """Parsed form of a single SC input string"""
+    raw: str
+    device: Optional[str] = None  # 'js', 'kb', 'mo' or 'gp'
+    device_index: Optional[int] = None  # SC's 1-based device number (js1 -> 1)
+    kind: str = KIND_UNKNOWN
+    index: Optional[int] = None  # Button, hat or mouse button number
+    axis: Optional[str] = None  # Axis name, e.g. 'x', 'rotz', 'slider1'
+    direction: Optional[str] = None  # Hat or wheel direction
+    key: Optional[str] = None  # Keyboard key or other unrecognised name
+    modifiers: Tuple[str, ...] = ()
+
+    @property
+    def is_joystick(self) -> bool:
+        """True if this token refers to a joystick input"""
+        return self.device == 'js'
+
+    @property
+    def normalized(self) -> str:
+        """Canonical lower-case form of the input, for grouping and comparison"""
+        if self.device is None:
+            return self.raw.strip().lower()
+        body = ''
+        if self.kind == KIND_BUTTON:
+            body = f"{'mouse' if self.device == 'mo' else 'button'}{self.index}"
+        elif self.kind == KIND_HAT:
+            body = f"hat{self.index}_{self.direction}"
+        elif self.kind == KIND_AXIS:
+            body = self.axis
+        elif self.kind == KIND_WHEEL:
+            body = f"mwheel_{self.direction}"
+        elif self.kind == KIND_KEY:
+            body = self.key
+        prefix = ''.join(f"{modifier}+" for modifier in self.modifiers)
+        return f"{self.device}{self.device_index}_{prefix}{body}"
+
+
+@lru_cache(maxsize=8192)
+def tokenize_input(input_string: str) -> InputToken:
+    """
+    Tokenize an SC input string
+
+    Results are memoized, so repeated inputs across a profile cost one
+    dictionary lookup.
+
+    Args:
+        input_string: Input from a <rebind> element, e.g. "js1_button10"
+
+    Returns:
+        Immutable InputToken describing the input
+    """
+    if not input_string or not input_string.strip():
+        return InputToken(raw=input_string or '', kind=KIND_UNBOUND)
+
+    match = INPUT_PATTERN.match(input_string.lower())
+    if not match:
+        return InputToken(raw=input_string)
+
+    groups = match.groupdict()
+    fields = {
+        'raw': input_string,
+        'device': groups['device'],
+        'device_index': int(groups['device_index']),
+        'modifiers': tuple(groups['modifiers'].rstrip('+').split('+')) if groups['modifiers'] else (),
+    }
+
+    if groups['button'] is not None:
+        fields.update(kind=KIND_BUTTON, index=int(groups['button']))
+    elif groups['hat'] is not None:
+        fields.update(kind=KIND_HAT, index=int(groups['hat']), direction=groups['hat_direction'])
+    elif groups['axis'] is not None:
+        fields.update(kind=KIND_AXIS, axis=groups['axis'])
+    elif groups['mouse_button'] is not None:
+        fields.update(kind=KIND_BUTTON, index=int(groups['mouse_button']))
+    elif groups['wheel_direction'] is not None:
+        fields.update(kind=KIND_WHEEL, direction=groups['wheel_direction'])
+    elif groups['key'] is not None:
+        fields.update(kind=KIND_KEY, key=groups['key'])
+    else:
+        fields.update(kind=KIND_UNBOUND)
+
+    return InputToken(**fields)
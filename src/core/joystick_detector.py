@@ -2,8 +2,24 @@
 Joystick detection module
 Detects connected joystick devices and retrieves their information
 """
+import re
 import pygame
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
+from src.core.device_registry import DeviceRegistry
+
+
+def compile_blacklist(words: Iterable[str]) -> re.Pattern:
+    """
+    Compile blacklisted name fragments into one pattern
+
+    Args:
+        words: Name fragments, e.g. JoystickDetector.DEVICE_BLACKLIST
+
+    Returns:
+        Pattern that finds any of the fragments in a lowercase device name
+    """
+    # Lowercasing the name first is faster than an IGNORECASE pattern
+    return re.compile('|'.join(re.escape(word.lower()) for word in words))
 
 
 class JoystickDetector:
@@ -22,10 +38,15 @@ class JoystickDetector:
 
     def __init__(self):
         """Initialize the joystick detector"""
-        # Initialize pygame joystick module
-        pygame.init()
+        # Only the joystick subsystem: SDL's event handling (video) is initialized by the thread
+        # that pumps it, the InputSampler's, since SDL may only be pumped from that thread
         pygame.joystick.init()
 
+        # Open devices, kept current by hotplug events (see DeviceRegistry.poll_events)
+        self.registry = DeviceRegistry()
+        self.blacklist = compile_blacklist(self.DEVICE_BLACKLIST)
+        self._blacklisted = {}  # device name -> is_blacklisted result
+
     def is_blacklisted(self, device_name: str) -> bool:
         """
         Check if a device is blacklisted (not a real joystick)
@@ -36,72 +57,86 @@ class JoystickDetector:
         Returns:
             True if the device is blacklisted
         """
-        name_lower = device_name.lower()
-        return any(blacklisted in name_lower for blacklisted in self.DEVICE_BLACKLIST)
+        blacklisted = self._blacklisted.get(device_name)
+        if blacklisted is None:
+            blacklisted = self.blacklist.search(device_name.lower()) is not None
+            self._blacklisted[device_name] = blacklisted
+        return blacklisted
 
     def detect(self, filter_blacklisted: bool = True) -> List[Dict]:
         """
         Detect all connected joysticks
 
+        Reconciles the device registry with SDL instead of restarting the
+        joystick subsystem, so devices that stay connected keep their handles.
+
         Args:
             filter_blacklisted: If True, filter out blacklisted devices
 
         Returns:
             List of dictionaries containing joystick information
         """
-        joysticks = []
-
-        # Refresh joystick list
-        pygame.joystick.quit()
-        pygame.joystick.init()
+        joysticks = self.registry.scan()
+        if filter_blacklisted:
+            joysticks = [joy for joy in joysticks if not self.is_blacklisted(joy['name'])]
+        return joysticks
 
-        joystick_count = pygame.joystick.get_count()
+    def ensure_scanned(self):
+        """Enumerate the devices once if nothing was detected yet; later lookups use the registry"""
+        if not self.registry.scanned:
+            self.registry.scan()
 
-        for i in range(joystick_count):
-            try:
-                joy = pygame.joystick.Joystick(i)
-                joy.init()
+    def get_joystick_by_name(self, name: str) -> Optional[Dict]:
+        """
+        Get a specific joystick by name
 
-                device_name = joy.get_name()
+        Looked up in the device registry, which hotplug events keep current,
+        so repeated lookups do not query SDL.
 
-                # Skip blacklisted devices if filtering is enabled
-                if filter_blacklisted and self.is_blacklisted(device_name):
-                    joy.quit()
-                    continue
+        Args:
+            name: The name of the joystick to find
 
-                joystick_info = {
-                    'id': i,
-                    'name': device_name,
-                    'guid': joy.get_guid(),
-                    'buttons': joy.get_numbuttons(),
-                    'axes': joy.get_numaxes(),
-                    'hats': joy.get_numhats(),
-                    'instance_id': joy.get_instance_id()
-                }
+        Returns:
+            Dictionary containing joystick information, or None if not found
+        """
+        self.ensure_scanned()
+        for joy in self.registry.find_by_name(name):
+            if not self.is_blacklisted(joy['name']):
+                return joy
+        return None
 
-                joysticks.append(joystick_info)
-                joy.quit()
+    def get_joystick_by_guid(self, guid: str) -> Optional[Dict]:
+        """
+        Get a specific joystick by GUID
 
-            except pygame.error as e:
-                print(f"Error initializing joystick {i}: {e}")
+        Args:
+            guid: SDL joystick GUID string
 
-        return joysticks
+        Returns:
+            Dictionary containing joystick information (the first connected one
+            if identical sticks share the GUID), or None if not found
+        """
+        self.ensure_scanned()
+        for joy in self.registry.devices_for_guid(guid):
+            if not self.is_blacklisted(joy['name']):
+                return joy
+        return None
 
-    def get_joystick_by_name(self, name: str) -> Dict:
+    def get_joystick_by_instance_id(self, instance_id: int) -> Optional[Dict]:
         """
-        Get a specific joystick by name
+        Get a specific joystick by SDL instance id
 
         Args:
-            name: The name of the joystick to find
+            instance_id: SDL instance id
 
         Returns:
             Dictionary containing joystick information, or None if not found
         """
-        joysticks = self.detect()
-        for joy in joysticks:
-            if name.lower() in joy['name'].lower():
-                return joy
-        return None
+        self.ensure_scanned()
+        joy = self.registry.device(instance_id)
+        if joy is None or self.is_blacklisted(joy['name']):
+            return None
+        return joy
 
     def is_virpil_alpha(self, joystick_name: str) -> bool:
         """
@@ -118,5 +153,6 @@ class JoystickDetector:
 
     def cleanup(self):
         """Clean up pygame resources"""
+        self.registry.close()
         pygame.joystick.quit()
         pygame.quit()
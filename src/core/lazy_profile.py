@@ -0,0 +1,246 @@
+"""
+Lazy binding profiles
+Indexes the actionmaps of a layout file cheaply and parses each one only when it is needed
+"""
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import unescape
+from src.core.action_categories import ACTIONMAP_MODES, ActionMode, categorize_action
+
+
+# Opening <actionmap ...> tag (group 2 is '/' when self-closing)
+ACTIONMAP_TAG = re.compile(rb'<actionmap\b([^>]*?)(/?)>')
+ACTIONMAP_END = b'</actionmap>'
+# name="..." or name='...' of an <action> element; \b keeps <actionmap> from matching
+ACTION_NAME = re.compile(rb'<action\b[^>]*?\bname\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+ACTION_TAG = re.compile(rb'<action\b')
+NAME_ATTRIBUTE = re.compile(rb'\bname\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def _decode(value: bytes) -> str:
+    """Decode an attribute value as the XML parser would"""
+    return unescape(value.decode('utf-8'), {'&quot;': '"', '&apos;': "'"})
+
+
+def _quoted_value(match) -> str:
+    """Decode the value of a name attribute match, whichever quotes it used"""
+    value = match.group(1)
+    return _decode(value if value is not None else match.group(2))
+
+
+class ActionmapEntry:
+    """Location and action names of one <actionmap> in a layout file"""
+
+    __slots__ = ('name', 'start', 'end', 'actions')
+
+    def __init__(self, name: str, start: int, end: int, actions: Tuple[str, ...]):
+        self.name = name
+        self.start = start  # Byte offset of '<actionmap'
+        self.end = end  # Byte offset just past '</actionmap>'
+        self.actions = actions
+
+
+def index_actionmaps(data) -> List[ActionmapEntry]:
+    """
+    Find every actionmap in a layout file without building any elements
+
+    Args:
+        data: File contents (bytes or mmap)
+
+    Returns:
+        ActionmapEntry list in document order
+    """
+    entries = []
+    position = 0
+    while True:
+        match = ACTIONMAP_TAG.search(data, position)
+        if not match:
+            break
+        name_match = NAME_ATTRIBUTE.search(match.group(1))
+        name = _quoted_value(name_match) if name_match else ''
+
+        if match.group(2):
+            end = match.end()
+        else:
+            close = data.find(ACTIONMAP_END, match.end())
+            end = close + len(ACTIONMAP_END) if close != -1 else len(data)
+
+        actions = tuple(dict.fromkeys(
+            _quoted_value(action) for action in ACTION_NAME.finditer(data, match.end(), end)
+        ))
+        entries.append(ActionmapEntry(name, match.start(), end, actions))
+        position = end
+    return entries
+
+
+def has_stray_actions(data, entries: List[ActionmapEntry]) -> bool:
+    """
+    Check for <action> elements outside every indexed actionmap
+
+    A full parse reads those too, so a file that has them cannot be
+    assembled from its actionmaps alone.
+
+    Args:
+        data: File contents (bytes or mmap)
+        entries: Result of index_actionmaps for the same contents
+
+    Returns:
+        True if any <action> lies between or around the actionmaps
+    """
+    position = 0
+    for entry in entries:
+        if ACTION_TAG.search(data, position, entry.start):
+            return True
+        position = entry.end
+    return ACTION_TAG.search(data, position) is not None
+
+
+class LazyProfile:
+    """A layout file whose actionmaps are parsed on first use"""
+
+    def __init__(self, file_path: Path, parser, fingerprint: Optional[Tuple] = None):
+        """
+        Index a layout file
+
+        Only the actionmap offsets and action names are read here; no
+        binding records are built.
+
+        Args:
+            file_path: Path to the XML binding file
+            parser: BindingParser used to classify and build bindings
+            fingerprint: Cache fingerprint of the file, taken before it was indexed
+        """
+        self.file_path = Path(file_path)
+        self.parser = parser
+        self.fingerprint = fingerprint  # Dropped if the file changes, as it no longer matches the parse
+        self._stat_key = None
+        self._entries = []
+        self.stray_actions = False  # True if actions outside the actionmaps need a full parse
+        self._parsed = {}  # actionmap index -> bindings dictionary
+        self._entry_modes = {}  # actionmap index -> modes of its actions
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild the actionmap index and drop everything parsed so far"""
+        stat = os.stat(self.file_path)
+        self._stat_key = (stat.st_size, stat.st_mtime_ns)
+        self._parsed = {}
+        self._entry_modes = {}
+        if stat.st_size == 0:
+            self._entries = []
+            self.stray_actions = False
+            return
+        with open(self.file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            self._entries = index_actionmaps(data)
+            self.stray_actions = has_stray_actions(data, self._entries)
+
+    def actionmap_names(self) -> List[str]:
+        """Names of the file's actionmaps, in document order"""
+        return [entry.name for entry in self._entries]
+
+    def parsed_count(self) -> int:
+        """Number of actionmaps parsed so far"""
+        return len(self._parsed)
+
+    def needs_full_parse(self) -> bool:
+        """
+        True if the actionmap index cannot stand in for a full parse
+
+        A file without <actionmap> elements is read as one unnamed group by
+        the parser, and actions outside the actionmaps are never indexed.
+        """
+        return not self._entries or self.stray_actions
+
+    def is_complete(self) -> bool:
+        """True once every actionmap has been parsed"""
+        return len(self._parsed) == len(self._entries)
+
+    def entry_modes(self, entry: ActionmapEntry) -> frozenset:
+        """Modes of an actionmap's actions: one for a known actionmap, else a guess per action"""
+        mode = ACTIONMAP_MODES.get(entry.name)
+        if mode is not None:
+            return frozenset((mode,))
+        return frozenset(categorize_action(action, entry.name) for action in entry.actions)
+
+    def actionmaps_for_mode(self, mode: ActionMode) -> List[int]:
+        """
+        Find the actionmaps holding actions of a mode
+
+        Args:
+            mode: ActionMode (ActionMode.ALL for every actionmap)
+
+        Returns:
+            Indices into the actionmap index
+        """
+        if mode == ActionMode.ALL:
+            return list(range(len(self._entries)))
+
+        positions = []
+        for position, entry in enumerate(self._entries):
+            modes = self._entry_modes.get(position)
+            if modes is None:
+                modes = self._entry_modes[position] = self.entry_modes(entry)
+            if mode in modes:
+                positions.append(position)
+        return positions
+
+    def _parse_actionmap(self, position: int) -> Dict:
+        """Parse one actionmap, reading only its byte range"""
+        entry = self._entries[position]
+        with open(self.file_path, 'rb') as f:
+            f.seek(entry.start)
+            data = f.read(entry.end - entry.start)
+
+        return self.parser.extract_bindings(self.parser.xml_backend.fromstring(data))
+
+    def refresh(self) -> bool:
+        """
+        Re-index the file if it changed on disk since it was indexed
+
+        Returns:
+            True if the file changed (everything parsed so far was dropped)
+        """
+        stat = os.stat(self.file_path)
+        if (stat.st_size, stat.st_mtime_ns) == self._stat_key:
+            return False
+        self.fingerprint = None
+        self.reindex()
+        return True
+
+    def materialize(self, mode: ActionMode) -> int:
+        """
+        Parse the actionmaps a mode needs, if they are not parsed yet
+
+        Args:
+            mode: ActionMode (ActionMode.ALL parses the whole file)
+
+        Returns:
+            Number of actionmaps parsed by this call
+
+        Raises:
+            ET.ParseError: If an actionmap is not well-formed XML
+        """
+        self.refresh()
+        parsed = 0
+        for position in self.actionmaps_for_mode(mode):
+            if position not in self._parsed:
+                self._parsed[position] = self._parse_actionmap(position)
+                parsed += 1
+        return parsed
+
+    def bindings(self) -> Dict:
+        """
+        Get the bindings parsed so far
+
+        Returns:
+            Bindings dictionary like parse_binding_file, holding every parsed
+            actionmap in document order
+        """
+        bindings = self.parser.empty_bindings()
+        for position in sorted(self._parsed):
+            for binding_type, parsed in self._parsed[position].items():
+                bindings[binding_type].extend(parsed)
+        return bindings
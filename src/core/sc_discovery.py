@@ -0,0 +1,160 @@
+"""
+Star Citizen installation discovery
+Probes candidate install roots concurrently and caches what it finds
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# Default install locations, in priority order
+DEFAULT_SC_ROOTS = [
+    r"C:\Program Files\Roberts Space Industries\StarCitizen",
+    r"D:\Program Files\Roberts Space Industries\StarCitizen",
+    r"E:\Program Files\Roberts Space Industries\StarCitizen",
+]
+
+# Instance folders the game can install, in display order
+KNOWN_INSTANCES = ("LIVE", "PTU", "HOTFIX", "EPTU", "TECH-PREVIEW")
+
+# Location of the mapping files below an instance folder
+MAPPINGS_SUBPATH = Path("USER") / "Client" / "0" / "Controls" / "Mappings"
+
+
+def probe_root(root: str) -> Optional[Dict[str, Path]]:
+    """
+    List the instance folders of one install root in a single scandir pass
+
+    Args:
+        root: Candidate StarCitizen folder
+
+    Returns:
+        Instance name -> folder, or None if the root does not exist
+    """
+    known = {name.upper(): name for name in KNOWN_INSTANCES}
+    instances = {}
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                name = known.get(entry.name.upper())
+                if name and entry.is_dir():
+                    instances[name] = Path(entry.path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError as e:
+        print(f"Could not read {root}: {e}")
+        return None
+    return instances
+
+
+class InstallationDiscovery:
+    """Finds the SC installation and its instances, with cached results"""
+
+    def __init__(self, roots: Optional[Iterable[str]] = None, timeout: float = 2.0):
+        """
+        Initialize the discovery service
+
+        Args:
+            roots: Candidate install folders in priority order (defaults to DEFAULT_SC_ROOTS)
+            timeout: Seconds to wait for slow or offline drives before giving up on them
+        """
+        self._roots = list(roots) if roots is not None else list(DEFAULT_SC_ROOTS)
+        self.timeout = timeout
+        self._installation = None
+        self._instances = None  # instance name -> folder, None until discovered
+        self._bindings_paths = {}  # instance name -> Mappings folder (or None)
+
+    @property
+    def roots(self) -> List[str]:
+        """Candidate install folders, in priority order"""
+        return list(self._roots)
+
+    @roots.setter
+    def roots(self, roots: Iterable[str]):
+        self._roots = list(roots)
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget cached results so the next query probes the disk again"""
+        self._installation = None
+        self._instances = None
+        self._bindings_paths = {}
+
+    def discover(self):
+        """
+        Probe every root concurrently and cache the first one that exists
+
+        Roots that do not answer within the timeout are treated as missing.
+        """
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self._roots)))
+        futures = {executor.submit(probe_root, root): root for root in self._roots}
+        done, not_done = wait(futures, timeout=self.timeout)
+        # Do not block on hung drives; their threads finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in done:
+            results[futures[future]] = future.result()
+        for future in not_done:
+            print(f"Timed out probing {futures[future]}")
+
+        self._installation = None
+        self._instances = {}
+        for root in self._roots:
+            instances = results.get(root)
+            if instances is not None:
+                self._installation = Path(root)
+                self._instances = instances
+                break
+
+    def find_installation(self) -> Optional[Path]:
+        """
+        Get the SC installation folder
+
+        Returns:
+            Path to the installation, or None if not found
+        """
+        if self._instances is None:
+            self.discover()
+        return self._installation
+
+    def instances(self) -> List[str]:
+        """
+        Get the installed instances
+
+        Returns:
+            Instance names in KNOWN_INSTANCES order
+        """
+        if self._instances is None:
+            self.discover()
+        return [name for name in KNOWN_INSTANCES if name in self._instances]
+
+    def bindings_path(self, instance: str) -> Optional[Path]:
+        """
+        Get the Mappings folder of an instance
+
+        Args:
+            instance: The SC instance (LIVE, PTU, ...)
+
+        Returns:
+            Path to the Mappings folder, or None if it does not exist
+        """
+        if instance in self._bindings_paths:
+            return self._bindings_paths[instance]
+
+        if self._instances is None:
+            self.discover()
+
+        instance_path = self._instances.get(instance)
+        if instance_path is None and self._installation is not None:
+            instance_path = self._installation / instance
+
+        bindings_path = None
+        if instance_path is not None:
+            candidate = instance_path / MAPPINGS_SUBPATH
+            if candidate.is_dir():
+                bindings_path = candidate
+
+        self._bindings_paths[instance] = bindings_path
+        return bindings_path
@@ -0,0 +1,198 @@
+"""
+XML parsing backends
+Lets the binding parser use lxml when it is installed and the standard library otherwise
+"""
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class ElementTreeBackend:
+    """Standard library xml.etree.ElementTree"""
+
+    name = 'etree'
+
+    def iterparse(self, file_path: Path, events: Tuple[str, ...] = ('end',)) -> Iterator:
+        """
+        Incrementally parse a file
+
+        Args:
+            file_path: XML file
+            events: Events to report ('start', 'end')
+
+        Yields:
+            (event, element) tuples
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        return ET.iterparse(str(file_path), events=events)
+
+    def parse(self, file_path: Path):
+        """
+        Parse a whole file
+
+        Args:
+            file_path: XML file
+
+        Returns:
+            Root element
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        return ET.parse(file_path).getroot()
+
+    def fromstring(self, data: bytes):
+        """
+        Parse an XML fragment held in memory
+
+        Args:
+            data: Encoded XML with a single root element
+
+        Returns:
+            Root element
+
+        Raises:
+            ET.ParseError: If the data is not well-formed XML
+        """
+        return ET.fromstring(data)
+
+    def actionmaps(self, root) -> List:
+        """Every <actionmap> below the root"""
+        return root.findall('.//actionmap')
+
+    def actions(self, root) -> List:
+        """Every <action> below the root"""
+        return root.findall('.//action')
+
+    def rebinds(self, action) -> List:
+        """Every <rebind> below an <action>"""
+        return action.findall('.//rebind')
+
+
+class LxmlBackend:
+    """lxml.etree, with compiled XPath lookups
+
+    Syntax errors are re-raised as ET.ParseError so callers handle both backends alike.
+    """
+
+    name = 'lxml'
+
+    def __init__(self):
+        self._actionmaps = lxml_etree.XPath('.//actionmap')
+        self._actions = lxml_etree.XPath('.//action')
+        self._rebinds = lxml_etree.XPath('.//rebind')
+
+    def iterparse(self, file_path: Path, events: Tuple[str, ...] = ('end',)) -> Iterator:
+        """
+        Incrementally parse a file
+
+        Args:
+            file_path: XML file
+            events: Events to report ('start', 'end')
+
+        Yields:
+            (event, element) tuples
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        try:
+            yield from lxml_etree.iterparse(str(file_path), events=events,
+                                            remove_comments=True, resolve_entities=False)
+        except lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from e
+
+    def parse(self, file_path: Path):
+        """
+        Parse a whole file
+
+        Args:
+            file_path: XML file
+
+        Returns:
+            Root element
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        parser = lxml_etree.XMLParser(remove_comments=True, resolve_entities=False)
+        try:
+            return lxml_etree.parse(str(file_path), parser).getroot()
+        except lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from e
+
+    def fromstring(self, data: bytes):
+        """
+        Parse an XML fragment held in memory
+
+        Args:
+            data: Encoded XML with a single root element
+
+        Returns:
+            Root element
+
+        Raises:
+            ET.ParseError: If the data is not well-formed XML
+        """
+        parser = lxml_etree.XMLParser(remove_comments=True, resolve_entities=False)
+        try:
+            return lxml_etree.fromstring(data, parser)
+        except lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from e
+
+    def actionmaps(self, root) -> List:
+        """Every <actionmap> below the root"""
+        return self._actionmaps(root)
+
+    def actions(self, root) -> List:
+        """Every <action> below the root"""
+        return self._actions(root)
+
+    def rebinds(self, action) -> List:
+        """Every <rebind> below an <action>"""
+        return self._rebinds(action)
+
+
+_backends = {}
+
+
+def available_backends() -> List[str]:
+    """
+    Get the names of the usable backends
+
+    Returns:
+        'lxml' (if installed) and 'etree'
+    """
+    return (['lxml'] if lxml_etree is not None else []) + ['etree']
+
+
+def get_backend(name: Optional[str] = None):
+    """
+    Get an XML backend
+
+    Args:
+        name: 'lxml', 'etree', or None/'auto' for lxml when installed
+
+    Returns:
+        Shared backend instance
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name in (None, 'auto'):
+        name = available_backends()[0]
+    if name not in ('lxml', 'etree'):
+        raise ValueError(f"Unknown XML backend: {name}")
+    if name not in available_backends():
+        raise ValueError(f"XML backend {name} is not installed")
+
+    if name not in _backends:
+        _backends[name] = LxmlBackend() if name == 'lxml' else ElementTreeBackend()
+    return _backends[name]
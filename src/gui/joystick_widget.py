@@ -6,11 +6,20 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QScrollArea, QFrame, QProgressBar
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
-from typing import Dict, List, Optional
-import pygame
+from typing import Dict, Iterable, List, Optional, Tuple
 from src.models.joystick_models import identify_joystick, JoystickModel
+from src.core.action_categories import ActionMode
+from src.core.binding_index import BindingIndex, Control, binding_control
+from src.core.binding_search import display_name
+from src.core.input_buffer import SAMPLE_AXIS, SAMPLE_BUTTON, InputSample
+from src.core.input_tokenizer import KIND_AXIS, KIND_BUTTON, tokenize_input
+from src.models.binding_models import Binding
+
+
+# SC axis names -> axis index in the joystick visualization
+AXIS_INDICES = {'x': 0, 'y': 1, 'z': 2, 'rotx': 3, 'roty': 4, 'rotz': 5}
 
 
 class JoystickButton(QPushButton):
@@ -20,6 +29,8 @@ class JoystickButton(QPushButton):
         super().__init__(parent)
         self.button_number = button_number
         self.binding_action = None
+        self.conflict_actions = []  # Actions sharing this button in the same mode
+        self.search_match = False  # Bound to an action matching the search box
         self.is_pressed = False
         self.setMinimumSize(100, 80)
         self.setMaximumSize(120, 100)
@@ -35,6 +46,18 @@ class JoystickButton(QPushButton):
         self.binding_action = None
         self.update_display()
 
+    def set_conflict(self, actions: List[str]):
+        """Mark this button as bound to several actions (empty list clears it)"""
+        self.conflict_actions = list(dict.fromkeys(actions))
+        self.setToolTip("Conflict: " + ", ".join(actions) if actions else "")
+        self.update_display()
+
+    def set_search_match(self, matched: bool):
+        """Outline this button as a search result"""
+        if self.search_match != matched:
+            self.search_match = matched
+            self.update_display()
+
     def set_pressed(self, pressed: bool):
         """Set the pressed state of this button"""
         if self.is_pressed != pressed:
@@ -59,6 +82,23 @@ class JoystickButton(QPushButton):
                     font-weight: bold;
                 }
             """)
+        elif self.binding_action and self.conflict_actions:
+            # Bound to several actions in the same mode
+            others = sum(1 for action in self.conflict_actions if action != self.binding_action)
+            text = f"BTN {self.button_number}\n\n{self.binding_action}\n(+{others} conflict)"
+            self.setStyleSheet("""
+                QPushButton {
+                    background-color: #C62828;
+                    color: white;
+                    border: 2px solid #B71C1C;
+                    border-radius: 5px;
+                    padding: 5px;
+                    font-weight: bold;
+                }
+                QPushButton:hover {
+                    background-color: #B71C1C;
+                }
+            """)
         elif self.binding_action:
             # Show button number and binding
             text = f"BTN {self.button_number}\n\n{self.binding_action}"
@@ -91,6 +131,10 @@ class JoystickButton(QPushButton):
                 }
             """)
 
+        if self.search_match and not self.is_pressed:
+            # Later rules win, so this only swaps the border of the state style above
+            self.setStyleSheet(self.styleSheet() + "QPushButton { border: 3px solid #FFEB3B; }")
+
         self.setText(text)
         font = self.font()
         font.setPointSize(8)
@@ -108,13 +152,13 @@ class JoystickVisualization(QWidget):
         self.num_axes = num_axes
         self.button_widgets = {}
         self.axis_widgets = {}
-        self.joystick = None
+        self.held_buttons = set()  # Buttons down as of the last sample (1-based)
+        self.shown_pressed = set()  # Buttons currently drawn as pressed (1-based)
 
         # Identify the joystick model
         self.model = identify_joystick(joystick_name, num_buttons, num_axes)
 
         self.init_ui()
-        self.init_joystick_polling()
 
     def init_ui(self):
         """Initialize the user interface"""
@@ -268,10 +312,54 @@ class JoystickVisualization(QWidget):
             self.axis_widgets[axis_number]['binding'].setText(display_action)
             self.axis_widgets[axis_number]['binding'].setStyleSheet("color: #4CAF50; font-style: italic; font-weight: bold;")
 
+    def clear_button_binding(self, button_number: int):
+        """
+        Clear the binding for a specific button
+
+        Args:
+            button_number: The button number (1-based)
+        """
+        if button_number in self.button_widgets:
+            self.button_widgets[button_number].clear_binding()
+
+    def clear_axis_binding(self, axis_number: int):
+        """
+        Clear the binding for a specific axis
+
+        Args:
+            axis_number: The axis number (0-based)
+        """
+        if axis_number in self.axis_widgets:
+            self.axis_widgets[axis_number]['binding'].setText("")
+
+    def set_button_conflict(self, button_number: int, actions: List[str]):
+        """
+        Highlight a button bound to several actions
+
+        Args:
+            button_number: The button number (1-based)
+            actions: The conflicting action names (empty to clear the highlight)
+        """
+        if button_number in self.button_widgets:
+            self.button_widgets[button_number].set_conflict(actions)
+
+    def set_button_search_match(self, button_number: int, matched: bool):
+        """
+        Outline a button as a search result
+
+        Args:
+            button_number: The button number (1-based)
+            matched: True to outline, False to clear
+        """
+        if button_number in self.button_widgets:
+            self.button_widgets[button_number].set_search_match(matched)
+
     def clear_all_bindings(self):
         """Clear all button and axis bindings"""
         for btn in self.button_widgets.values():
             btn.clear_binding()
+            btn.set_conflict([])
+            btn.set_search_match(False)
         for axis in self.axis_widgets.values():
             axis['binding'].setText("")
 
@@ -285,14 +373,7 @@ class JoystickVisualization(QWidget):
         Returns:
             Formatted action name
         """
-        # Remove common prefixes
-        action = action.replace('v_', '').replace('spaceship_', '')
-
-        # Replace underscores with spaces
-        action = action.replace('_', ' ')
-
-        # Capitalize words
-        action = action.title()
+        action = display_name(action)
 
         # Limit length for display
         if len(action) > 30:
@@ -300,64 +381,40 @@ class JoystickVisualization(QWidget):
 
         return action
 
-    def init_joystick_polling(self):
-        """Initialize joystick polling for real-time button press detection"""
-        try:
-            # Make sure pygame joystick is initialized
-            if not pygame.joystick.get_init():
-                pygame.joystick.init()
-
-            # Get the joystick by ID (don't re-init pygame, just get the joystick)
-            if self.joystick_id < pygame.joystick.get_count():
-                self.joystick = pygame.joystick.Joystick(self.joystick_id)
-                if not self.joystick.get_init():
-                    self.joystick.init()
-
-                print(f"Polling initialized for joystick {self.joystick_id}: {self.joystick.get_name()}")
-
-                # Create timer to poll joystick state (30Hz)
-                self.poll_timer = QTimer(self)
-                self.poll_timer.timeout.connect(self.poll_joystick)
-                self.poll_timer.start(33)  # ~30 FPS
-            else:
-                print(f"Warning: Joystick ID {self.joystick_id} not found (count: {pygame.joystick.get_count()})")
-
-        except Exception as e:
-            print(f"Error initializing joystick polling for ID {self.joystick_id}: {e}")
-
-    def poll_joystick(self):
-        """Poll the joystick and update button and axis states"""
-        if not self.joystick:
-            return
-
-        try:
-            # Process pygame events (required for joystick state updates)
-            pygame.event.pump()
-
-            # Check each button state
-            for button_num in self.button_widgets.keys():
-                # pygame buttons are 0-indexed, our display is 1-indexed
-                pygame_button_index = button_num - 1
-
-                if pygame_button_index < self.joystick.get_numbuttons():
-                    is_pressed = self.joystick.get_button(pygame_button_index)
-                    self.button_widgets[button_num].set_pressed(bool(is_pressed))
-
-            # Check each axis value
-            for axis_index in self.axis_widgets.keys():
-                if axis_index < self.joystick.get_numaxes():
-                    # Get axis value (range: -1.0 to 1.0)
-                    axis_value = self.joystick.get_axis(axis_index)
-
-                    # Update progress bar (convert to -100 to 100)
-                    bar_value = int(axis_value * 100)
-                    self.axis_widgets[axis_index]['bar'].setValue(bar_value)
+    def apply_samples(self, samples: Iterable[InputSample]):
+        """
+        Show one frame's worth of sampled input
 
-                    # Update value label
-                    self.axis_widgets[axis_index]['label'].setText(f"{axis_value:+.2f}")
+        A button pressed and released within the frame is still drawn as
+        pressed for this frame, so short taps stay visible.
 
-        except Exception as e:
-            print(f"Error polling joystick: {e}")
+        Args:
+            samples: This device's InputSample records since the last frame, oldest first
+        """
+        tapped = set()
+        axis_values = {}
+        for sample in samples:
+            if sample.kind == SAMPLE_BUTTON:
+                button_num = sample.index + 1  # pygame buttons are 0-indexed, our display is 1-indexed
+                if sample.value:
+                    self.held_buttons.add(button_num)
+                    tapped.add(button_num)
+                else:
+                    self.held_buttons.discard(button_num)
+            elif sample.kind == SAMPLE_AXIS:
+                axis_values[sample.index] = sample.value
+
+        pressed = self.held_buttons | tapped
+        for button_num in pressed ^ self.shown_pressed:
+            if button_num in self.button_widgets:
+                self.button_widgets[button_num].set_pressed(button_num in pressed)
+        self.shown_pressed = pressed
+
+        for axis_index, axis_value in axis_values.items():
+            if axis_index in self.axis_widgets:
+                # Update progress bar (convert to -100 to 100) and value label
+                self.axis_widgets[axis_index]['bar'].setValue(int(axis_value * 100))
+                self.axis_widgets[axis_index]['label'].setText(f"{axis_value:+.2f}")
 
     def on_button_clicked(self, button_number: int):
         """Handle button click event"""
@@ -373,9 +430,13 @@ class DualJoystickView(QWidget):
         super().__init__(parent)
         self.left_stick = None
         self.right_stick = None
-        self.stick_visualizations = {}  # Map pygame ID to visualization widget
+        self.stick_visualizations = {}  # SDL instance ID -> visualization widget
         self.mapping_swapped = False  # Track if user has swapped the mapping
-        self.sc_to_pygame_map = {}  # Current SC js → pygame ID mapping (for visual widget)
+        self.sc_to_instance_map = {}  # Current SC js → instance ID mapping (for visual widget)
+        self.binding_index = None  # BindingIndex currently displayed
+        self.mode = ActionMode.ALL  # Mode the displayed bindings are filtered to
+        self.conflicts = {}  # (SC js number, control) -> conflicting actions to highlight
+        self.search_matches = set()  # (SC js number, control) of search results to outline
         self.init_ui()
 
     def init_ui(self):
@@ -384,157 +445,343 @@ class DualJoystickView(QWidget):
         self.layout.setSpacing(20)
 
         # Placeholder
-        self.placeholder = QLabel("No joysticks to display.\n\nClick 'Detect Joysticks' to scan for devices.")
+        self.placeholder = None
+        self.show_placeholder("No joysticks to display.\n\nClick 'Detect Joysticks' to scan for devices.")
+
+    def show_placeholder(self, text: str):
+        """
+        Show a message instead of the sticks
+
+        Args:
+            text: Message to show
+        """
+        self.placeholder = QLabel(text)
         self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.placeholder.setStyleSheet("color: #888888; font-size: 14px;")
         self.layout.addWidget(self.placeholder)
 
-    def set_joysticks(self, joysticks: List[Dict]):
+    def add_joystick(self, joy: Dict) -> bool:
         """
-        Set the joysticks to display
+        Add the visualization of one stick
 
         Args:
-            joysticks: List of joystick info dictionaries
-        """
-        # Clear existing layout
-        while self.layout.count():
-            child = self.layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        if not joysticks:
-            self.placeholder = QLabel("No joysticks detected.")
-            self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.layout.addWidget(self.placeholder)
-            return
+            joy: Joystick info dictionary
 
-        # Clear previous mappings
-        self.stick_visualizations = {}
-        self.left_stick = None
-        self.right_stick = None
+        Returns:
+            True if the stick was added, False if it is already shown
+        """
+        # Keyed by SDL instance id: unlike device indices, it does not shift when another stick is unplugged
+        instance_id = joy['instance_id']
+        if instance_id in self.stick_visualizations:
+            return False
+
+        if self.placeholder is not None:
+            self.layout.removeWidget(self.placeholder)
+            self.placeholder.deleteLater()
+            self.placeholder = None
+
+        viz = JoystickVisualization(
+            joystick_name=joy['name'],
+            joystick_id=joy['id'],
+            num_buttons=joy['buttons'],
+            num_axes=joy.get('axes', 0)
+        )
+        self.stick_visualizations[instance_id] = viz
+
+        # Also store reference based on left/right in name (for display order)
+        name_lower = joy['name'].lower()
+        if 'left' in name_lower:
+            self.left_stick = viz
+        elif 'right' in name_lower:
+            self.right_stick = viz
+
+        self.layout.addWidget(viz)
+        return True
+
+    def remove_joystick(self, instance_id: int) -> bool:
+        """
+        Remove the visualization of one stick
 
-        # Create visualization for each joystick
-        for joy in joysticks:
-            viz = JoystickVisualization(
-                joystick_name=joy['name'],
-                joystick_id=joy['id'],
-                num_buttons=joy['buttons'],
-                num_axes=joy.get('axes', 0)
-            )
-
-            # Store by pygame joystick ID
-            self.stick_visualizations[joy['id']] = viz
-
-            # Also store reference based on left/right in name (for display order)
-            name_lower = joy['name'].lower()
-            if 'left' in name_lower:
-                self.left_stick = viz
-            elif 'right' in name_lower:
-                self.right_stick = viz
-
-            self.layout.addWidget(viz)
-
-        print(f"\n=== JOYSTICK DETECTION ===")
-        for joy_id, viz in self.stick_visualizations.items():
-            print(f"Pygame ID {joy_id} = {viz.joystick_name}")
-        print("="*50 + "\n")
+        Args:
+            instance_id: SDL instance id of the stick
+
+        Returns:
+            True if the stick was shown
+        """
+        viz = self.stick_visualizations.pop(instance_id, None)
+        if viz is None:
+            return False
+
+        self.layout.removeWidget(viz)
+        viz.deleteLater()
+        if self.left_stick is viz:
+            self.left_stick = None
+        if self.right_stick is viz:
+            self.right_stick = None
+
+        if not self.stick_visualizations:
+            self.show_placeholder("No joysticks detected.")
+        return True
+
+    def remap_sticks(self) -> List[int]:
+        """
+        Rebuild the SC js mapping after a stick was added or removed
+
+        Only the sticks whose SC js number changed are redrawn.
+
+        Returns:
+            SC js numbers that now point at a different stick (or none)
+        """
+        previous = self.sc_to_instance_map
+        self.sc_to_instance_map = self.build_sc_to_instance_map()
+        changed = sorted(sc_js_number for sc_js_number in previous.keys() | self.sc_to_instance_map.keys()
+                         if previous.get(sc_js_number) != self.sc_to_instance_map.get(sc_js_number))
+
+        if self.binding_index is not None:
+            for sc_js_number in changed:
+                viz = self.stick_visualizations.get(self.sc_to_instance_map.get(sc_js_number))
+                if viz:
+                    viz.clear_all_bindings()
+                    self.draw_stick(sc_js_number)
+        return changed
+
+    def apply_input(self, samples_by_device: Dict[int, List[InputSample]]):
+        """
+        Show one frame's worth of sampled input on every stick
+
+        Sticks without new samples are still updated, so taps shown last frame are released.
+
+        Args:
+            samples_by_device: SDL instance id -> that device's samples since the last frame
+        """
+        for instance_id, viz in self.stick_visualizations.items():
+            viz.apply_samples(samples_by_device.get(instance_id, ()))
 
     def swap_joystick_mapping(self):
         """Toggle the joystick mapping (swap left/right)"""
         self.mapping_swapped = not self.mapping_swapped
         print(f"\n🔄 Joystick mapping {'SWAPPED' if self.mapping_swapped else 'NORMAL'}\n")
 
-    def update_bindings(self, bindings: List[Dict]):
+    def build_sc_to_instance_map(self) -> Dict[int, int]:
         """
-        Update all button bindings from parsed SC bindings
+        Map SC js numbers to the instance IDs of the displayed sticks
 
-        Args:
-            bindings: List of binding dictionaries from binding parser
-        """
-        # Clear all existing bindings first
-        for viz in self.stick_visualizations.values():
-            viz.clear_all_bindings()
+        Instance IDs may not be sequential (e.g., 0, 2 if 1 is blacklisted),
+        and the order is reversed when the user has swapped the mapping.
 
-        print(f"\n=== LOADING {len(bindings)} BINDINGS ===")
-
-        # Build mapping from SC js numbers to available pygame IDs
-        # Pygame IDs may not be sequential (e.g., 0, 2 if 1 is blacklisted)
-        available_pygame_ids = sorted(self.stick_visualizations.keys())
+        Returns:
+            SC js number (1-based) -> instance ID
+        """
+        available_ids = sorted(self.stick_visualizations.keys())
 
-        print(f"Available pygame IDs: {available_pygame_ids}")
+        print(f"Available instance IDs: {available_ids}")
 
         # Apply swap if user has toggled it
-        if self.mapping_swapped and len(available_pygame_ids) >= 2:
-            available_pygame_ids = list(reversed(available_pygame_ids))
+        if self.mapping_swapped and len(available_ids) >= 2:
+            available_ids = list(reversed(available_ids))
             print("🔄 Mapping is SWAPPED")
 
         # Create mapping: SC js1 → first available ID, js2 → second available ID, etc.
-        sc_to_pygame_map = {}
-        for i, pygame_id in enumerate(available_pygame_ids):
+        sc_to_instance_map = {}
+        for i, instance_id in enumerate(available_ids):
             sc_js_number = i + 1  # SC uses 1-based numbering
-            sc_to_pygame_map[sc_js_number] = pygame_id
-            viz_name = self.stick_visualizations[pygame_id].joystick_name
-            print(f"Mapping: SC js{sc_js_number} → Pygame ID {pygame_id} ({viz_name})")
+            sc_to_instance_map[sc_js_number] = instance_id
+            viz_name = self.stick_visualizations[instance_id].joystick_name
+            print(f"Mapping: SC js{sc_js_number} → instance ID {instance_id} ({viz_name})")
+
+        return sc_to_instance_map
+
+    def update_bindings(self, binding_index: BindingIndex, mode: ActionMode = ActionMode.ALL):
+        """
+        Update all button bindings from the binding index
+
+        Args:
+            binding_index: Index of the loaded joystick bindings
+            mode: Only show bindings of this mode
+        """
+        self.binding_index = binding_index
+        self.mode = mode
+
+        # Clear all existing bindings first
+        for viz in self.stick_visualizations.values():
+            viz.clear_all_bindings()
+
+        print(f"\n=== LOADING {binding_index.count_for_mode(mode)} BINDINGS ===")
 
         # Store mapping for visual widget
-        self.sc_to_pygame_map = sc_to_pygame_map
+        self.sc_to_instance_map = self.build_sc_to_instance_map()
 
         print()
 
         # Track bindings per device for summary
         bindings_per_device = {}
 
-        # Apply new bindings
-        for binding in bindings:
-            input_str = binding.get('input', '')
-            action = binding.get('action', '')
+        # Apply new bindings, one lookup per bound control
+        for sc_js_number in binding_index.devices(mode):
+            if self.sc_to_instance_map.get(sc_js_number) not in self.stick_visualizations:
+                print(f"⚠ Warning: SC js{sc_js_number} not mapped (no pygame device available)")
+                continue
+            bindings_per_device[sc_js_number] = self.draw_stick(sc_js_number, highlight=False)
+
+        self.show_conflicts(self.conflicts)
+        self.show_search_matches({located: True for located in self.search_matches})
+
+        # Print summary
+        print(f"\n=== BINDING SUMMARY ===")
+        for sc_js, count in sorted(bindings_per_device.items()):
+            instance_id = self.sc_to_instance_map.get(sc_js)
+            viz = self.stick_visualizations.get(instance_id)
+            viz_name = viz.joystick_name if viz else "Unknown"
+            print(f"  SC js{sc_js} → instance ID {instance_id} ({viz_name}): {count} bindings")
+        print("="*50 + "\n")
+
+    def draw_stick(self, sc_js_number: int, highlight: bool = True) -> int:
+        """
+        Show the bindings of one SC js number on its stick
+
+        Args:
+            sc_js_number: SC js number (1-based)
+            highlight: Also apply the conflict and search highlights of this stick
+
+        Returns:
+            Number of bindings on the stick's controls
+        """
+        instance_id = self.sc_to_instance_map.get(sc_js_number)
+        viz = self.stick_visualizations.get(instance_id)
+        if not viz:
+            return 0
+
+        controls = self.binding_index.controls(sc_js_number, self.mode)
+        for control, on_control in controls.items():
+            if self.show_control(viz, control, on_control):
+                action = on_control[-1].action
+                print(f"  SC js{sc_js_number} {control[0]} {control[1]} → instance ID {instance_id} ({viz.joystick_name[:30]}) = {action[:30]}")
+
+        if highlight:
+            self.show_conflicts({located: actions for located, actions in self.conflicts.items()
+                                 if located[0] == sc_js_number})
+            self.show_search_matches({located: True for located in self.search_matches if located[0] == sc_js_number})
+        return sum(len(on_control) for on_control in controls.values())
+
+    def show_control(self, viz: 'JoystickVisualization', control, bindings: List[Binding]) -> bool:
+        """
+        Display the bindings of one control (the last binding wins)
 
-            # Parse the input string to get device and button/axis
-            parsed = self.parse_input_string(input_str)
-            sc_js_number = parsed.get('sc_js_number')  # SC js number (1-based)
-            button_num = parsed.get('button')
-            axis_name = parsed.get('axis')
+        Args:
+            viz: Visualization of the stick the control is on
+            control: Control key from the binding index, e.g. ('button', 3)
+            bindings: Bindings on that control, possibly empty
 
-            if sc_js_number is None:
+        Returns:
+            True if the control is shown in the grid (buttons and known axes)
+        """
+        kind, key = control
+        if kind == KIND_BUTTON:
+            if bindings:
+                viz.set_button_binding(key, bindings[-1].action)
+            else:
+                viz.clear_button_binding(key)
+            return True
+
+        axis_index = AXIS_INDICES.get(key) if kind == KIND_AXIS else None
+        if axis_index is None:
+            return False
+        if bindings:
+            viz.set_axis_binding(axis_index, bindings[-1].action)
+        else:
+            viz.clear_axis_binding(axis_index)
+        return True
+
+    def set_conflicts(self, conflicts: Dict):
+        """
+        Replace the highlighted conflicts, restyling only the buttons that change
+
+        Args:
+            conflicts: (SC js number, control) -> conflicting actions, from conflict_controls
+        """
+        previous = self.conflicts
+        self.conflicts = conflicts
+        cleared = {located: [] for located in previous if located not in conflicts}
+        self.show_conflicts({**cleared, **conflicts})
+
+    def show_conflicts(self, conflicts: Dict):
+        """
+        Apply conflict highlights to the grid buttons
+
+        Args:
+            conflicts: (SC js number, control) -> conflicting actions (empty list clears)
+        """
+        for (sc_js_number, (kind, key)), actions in conflicts.items():
+            if kind != KIND_BUTTON:
                 continue
+            viz = self.stick_visualizations.get(self.sc_to_instance_map.get(sc_js_number))
+            if viz:
+                viz.set_button_conflict(key, actions)
+
+    def set_search_matches(self, matches: set):
+        """
+        Replace the outlined search results, restyling only the buttons that change
 
-            # Map SC js number to pygame ID using our mapping
-            pygame_id = sc_to_pygame_map.get(sc_js_number)
+        Args:
+            matches: (SC js number, control) pairs of the matching bindings
+        """
+        previous = self.search_matches
+        self.search_matches = matches
+        self.show_search_matches({located: False for located in previous - matches})
+        self.show_search_matches({located: True for located in matches - previous})
 
-            # Get the visualization for this pygame ID
-            viz = self.stick_visualizations.get(pygame_id)
-            if not viz:
-                print(f"⚠ Warning: SC js{sc_js_number} not mapped (no pygame device available)")
+    def show_search_matches(self, matches: Dict):
+        """
+        Apply search outlines to the grid buttons
+
+        Args:
+            matches: (SC js number, control) -> True to outline, False to clear
+        """
+        for (sc_js_number, (kind, key)), matched in matches.items():
+            if kind != KIND_BUTTON:
                 continue
+            viz = self.stick_visualizations.get(self.sc_to_instance_map.get(sc_js_number))
+            if viz:
+                viz.set_button_search_match(key, matched)
 
-            # Track this binding
-            if sc_js_number not in bindings_per_device:
-                bindings_per_device[sc_js_number] = 0
-            bindings_per_device[sc_js_number] += 1
+    def refresh_controls(self, bindings: List[Binding]):
+        """
+        Redraw only the controls the given bindings sit on
 
-            # Handle button bindings
-            if button_num is not None:
-                viz.set_button_binding(button_num, action)
-                print(f"  SC js{sc_js_number} button{button_num} → Pygame ID {pygame_id} ({viz.joystick_name[:30]}) = {action[:30]}")
+        Call after the binding index was updated incrementally.
 
-            # Handle axis bindings
-            elif axis_name is not None:
-                # Map axis names to indices
-                axis_map = {'x': 0, 'y': 1, 'z': 2, 'rotx': 3, 'roty': 4, 'rotz': 5}
-                axis_index = axis_map.get(axis_name)
+        Args:
+            bindings: Bindings that were added, removed or changed
+        """
+        if self.binding_index is None:
+            return
 
-                if axis_index is not None:
-                    viz.set_axis_binding(axis_index, action)
-                    print(f"  SC js{sc_js_number} {axis_name} → Pygame ID {pygame_id} ({viz.joystick_name[:30]}) = {action[:30]}")
+        touched = {binding_control(binding) for binding in bindings}
+        touched.discard(None)
 
-        # Print summary
-        print(f"\n=== BINDING SUMMARY ===")
-        for sc_js, count in sorted(bindings_per_device.items()):
-            pygame_id = sc_js - 1
-            viz = self.stick_visualizations.get(pygame_id)
-            viz_name = viz.joystick_name if viz else "Unknown"
-            print(f"  SC js{sc_js} → Pygame ID {pygame_id} ({viz_name}): {count} bindings")
-        print("="*50 + "\n")
+        for sc_js_number, control in touched:
+            viz = self.stick_visualizations.get(self.sc_to_instance_map.get(sc_js_number))
+            if viz:
+                self.show_control(viz, control, self.binding_index.bindings_on(sc_js_number, control, self.mode))
+
+        print(f"Refreshed {len(touched)} control(s) for {len(bindings)} changed binding(s)")
+
+    def set_mode(self, mode: ActionMode, changed: List[Tuple[int, Control]]):
+        """
+        Switch the shown mode, redrawing only the controls that differ
+
+        Args:
+            mode: ActionMode to show
+            changed: (SC js number, control) pairs from BindingIndex.changed_controls
+        """
+        self.mode = mode
+        if self.binding_index is None:
+            return
+
+        for sc_js_number, control in changed:
+            viz = self.stick_visualizations.get(self.sc_to_instance_map.get(sc_js_number))
+            if viz:
+                self.show_control(viz, control, self.binding_index.bindings_on(sc_js_number, control, mode))
 
     def parse_input_string(self, input_str: str) -> Dict:
         """
@@ -546,46 +793,9 @@ class DualJoystickView(QWidget):
         Returns:
             Dictionary with sc_js_number (1-based), button, and/or axis info
         """
-        result = {'sc_js_number': None, 'button': None, 'axis': None}
-
-        if not input_str:
-            return result
-
-        input_lower = input_str.lower()
-
-        # Extract device number (js1, js2, etc.)
-        if 'js' in input_lower:
-            try:
-                device_start = input_lower.find('js') + 2
-                device_end = device_start
-                while device_end < len(input_lower) and input_lower[device_end].isdigit():
-                    device_end += 1
-                # Keep SC's 1-based numbering (js1 = 1, js2 = 2)
-                result['sc_js_number'] = int(input_lower[device_start:device_end])
-            except (ValueError, IndexError):
-                pass
-
-        # Extract button number
-        if 'button' in input_lower:
-            try:
-                button_start = input_lower.find('button') + 6
-                button_num = ''
-                for char in input_lower[button_start:]:
-                    if char.isdigit():
-                        button_num += char
-                    else:
-                        break
-                if button_num:
-                    result['button'] = int(button_num)
-            except ValueError:
-                pass
-
-        # Extract axis name (e.g., js1_x, js1_y, js1_rotx)
-        # Common axis names in SC: x, y, z, rotx, roty, rotz
-        axis_names = ['rotx', 'roty', 'rotz', 'x', 'y', 'z']  # Check longer names first
-        for axis in axis_names:
-            if f'_{axis}' in input_lower or input_lower.endswith(axis):
-                result['axis'] = axis
-                break
-
-        return result
+        token = tokenize_input(input_str)
+        return {
+            'sc_js_number': token.device_index if token.is_joystick else None,
+            'button': token.index if token.kind == KIND_BUTTON else None,
+            'axis': token.axis,
+        }
@@ -3,28 +3,93 @@ Main application window for StarSticks
 """
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QComboBox, QTextEdit, QGroupBox, QTabWidget
+    QLabel, QPushButton, QComboBox, QTextEdit, QGroupBox, QTabWidget, QLineEdit
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QObject, pyqtSignal
+from xml.etree.ElementTree import ParseError
+import sqlite3
+import time
+from pathlib import Path
 from src.core.joystick_detector import JoystickDetector
+from src.core.device_registry import DEVICE_ADDED
+from src.core.input_sampler import InputSampler
 from src.core.binding_parser import BindingParser
+from src.core.binding_history import BindingHistory
+from src.core.default_profile import DefaultProfile
+from src.core.binding_watcher import BindingWatcher
+from src.core.binding_diff import diff_bindings
+from src.core.binding_conflicts import ConflictIndex, conflict_controls
+from src.core.binding_index import BindingIndex, binding_control
+from src.core.binding_search import BindingSearchIndex
+from src.core.sc_discovery import KNOWN_INSTANCES
 from src.gui.joystick_widget import DualJoystickView
 from src.gui.visual_joystick_widget import DualVisualJoystickView
+from src.gui.profile_diff_widget import ProfileDiffView
+from src.gui.poll_coordinator import PollCoordinator
 from src.core.action_categories import ActionMode, get_mode_icon
 
 
+class BindingReloadSignals(QObject):
+    """Carries reloaded binding files from the watcher thread to the GUI thread"""
+    file_reloaded = pyqtSignal(str, object)  # file path, parsed bindings (None if deleted)
+
+
+class DeviceSignals(QObject):
+    """Carries device registry changes from the input sampler thread to the GUI thread"""
+    device_changed = pyqtSignal(str, object)  # DEVICE_ADDED or DEVICE_REMOVED, device info
+
+
 class MainWindow(QMainWindow):
     """Main application window"""
 
     def __init__(self):
         super().__init__()
         self.joystick_detector = JoystickDetector()
-        self.binding_parser = BindingParser()
+        self.binding_parser = BindingParser(history=self.open_binding_history())
+        # The views only show joysticks, so keyboard and mouse rebinds are never built
+        self.binding_parser.devices = {'js'}
+        # Layer rebinds over the game defaults when the user has provided defaultProfile.xml
+        self.binding_parser.default_profile = DefaultProfile(cache=self.binding_parser.cache)
         self.detected_joysticks = []  # Store detected joysticks
         self.current_bindings = []  # Store current bindings for filtering
+        self.binding_index = BindingIndex()  # Lookup structure over current_bindings
+        self.search_index = BindingSearchIndex()  # Trigram search over current_bindings
+        self.search_results = []  # Bindings matching the search box
+        self.conflict_index = ConflictIndex()  # Conflict groups over current_bindings
+        self.conflicts = []  # conflict_index.conflicts() result
         self.current_mode = ActionMode.ALL  # Current filter mode
+        self.mode_switch_ms = None  # Latency of the last mode change
+        self.binding_watcher = None  # Watches the loaded Mappings directory for hot reload
+        self.reload_signals = BindingReloadSignals()
+        self.reload_signals.file_reloaded.connect(self.on_binding_file_reloaded)
+        # Connected and unplugged sticks update the views one stick at a time; hotplug
+        # events are applied on the sampler thread, so they reach the views through a signal
+        self.device_signals = DeviceSignals()
+        self.device_signals.device_changed.connect(self.on_device_changed)
+        self.joystick_detector.registry.add_listener(self.device_signals.device_changed.emit)
         self.init_ui()
 
+        # Sample joystick input and apply SDL hotplug events (JOYDEVICEADDED/JOYDEVICEREMOVED)
+        # on a background thread; one shared timer drains the samples for every view
+        self.input_sampler = InputSampler(self.joystick_detector.registry)
+        self.input_sampler.start()
+        self.poll_coordinator = PollCoordinator(self.input_sampler, parent=self)
+        self.poll_coordinator.subscribe(self.viz_widget.apply_input, name="button grid", every_tick=True)
+        self.poll_coordinator.start()
+
+    def open_binding_history(self):
+        """
+        Open the local binding history database
+
+        Returns:
+            BindingHistory, or None if it cannot be opened (history is optional)
+        """
+        try:
+            return BindingHistory()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Binding history disabled: {e}")
+            return None
+
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle("StarSticks - Star Citizen Joystick Binding Visualizer")
@@ -171,6 +236,23 @@ class MainWindow(QMainWindow):
         self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
         control_layout.addWidget(self.mode_combo)
 
+        # Search
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("🔍 Search actions or inputs...")
+        self.search_box.setMinimumWidth(220)
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setStyleSheet("""
+            QLineEdit {
+                background-color: #2d2d2d;
+                color: white;
+                border: 1px solid #3d3d3d;
+                padding: 5px;
+                border-radius: 3px;
+            }
+        """)
+        self.search_box.textChanged.connect(self.on_search_changed)
+        control_layout.addWidget(self.search_box)
+
         # Separator
         separator2 = QLabel("|")
         separator2.setStyleSheet("color: #555555; font-size: 20px;")
@@ -222,6 +304,10 @@ class MainWindow(QMainWindow):
         self.viz_widget = DualJoystickView()
         self.tabs.addTab(self.viz_widget, "🔲 Button Grid")
 
+        # Tab 3: Profile comparison
+        self.diff_widget = ProfileDiffView(self.binding_parser)
+        self.tabs.addTab(self.diff_widget, "🔀 Compare Profiles")
+
         main_layout.addWidget(self.tabs)
 
         # Status Bar
@@ -235,7 +321,8 @@ class MainWindow(QMainWindow):
         """Scan for installed Star Citizen instances and populate dropdown"""
         self.statusBar().showMessage("Scanning for Star Citizen installations...")
 
-        # Get list of installed instances
+        # Re-probe the disk rather than trusting the cached discovery
+        self.binding_parser.discovery.invalidate()
         installed_instances = self.binding_parser.detect_installed_instances()
 
         # Clear and repopulate combo box
@@ -246,67 +333,329 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage(f"Found {len(installed_instances)} SC instance(s): {', '.join(installed_instances)}")
         else:
             # No instances found, add default options
-            self.instance_combo.addItems(["LIVE", "PTU", "HOTFIX"])
+            self.instance_combo.addItems(list(KNOWN_INSTANCES))
             self.statusBar().showMessage("No Star Citizen installation found. Please check your installation path.")
 
     def detect_joysticks(self):
-        """Detect connected joysticks and display them"""
+        """Rescan connected joysticks; new and vanished sticks reach the views through on_device_changed"""
         self.statusBar().showMessage("Detecting joysticks...")
         joysticks = self.joystick_detector.detect()
-
-        # Store detected joysticks
-        self.detected_joysticks = joysticks
+        self.show_joystick_status()
 
         if joysticks:
-            # Update status label
-            joy_names = [f"{joy['name']} (ID {joy['id']})" for joy in joysticks]
-            self.joystick_status.setText(" | ".join(joy_names))
-            self.joystick_status.setStyleSheet("color: #4CAF50;")
-
             self.statusBar().showMessage(f"Detected {len(joysticks)} joystick(s)")
+        else:
+            self.statusBar().showMessage("No joysticks detected")
 
-            # Update visualizations
-            self.viz_widget.set_joysticks(joysticks)
-            self.visual_widget.set_joysticks(joysticks)
+    def show_joystick_status(self):
+        """Show the connected joysticks in the status label"""
+        if self.detected_joysticks:
+            joy_names = [f"{joy['name']} (ID {joy['id']})" for joy in self.detected_joysticks]
+            self.joystick_status.setText(" | ".join(joy_names))
+            self.joystick_status.setStyleSheet("color: #4CAF50;")
         else:
             self.joystick_status.setText("Not detected")
             self.joystick_status.setStyleSheet("color: #FF5555;")
-            self.statusBar().showMessage("No joysticks detected")
 
-            # Clear visualizations
-            self.viz_widget.set_joysticks([])
-            self.visual_widget.set_joysticks([])
+    def on_device_changed(self, event: str, device: dict):
+        """
+        Add or remove one stick's views after a hotplug or a rescan
+
+        The other sticks' views are only redrawn if their SC js number changed.
+
+        Args:
+            event: DEVICE_ADDED or DEVICE_REMOVED
+            device: Joystick info dictionary from the device registry
+        """
+        if self.joystick_detector.is_blacklisted(device['name']):
+            return
+
+        instance_id = device['instance_id']
+        if event == DEVICE_ADDED:
+            self.detected_joysticks.append(device)
+            self.viz_widget.add_joystick(device)
+            sides = [self.visual_widget.add_joystick(device)]
+            message = f"Joystick connected: {device['name']}"
+        else:
+            self.detected_joysticks = [joy for joy in self.detected_joysticks if joy['instance_id'] != instance_id]
+            self.viz_widget.remove_joystick(instance_id)
+            sides = [self.visual_widget.remove_joystick(instance_id)]
+            message = f"Joystick disconnected: {device['name']}"
+
+        changed = self.viz_widget.remap_sticks()
+        self.visual_widget.remap_sticks(changed, sides, self.viz_widget.sc_to_instance_map)
+
+        # The diagram has not shown the loaded bindings yet if no stick was connected before
+        if self.current_bindings and not self.views_show_index(self.current_mode):
+            self.apply_mode_filter()
+
+        self.show_joystick_status()
+        self.statusBar().showMessage(message)
 
     def load_bindings(self):
         """Load Star Citizen bindings from the selected instance"""
         instance = self.instance_combo.currentText()
         self.statusBar().showMessage(f"Loading bindings from {instance}...")
 
-        bindings = self.binding_parser.load_bindings(instance)
+        # Outside "All", only the actionmaps of the current mode are parsed up front
+        bindings = self.binding_parser.load_bindings(instance, mode=self.current_mode)
 
         if bindings:
+            self.start_binding_watcher()
             joystick_bindings = bindings.get('joystick_bindings', [])
             num_bindings = len(joystick_bindings)
 
             if num_bindings > 0:
-                # Store bindings for filtering
+                # Store bindings for filtering and index them once
                 self.current_bindings = joystick_bindings
+                self.binding_index = BindingIndex(joystick_bindings)
+                self.search_index = BindingSearchIndex(joystick_bindings)
+                self.conflict_index = ConflictIndex(joystick_bindings)
+                self.update_conflicts()
+                self.run_search()
 
                 # Apply current mode filter
                 self.apply_mode_filter()
 
-                self.statusBar().showMessage(f"Loaded {num_bindings} joystick binding(s) from {instance}")
+                num_files = len(self.binding_parser.file_bindings)
+                parse_ms = sum(self.binding_parser.file_timings.values()) * 1000
+                cache_stats = self.binding_parser.cache.get_stats()
+                self.statusBar().showMessage(
+                    f"Loaded {num_bindings} joystick binding(s) from {num_files} file(s) "
+                    f"in {instance} ({parse_ms:.0f} ms, cache {cache_stats['hits']} hit / "
+                    f"{cache_stats['misses']} miss, {len(self.conflicts)} conflict(s))"
+                )
             else:
                 self.current_bindings = []
+                self.binding_index = BindingIndex()
+                self.search_index = BindingSearchIndex()
+                self.conflict_index = ConflictIndex()
+                self.conflicts = []
                 self.statusBar().showMessage(f"No joystick bindings found in {instance} profile")
         else:
+            # Nothing was loaded, so there is no directory to watch
+            self.stop_binding_watcher()
             self.current_bindings = []
+            self.binding_index = BindingIndex()
+            self.search_index = BindingSearchIndex()
+            self.conflict_index = ConflictIndex()
+            self.conflicts = []
             self.statusBar().showMessage(f"No binding files found for {instance}")
 
+    def start_binding_watcher(self):
+        """Watch the loaded Mappings directory so in-game changes show up automatically"""
+        self.stop_binding_watcher()
+
+        bindings_path = self.binding_parser.bindings_path
+        if not bindings_path:
+            return
+
+        self.binding_watcher = BindingWatcher(bindings_path, self.reload_binding_file)
+        self.binding_watcher.start()
+
+    def stop_binding_watcher(self):
+        """Stop watching the Mappings directory"""
+        if self.binding_watcher:
+            self.binding_watcher.stop()
+            self.binding_watcher = None
+
+    def reload_binding_file(self, file_path: Path) -> bool:
+        """
+        Re-parse one changed binding file (runs on the watcher thread)
+
+        Args:
+            file_path: The binding file that changed
+
+        Returns:
+            False if the file is not readable yet and should be retried
+        """
+        if not file_path.exists():
+            self.reload_signals.file_reloaded.emit(str(file_path), None)
+            return True
+
+        try:
+            file_bindings = self.binding_parser.read_binding_file(file_path)
+        except (ParseError, OSError):
+            return False
+
+        self.reload_signals.file_reloaded.emit(str(file_path), file_bindings)
+        return True
+
+    def on_binding_file_reloaded(self, file_path: str, file_bindings):
+        """Merge a reloaded binding file and push only the changed bindings to the views"""
+        # A reload queued by the watcher of a previous load belongs to another instance
+        if Path(file_path).parent != self.binding_parser.bindings_path:
+            return
+
+        file_name = Path(file_path).name
+        old_bindings = self.current_bindings
+        merged = self.binding_parser.update_file_bindings(file_name, file_bindings)
+        changes = self.update_current_bindings(merged)
+        if not any(changes.values()):
+            return
+
+        if not old_bindings or not self.viz_widget.sc_to_instance_map:
+            # Nothing displayed yet, so there is nothing to patch
+            self.apply_mode_filter()
+        else:
+            touched = changes['added'] + changes['removed'] + changes['changed']
+            conflicts = conflict_controls(self.conflicts, self.current_mode)
+            matches = self.search_match_controls()
+            self.viz_widget.refresh_controls(touched)
+            self.viz_widget.set_conflicts(conflicts)
+            self.viz_widget.set_search_matches(matches)
+            self.visual_widget.refresh_controls(touched, self.viz_widget.sc_to_instance_map, conflicts, matches)
+
+        self.statusBar().showMessage(
+            f"Reloaded {file_name}: +{len(changes['added'])} / -{len(changes['removed'])} / "
+            f"~{len(changes['changed'])} binding(s), {len(self.conflicts)} conflict(s)"
+        )
+
+    def update_current_bindings(self, merged) -> dict:
+        """
+        Swap in a new merged result, updating the index and conflicts incrementally
+
+        Args:
+            merged: Merged bindings dictionary from the parser
+
+        Returns:
+            diff_bindings result between the old and new joystick bindings
+        """
+        old_bindings = self.current_bindings
+        self.current_bindings = merged.get('joystick_bindings', [])
+
+        changes = diff_bindings(old_bindings, self.current_bindings)
+        if any(changes.values()):
+            # A changed binding (e.g. new multiTap) replaces its old version in the index
+            self.binding_index.update(
+                added=changes['added'] + changes['changed'],
+                removed=changes['removed'],
+            )
+            self.search_index.update(
+                added=changes['added'] + changes['changed'],
+                removed=changes['removed'],
+            )
+            self.conflict_index.update(
+                added=changes['added'] + changes['changed'],
+                removed=changes['removed'],
+            )
+            self.update_conflicts()
+            self.run_search()
+        return changes
+
+    def update_conflicts(self):
+        """Collect the conflicts from the conflict index"""
+        start = time.perf_counter()
+        self.conflicts = self.conflict_index.conflicts()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Found {len(self.conflicts)} binding conflict(s) in {elapsed_ms:.1f} ms")
+
+    def on_search_changed(self, text: str):
+        """Search as the user types and highlight the matching buttons"""
+        elapsed_ms = self.run_search()
+        self.show_search_matches()
+        if text.strip():
+            self.statusBar().showMessage(
+                f"{len(self.search_results)} binding(s) match \"{text.strip()}\" ({elapsed_ms:.2f} ms)"
+            )
+        else:
+            self.show_mode_status()
+
+    def run_search(self) -> float:
+        """
+        Re-run the search box query against the search index
+
+        Returns:
+            Query time in milliseconds
+        """
+        start = time.perf_counter()
+        query = self.search_box.text()
+        self.search_results = self.search_index.search(query) if query.strip() else []
+        return (time.perf_counter() - start) * 1000
+
+    def search_match_controls(self) -> set:
+        """Get the (SC js number, control) pairs of the search results that belong to the current mode"""
+        matches = set()
+        for binding in self.search_results:
+            if self.current_mode != ActionMode.ALL and self.binding_index.mode_of(binding) != self.current_mode:
+                continue
+            located = binding_control(binding)
+            if located:
+                matches.add(located)
+        return matches
+
+    def show_search_matches(self):
+        """Highlight the buttons of the search results that belong to the current mode"""
+        matches = self.search_match_controls()
+        self.viz_widget.set_search_matches(matches)
+        self.visual_widget.set_search_matches(matches)
+
+    def print_input_stats(self):
+        """Print what live joystick input cost per tick and per view"""
+        stats = self.poll_coordinator.get_stats()
+        sampler_stats = self.input_sampler.get_stats()
+        print("\n=== INPUT POLLING ===")
+        print(f"Sampler: {sampler_stats['samples']} samples at {sampler_stats['rate_hz']} Hz, "
+              f"{sampler_stats['overruns']} overrun(s), {sampler_stats['dropped']} dropped, "
+              f"load {sampler_stats['load'] * 100:.1f}%")
+        print(f"Ticks: {stats['ticks']}, mean {stats['mean_tick_ms']:.3f} ms, max {stats['max_tick_ms']:.3f} ms, "
+              f"{stats['samples']} sample(s) dispatched")
+        for name, subscriber in stats['subscribers'].items():
+            print(f"  {name}: {subscriber['calls']} call(s), mean {subscriber['mean_ms']:.3f} ms, "
+                  f"max {subscriber['max_ms']:.3f} ms")
+        print("="*50 + "\n")
+
+    def closeEvent(self, event):
+        """Stop background work before the window closes"""
+        self.stop_binding_watcher()
+        self.poll_coordinator.stop()
+        self.input_sampler.stop()
+        self.print_input_stats()
+        super().closeEvent(event)
+
     def on_mode_changed(self, index):
         """Handle mode selection change"""
+        start = time.perf_counter()
+        previous_mode = self.current_mode
         self.current_mode = self.mode_combo.itemData(index)
-        self.apply_mode_filter()
+
+        loaded = False
+        if self.binding_parser.lazy_profiles:
+            # Parse only the actionmaps the new mode still needs
+            changes = self.update_current_bindings(self.binding_parser.load_mode(self.current_mode))
+            loaded = any(changes.values())
+
+        if loaded or not self.views_show_index(previous_mode):
+            self.apply_mode_filter()
+        else:
+            # Both modes are already bucketed in the index, so only the differing controls are redrawn
+            conflicts = conflict_controls(self.conflicts, self.current_mode)
+            matches = self.search_match_controls()
+            changed = self.binding_index.changed_controls(previous_mode, self.current_mode)
+            self.viz_widget.set_conflicts(conflicts)
+            self.viz_widget.set_search_matches(matches)
+            self.viz_widget.set_mode(self.current_mode, changed)
+            # The diagram takes the mode, conflicts and search results in one repaint
+            self.visual_widget.set_view_state(self.current_mode, changed, conflicts, matches)
+
+        self.mode_switch_ms = (time.perf_counter() - start) * 1000
+        print(f"Switched to {self.current_mode.value} in {self.mode_switch_ms:.1f} ms")
+        self.show_mode_status()
+
+    def views_show_index(self, mode: ActionMode) -> bool:
+        """
+        Check whether both views currently display the binding index in a mode
+
+        Args:
+            mode: ActionMode the views are expected to show
+
+        Returns:
+            True if a mode switch can be applied as a diff
+        """
+        return (bool(self.current_bindings)
+                and self.viz_widget.binding_index is self.binding_index and self.viz_widget.mode == mode
+                and self.visual_widget.binding_index is self.binding_index and self.visual_widget.mode == mode
+                and self.visual_widget.sc_to_instance_map == self.viz_widget.sc_to_instance_map)
 
     def swap_joysticks(self):
         """Swap the left and right joystick mapping"""
@@ -342,31 +691,38 @@ class MainWindow(QMainWindow):
 
     def apply_mode_filter(self):
         """Filter and display bindings based on selected mode"""
-        from src.core.action_categories import categorize_action
-
         if not self.current_bindings:
             return
 
-        # Filter bindings by mode
-        if self.current_mode == ActionMode.ALL:
-            filtered_bindings = self.current_bindings
-        else:
-            filtered_bindings = [
-                binding for binding in self.current_bindings
-                if categorize_action(binding.get('action', '')) == self.current_mode
-            ]
+        conflicts = conflict_controls(self.conflicts, self.current_mode)
+        matches = self.search_match_controls()
 
         # Update button grid visualization
-        self.viz_widget.update_bindings(filtered_bindings)
+        self.viz_widget.set_conflicts(conflicts)
+        self.viz_widget.set_search_matches(matches)
+        self.viz_widget.update_bindings(self.binding_index, self.current_mode)
+
+        # Update visual diagram with the same bindings and mapping, repainting it once
+        if hasattr(self.viz_widget, 'sc_to_instance_map') and self.viz_widget.sc_to_instance_map:
+            self.visual_widget.update_bindings(
+                self.binding_index, self.viz_widget.sc_to_instance_map, self.current_mode, conflicts, matches
+            )
+        else:
+            self.visual_widget.set_view_state(conflicts=conflicts, matches=matches)
 
-        # Update visual diagram with the same bindings and mapping
-        if hasattr(self.viz_widget, 'sc_to_pygame_map') and self.viz_widget.sc_to_pygame_map:
-            self.visual_widget.update_bindings(filtered_bindings, self.viz_widget.sc_to_pygame_map)
+        self.show_mode_status()
+
+    def show_mode_status(self):
+        """Show the binding count of the current mode and the last mode-switch latency"""
+        if not self.current_bindings:
+            return
 
-        # Update status bar
-        total = len(self.current_bindings)
-        shown = len(filtered_bindings)
+        total = len(self.binding_index)
+        shown = self.binding_index.count_for_mode(self.current_mode)
+        latency = f" (switched in {self.mode_switch_ms:.1f} ms)" if self.mode_switch_ms is not None else ""
         if self.current_mode == ActionMode.ALL:
-            self.statusBar().showMessage(f"Showing all {total} binding(s)")
+            self.statusBar().showMessage(f"Showing all {total} binding(s){latency}")
         else:
-            self.statusBar().showMessage(f"Showing {shown} of {total} binding(s) for {self.current_mode.value}")
+            self.statusBar().showMessage(
+                f"Showing {shown} of {total} binding(s) for {self.current_mode.value}{latency}"
+            )
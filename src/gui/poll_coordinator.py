@@ -0,0 +1,167 @@
+"""
+Joystick poll coordinator
+One GUI timer that collects joystick input once per tick and hands every subscriber its devices' updates
+"""
+from PyQt6.QtCore import QObject, QTimer
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from src.core.input_buffer import InputSample
+from src.core.input_sampler import InputSampler
+
+
+# Called with SDL instance id -> samples since the last tick, for the devices it subscribed to
+InputSubscriber = Callable[[Dict[int, List[InputSample]]], None]
+
+DEFAULT_TICK_MS = 16  # ~60 FPS
+
+
+class Subscription:
+    """A subscriber and what it has cost so far"""
+
+    __slots__ = ('callback', 'name', 'devices', 'every_tick', 'calls', 'seconds', 'max_seconds')
+
+    def __init__(self, callback: InputSubscriber, name: str, devices: Optional[set], every_tick: bool):
+        self.callback = callback
+        self.name = name
+        self.devices = devices  # SDL instance ids, or None for every device
+        self.every_tick = every_tick
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+
+class PollCoordinator(QObject):
+    """
+    Shared poll loop for every view that shows live joystick input
+
+    Each tick collects input once for all devices: the sampler's ring is
+    drained (and, when its thread is not running, one sample is taken on
+    the GUI thread first). The samples are grouped per device and
+    dispatched to the subscribers, so views never pump SDL themselves and
+    cannot take each other's events. Pumping SDL and applying hotplug
+    events are left to the sampling thread, the only one SDL allows them on.
+    """
+
+    def __init__(self, sampler: InputSampler, tick_ms: int = DEFAULT_TICK_MS, parent=None):
+        """
+        Set up the coordinator (call start() to begin ticking)
+
+        Args:
+            sampler: Sampler whose ring buffer is drained
+            tick_ms: Timer interval in milliseconds
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.sampler = sampler
+        self.subscriptions = []
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(tick_ms)
+        self.timer.timeout.connect(self.tick)
+
+        # Statistics
+        self.ticks = 0
+        self.tick_seconds = 0.0
+        self.max_tick_seconds = 0.0
+        self.last_tick_seconds = 0.0
+        self.samples_dispatched = 0
+
+    def start(self):
+        """Start ticking"""
+        self.timer.start()
+
+    def stop(self):
+        """Stop ticking"""
+        self.timer.stop()
+
+    def subscribe(self, callback: InputSubscriber, name: Optional[str] = None,
+                  devices: Optional[Iterable[int]] = None, every_tick: bool = False) -> Subscription:
+        """
+        Receive live input
+
+        Args:
+            callback: Called with SDL instance id -> samples since the last tick
+            name: Label for the statistics (the callback's name by default)
+            devices: SDL instance ids to receive (every device for None)
+            every_tick: Also call on ticks without new samples, e.g. to release taps drawn last frame
+
+        Returns:
+            Subscription to pass to unsubscribe()
+        """
+        subscription = Subscription(callback, name or getattr(callback, '__qualname__', repr(callback)),
+                                    set(devices) if devices is not None else None, every_tick)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Stop receiving input
+
+        Args:
+            subscription: Result of subscribe()
+        """
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def tick(self):
+        """Collect input once and dispatch it to every subscriber"""
+        start = time.perf_counter()
+        self.ticks += 1
+
+        # Without the sampling thread, read the devices once here; SDL is not pumped off the
+        # sampling thread, so this shows the state SDL last saw
+        if not self.sampler.running:
+            self.sampler.sample(start)
+
+        samples_by_device = {}
+        for sample in self.sampler.buffer.drain():
+            samples_by_device.setdefault(sample.device, []).append(sample)
+            self.samples_dispatched += 1
+
+        for subscription in list(self.subscriptions):
+            if subscription.devices is None:
+                updates = samples_by_device
+            else:
+                updates = {device: samples for device, samples in samples_by_device.items()
+                           if device in subscription.devices}
+            if not updates and not subscription.every_tick:
+                continue
+
+            dispatch_start = time.perf_counter()
+            try:
+                subscription.callback(updates)
+            except Exception as e:
+                print(f"Error in input subscriber {subscription.name}: {e}")
+            elapsed = time.perf_counter() - dispatch_start
+            subscription.calls += 1
+            subscription.seconds += elapsed
+            subscription.max_seconds = max(subscription.max_seconds, elapsed)
+
+        self.last_tick_seconds = time.perf_counter() - start
+        self.tick_seconds += self.last_tick_seconds
+        self.max_tick_seconds = max(self.max_tick_seconds, self.last_tick_seconds)
+
+    def get_stats(self) -> Dict:
+        """
+        Get tick and dispatch statistics
+
+        Returns:
+            Dictionary with tick count, mean/max/last tick duration (ms),
+            samples dispatched, and per-subscriber calls and mean/max
+            dispatch cost (ms)
+        """
+        return {
+            'ticks': self.ticks,
+            'mean_tick_ms': self.tick_seconds / self.ticks * 1000 if self.ticks else 0.0,
+            'max_tick_ms': self.max_tick_seconds * 1000,
+            'last_tick_ms': self.last_tick_seconds * 1000,
+            'samples': self.samples_dispatched,
+            'subscribers': {
+                subscription.name: {
+                    'calls': subscription.calls,
+                    'mean_ms': subscription.seconds / subscription.calls * 1000 if subscription.calls else 0.0,
+                    'max_ms': subscription.max_seconds * 1000,
+                }
+                for subscription in self.subscriptions
+            },
+        }
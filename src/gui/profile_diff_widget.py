@@ -0,0 +1,174 @@
+"""
+Profile comparison widget
+Shows two binding profiles side by side with their differences highlighted
+"""
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtGui import QColor
+from typing import Dict, List, Optional
+from src.core.binding_parser import BindingParser, merge_bindings
+from src.core.binding_diff import diff_profiles
+from src.models.binding_models import Binding
+
+
+# Row colours per kind of change
+CHANGE_COLORS = {
+    'added': "#2E7D32",
+    'removed': "#C62828",
+    'rebound': "#EF6C00",
+}
+
+
+class ProfileDiffView(QWidget):
+    """Widget that compares two profiles (instances or single layout files)"""
+
+    def __init__(self, binding_parser: BindingParser, parent=None):
+        super().__init__(parent)
+        # Separate parser so comparisons never disturb the loaded bindings; shares the
+        # cache and the installation discovery
+        self.binding_parser = BindingParser(cache=binding_parser.cache,
+                                            discovery=binding_parser.discovery)
+        self.binding_parser.devices = binding_parser.devices
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize the user interface"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        controls = QWidget()
+        controls_layout = QHBoxLayout(controls)
+        controls_layout.setContentsMargins(0, 0, 0, 0)
+
+        controls_layout.addWidget(QLabel("Left:"))
+        self.left_combo = QComboBox()
+        self.left_combo.setMinimumWidth(250)
+        controls_layout.addWidget(self.left_combo)
+
+        controls_layout.addWidget(QLabel("Right:"))
+        self.right_combo = QComboBox()
+        self.right_combo.setMinimumWidth(250)
+        controls_layout.addWidget(self.right_combo)
+
+        self.refresh_btn = QPushButton("Refresh Sources")
+        self.refresh_btn.clicked.connect(self.refresh_sources)
+        controls_layout.addWidget(self.refresh_btn)
+
+        self.compare_btn = QPushButton("Compare")
+        self.compare_btn.clicked.connect(self.compare)
+        controls_layout.addWidget(self.compare_btn)
+
+        controls_layout.addStretch()
+        layout.addWidget(controls)
+
+        self.summary_label = QLabel("Pick two profiles and click Compare.")
+        self.summary_label.setStyleSheet("color: #888888; padding: 5px;")
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Action", "Left Input(s)", "Right Input(s)", "Change"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: #2d2d2d;
+                color: #ffffff;
+                gridline-color: #3d3d3d;
+            }
+            QHeaderView::section {
+                background-color: #252525;
+                color: #ffffff;
+                padding: 4px;
+                border: 1px solid #3d3d3d;
+            }
+        """)
+        layout.addWidget(self.table)
+
+        self.refresh_sources()
+
+    def refresh_sources(self):
+        """List every installed instance and each of its binding files as a source"""
+        sources = []
+        for instance in self.binding_parser.detect_installed_instances():
+            sources.append((f"{instance} (all files merged)", (instance, None)))
+            for file_name in sorted(self.binding_parser.list_binding_files(instance)):
+                sources.append((f"{instance} / {file_name}", (instance, file_name)))
+
+        for combo in (self.left_combo, self.right_combo):
+            combo.clear()
+            for label, source in sources:
+                combo.addItem(label, source)
+
+        if len(sources) > 1:
+            self.right_combo.setCurrentIndex(1)
+
+    def load_source(self, source) -> Optional[List[Binding]]:
+        """
+        Load the joystick bindings of a comparison source
+
+        Args:
+            source: (instance, file name or None for the merged instance)
+
+        Returns:
+            Joystick binding list, or None if the source could not be read
+        """
+        instance, file_name = source
+        bindings_path = self.binding_parser.get_bindings_path(instance)
+        if not bindings_path:
+            return None
+
+        file_names = [file_name] if file_name else self.binding_parser.list_binding_files(instance)
+        ordered_files = self.binding_parser.order_binding_files(bindings_path, file_names)
+        file_bindings = self.binding_parser.parse_binding_files(bindings_path, ordered_files)
+        return merge_bindings(file_bindings, ordered_files)['joystick_bindings']
+
+    def compare(self):
+        """Diff the two selected sources and show the result"""
+        left_source = self.left_combo.currentData()
+        right_source = self.right_combo.currentData()
+        if not left_source or not right_source:
+            self.summary_label.setText("No profiles to compare.")
+            return
+
+        left = self.load_source(left_source)
+        right = self.load_source(right_source)
+        if left is None or right is None:
+            self.summary_label.setText("Could not read one of the selected profiles.")
+            return
+
+        self.show_diff(diff_profiles(left, right))
+
+    def show_diff(self, diff: Dict[str, List[Dict]]):
+        """
+        Fill the table from a diff_profiles result
+
+        Args:
+            diff: Result of diff_profiles
+        """
+        rows = []
+        for change in ('rebound', 'added', 'removed'):
+            for entry in diff[change]:
+                rows.append((change, entry))
+        rows.sort(key=lambda row: row[1]['action'])
+
+        self.table.setRowCount(len(rows))
+        for row, (change, entry) in enumerate(rows):
+            values = [
+                entry['action'],
+                ", ".join(entry['old_inputs']),
+                ", ".join(entry['new_inputs']),
+                change.title(),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 3:
+                    item.setForeground(QColor(CHANGE_COLORS[change]))
+                self.table.setItem(row, column, item)
+
+        self.summary_label.setText(
+            f"{len(diff['rebound'])} rebound | {len(diff['added'])} only on right | "
+            f"{len(diff['removed'])} only on left | {len(diff['inputs_changed'])} input(s) changed"
+        )
@@ -5,10 +5,14 @@ Displays joystick images with binding overlays
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QPixmap, QPainter, QFont, QColor, QPen, QImageReader
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 import pygame
 import sys
 import os
+from src.core.action_categories import ActionMode
+from src.core.binding_index import BindingIndex, Control, binding_control
+from src.core.input_tokenizer import KIND_BUTTON
+from src.models.binding_models import Binding
 
 # Increase Qt's image allocation limit to 512MB (default is 256MB)
 QImageReader.setAllocationLimit(512)
@@ -94,6 +98,10 @@ class VisualJoystickDiagram(QWidget):
         self.image_path = image_path
         self.left_bindings = {}  # button_num -> action text
         self.right_bindings = {}  # button_num -> action text
+        self.left_conflicts = set()  # button numbers bound to several actions
+        self.right_conflicts = set()
+        self.left_matches = set()  # button numbers bound to search results
+        self.right_matches = set()
         self.original_pixmap = QPixmap(image_path)
         self.init_ui()
 
@@ -125,11 +133,56 @@ class VisualJoystickDiagram(QWidget):
             left_bindings: Dict mapping button number -> action name for left stick
             right_bindings: Dict mapping button number -> action name for right stick
         """
-        self.left_bindings = left_bindings
-        self.right_bindings = right_bindings
-        self.update_display()
+        self.set_view_state(bindings=(left_bindings, right_bindings))
+
+    def set_conflicts(self, left_conflicts: set, right_conflicts: set):
+        """
+        Set the buttons to highlight as conflicting
+
+        Args:
+            left_conflicts: Conflicting button numbers on the left stick
+            right_conflicts: Conflicting button numbers on the right stick
+        """
+        self.set_view_state(conflicts=(left_conflicts, right_conflicts))
+
+    def set_matches(self, left_matches: set, right_matches: set):
+        """
+        Set the buttons to highlight as search results
+
+        Args:
+            left_matches: Matching button numbers on the left stick
+            right_matches: Matching button numbers on the right stick
+        """
+        self.set_view_state(matches=(left_matches, right_matches))
 
-    def draw_binding_text(self, painter: QPainter, x: int, y: int, text: str, alignment: str):
+    def set_view_state(self, bindings: Optional[Tuple[Dict[int, str], Dict[int, str]]] = None,
+                       conflicts: Optional[Tuple[set, set]] = None, matches: Optional[Tuple[set, set]] = None):
+        """
+        Replace any of the bindings, conflicts and search results with a single repaint
+
+        The diagram is re-rendered at full resolution, so callers changing
+        several of these at once should pass them together.
+
+        Args:
+            bindings: (left, right) button number -> action name, or None to keep the current ones
+            conflicts: (left, right) conflicting button numbers, or None to keep the current ones
+            matches: (left, right) matching button numbers, or None to keep the current ones
+        """
+        changed = False
+        if bindings is not None:
+            self.left_bindings, self.right_bindings = bindings
+            changed = True
+        if conflicts is not None and conflicts != (self.left_conflicts, self.right_conflicts):
+            self.left_conflicts, self.right_conflicts = conflicts
+            changed = True
+        if matches is not None and matches != (self.left_matches, self.right_matches):
+            self.left_matches, self.right_matches = matches
+            changed = True
+        if changed:
+            self.update_display()
+
+    def draw_binding_text(self, painter: QPainter, x: int, y: int, text: str, alignment: str,
+                          conflict: bool = False, match: bool = False):
         """
         Draw binding text at specified position with alignment
 
@@ -138,6 +191,8 @@ class VisualJoystickDiagram(QWidget):
             x, y: Position coordinates
             text: Binding action text
             alignment: 'left', 'center', or 'right'
+            conflict: Draw the box in red to mark a conflicting button
+            match: Fill the box in yellow to mark a search result
         """
         # Truncate long text
         max_length = 25
@@ -166,15 +221,16 @@ class VisualJoystickDiagram(QWidget):
             text_height + padding
         )
 
-        # White background
-        painter.fillRect(*bg_rect, QColor(255, 255, 255, 255))
+        # White background (yellow for search results)
+        painter.fillRect(*bg_rect, QColor(255, 235, 59, 255) if match else QColor(255, 255, 255, 255))
 
-        # Black border
-        painter.setPen(QPen(QColor(0, 0, 0), 3))
+        # Black border (red for conflicts)
+        color = QColor(198, 40, 40) if conflict else QColor(0, 0, 0)
+        painter.setPen(QPen(color, 6 if conflict else 3))
         painter.drawRect(*bg_rect)
 
-        # Draw black text on white background
-        painter.setPen(QPen(QColor(0, 0, 0)))
+        # Draw the text on white background
+        painter.setPen(QPen(color))
         painter.drawText(draw_x, y, text)
 
     def update_display(self):
@@ -199,13 +255,15 @@ class VisualJoystickDiagram(QWidget):
         for button_num, action in self.left_bindings.items():
             if button_num in LEFT_BUTTON_COORDS:
                 x, y, alignment = LEFT_BUTTON_COORDS[button_num]
-                self.draw_binding_text(painter, x, y, action, alignment)
+                self.draw_binding_text(painter, x, y, action, alignment, button_num in self.left_conflicts,
+                                       button_num in self.left_matches)
 
         # Draw right stick bindings
         for button_num, action in self.right_bindings.items():
             if button_num in RIGHT_BUTTON_COORDS:
                 x, y, alignment = RIGHT_BUTTON_COORDS[button_num]
-                self.draw_binding_text(painter, x, y, action, alignment)
+                self.draw_binding_text(painter, x, y, action, alignment, button_num in self.right_conflicts,
+                                       button_num in self.right_matches)
 
         painter.end()
 
@@ -235,7 +293,12 @@ class DualVisualJoystickView(QWidget):
         super().__init__(parent)
         self.left_bindings = {}
         self.right_bindings = {}
-        self.stick_ids = {}  # pygame ID -> 'left' or 'right'
+        self.stick_ids = {}  # SDL instance ID -> 'left' or 'right'
+        self.binding_index = None  # BindingIndex currently displayed
+        self.sc_to_instance_map = {}
+        self.mode = ActionMode.ALL
+        self.conflicts = {}  # (SC js number, control) -> conflicting actions to highlight
+        self.search_matches = set()  # (SC js number, control) of search results to highlight
         self.init_ui()
 
     def init_ui(self):
@@ -255,74 +318,255 @@ class DualVisualJoystickView(QWidget):
         scroll.setWidget(self.diagram)
         layout.addWidget(scroll)
 
-    def set_joysticks(self, joysticks: List[Dict]):
+    def add_joystick(self, joy: Dict) -> str:
         """
-        Set the detected joysticks
+        Assign a stick to a side of the diagram
 
         Args:
-            joysticks: List of joystick info dictionaries
-        """
-        # Map pygame IDs to left/right based on names
-        self.stick_ids = {}
-        for joy in joysticks:
-            joy_id = joy['id']
-            name_lower = joy['name'].lower()
+            joy: Joystick info dictionary
 
-            if 'left' in name_lower:
+        Returns:
+            'left' or 'right'
+        """
+        joy_id = joy['instance_id']
+        if joy_id in self.stick_ids:
+            return self.stick_ids[joy_id]
+
+        name_lower = joy['name'].lower()
+        if 'left' in name_lower:
+            self.stick_ids[joy_id] = 'left'
+        elif 'right' in name_lower:
+            self.stick_ids[joy_id] = 'right'
+        else:
+            # Default: first one is left, second is right
+            if not any(side == 'left' for side in self.stick_ids.values()):
                 self.stick_ids[joy_id] = 'left'
-            elif 'right' in name_lower:
+            else:
                 self.stick_ids[joy_id] = 'right'
+        return self.stick_ids[joy_id]
+
+    def remove_joystick(self, instance_id: int) -> Optional[str]:
+        """
+        Take a stick off the diagram
+
+        Args:
+            instance_id: SDL instance id of the stick
+
+        Returns:
+            The side it was on, or None if it was not on the diagram
+        """
+        return self.stick_ids.pop(instance_id, None)
+
+    def remap_sticks(self, changed: Iterable[int], sides: Iterable[str], sc_to_instance_map: Dict[int, int]):
+        """
+        Redraw only the sides of the diagram whose stick changed
+
+        Args:
+            changed: SC js numbers that point at a different stick, from DualJoystickView.remap_sticks
+            sides: Sides a stick was added to or removed from
+            sc_to_instance_map: Mapping from SC js number to SDL instance ID
+        """
+        self.sc_to_instance_map = sc_to_instance_map
+        sides = set(sides) | {self.stick_ids.get(sc_to_instance_map.get(sc_js_number)) for sc_js_number in changed}
+        sides.discard(None)
+        if self.binding_index is None or not sides:
+            return
+
+        for side in sides:
+            side_bindings = {}
+            for sc_js_number in self.binding_index.devices(self.mode):
+                if self.stick_ids.get(sc_to_instance_map.get(sc_js_number)) != side:
+                    continue
+                for (kind, button_num), on_control in self.binding_index.controls(sc_js_number, self.mode).items():
+                    if kind == KIND_BUTTON:
+                        side_bindings[button_num] = on_control[-1].action
+            if side == 'left':
+                self.left_bindings = side_bindings
             else:
-                # Default: first one is left, second is right
-                if not any(side == 'left' for side in self.stick_ids.values()):
-                    self.stick_ids[joy_id] = 'left'
-                else:
-                    self.stick_ids[joy_id] = 'right'
+                self.right_bindings = side_bindings
+
+        self.diagram.set_view_state(bindings=(self.left_bindings, self.right_bindings),
+                                    conflicts=self.conflict_sides(), matches=self.button_sides(self.search_matches))
 
-        print(f"\n📊 Visual diagram stick mapping:")
-        for joy_id, side in self.stick_ids.items():
-            joy_name = next((j['name'] for j in joysticks if j['id'] == joy_id), 'Unknown')
-            print(f"   Pygame ID {joy_id} ({joy_name}) → {side.upper()} side of diagram")
-        print()
+    def side_bindings(self, sc_js_number: int) -> Optional[Dict[int, str]]:
+        """
+        Get the left or right binding dict for an SC js number
+
+        Args:
+            sc_js_number: SC js number (1-based)
 
-    def update_bindings(self, bindings: List[Dict], sc_to_pygame_map: Dict[int, int]):
+        Returns:
+            self.left_bindings, self.right_bindings, or None if the stick is not on the diagram
+        """
+        side = self.stick_ids.get(self.sc_to_instance_map.get(sc_js_number))
+        if side == 'left':
+            return self.left_bindings
+        if side == 'right':
+            return self.right_bindings
+        return None
+
+    def update_bindings(self, binding_index: BindingIndex, sc_to_instance_map: Dict[int, int],
+                        mode: ActionMode = ActionMode.ALL, conflicts: Optional[Dict] = None,
+                        matches: Optional[set] = None):
         """
         Update bindings on the visual diagram
 
         Args:
-            bindings: List of binding dictionaries
-            sc_to_pygame_map: Mapping from SC js number to pygame ID
+            binding_index: Index of the loaded joystick bindings
+            sc_to_instance_map: Mapping from SC js number to SDL instance ID
+            mode: Only show bindings of this mode
+            conflicts: New conflicts to highlight in the same repaint (None keeps the current ones)
+            matches: New search results to highlight in the same repaint (None keeps the current ones)
         """
         # Clear previous bindings
         self.left_bindings = {}
         self.right_bindings = {}
+        self.binding_index = binding_index
+        self.sc_to_instance_map = sc_to_instance_map
+        self.mode = mode
+        if conflicts is not None:
+            self.conflicts = conflicts
+        if matches is not None:
+            self.search_matches = matches
 
         # Sort bindings by stick (left/right)
-        for binding in bindings:
-            input_str = binding.get('input', '')
-            action = binding.get('action', '')
+        for sc_js_number in binding_index.devices(mode):
+            side_bindings = self.side_bindings(sc_js_number)
+            if side_bindings is None:
+                continue
 
-            # Parse input
-            from src.gui.joystick_widget import DualJoystickView
-            temp_view = DualJoystickView()
-            parsed = temp_view.parse_input_string(input_str)
+            for (kind, button_num), on_control in binding_index.controls(sc_js_number, mode).items():
+                if kind == KIND_BUTTON:
+                    side_bindings[button_num] = on_control[-1].action
 
-            sc_js_number = parsed.get('sc_js_number')
-            button_num = parsed.get('button')
+        # Update diagram with separate left/right bindings
+        self.diagram.set_view_state(bindings=(self.left_bindings, self.right_bindings),
+                                    conflicts=self.conflict_sides(), matches=self.button_sides(self.search_matches))
 
-            if sc_js_number and button_num:
-                # Map to pygame ID
-                pygame_id = sc_to_pygame_map.get(sc_js_number)
+        print(f"📊 Visual diagram updated: {len(self.left_bindings)} left bindings, {len(self.right_bindings)} right bindings")
 
-                # Determine which side (left/right)
-                side = self.stick_ids.get(pygame_id)
+    def conflict_sides(self):
+        """
+        Split the conflicting buttons into left and right stick sets
 
-                if side == 'left':
-                    self.left_bindings[button_num] = action
-                elif side == 'right':
-                    self.right_bindings[button_num] = action
+        Returns:
+            (left button numbers, right button numbers)
+        """
+        return self.button_sides(self.conflicts)
 
-        # Update diagram with separate left/right bindings
-        self.diagram.set_bindings(self.left_bindings, self.right_bindings)
+    def button_sides(self, controls: Iterable):
+        """
+        Split controls into left and right stick button sets
 
-        print(f"📊 Visual diagram updated: {len(self.left_bindings)} left bindings, {len(self.right_bindings)} right bindings")
+        Args:
+            controls: (SC js number, control) pairs
+
+        Returns:
+            (left button numbers, right button numbers)
+        """
+        left, right = set(), set()
+        for sc_js_number, (kind, button_num) in controls:
+            side_bindings = self.side_bindings(sc_js_number)
+            if kind != KIND_BUTTON or side_bindings is None:
+                continue
+            (left if side_bindings is self.left_bindings else right).add(button_num)
+        return left, right
+
+    def set_conflicts(self, conflicts: Dict):
+        """
+        Replace the highlighted conflicts
+
+        Args:
+            conflicts: (SC js number, control) -> conflicting actions, from conflict_controls
+        """
+        self.set_view_state(conflicts=conflicts)
+
+    def set_search_matches(self, matches: set):
+        """
+        Replace the highlighted search results
+
+        Args:
+            matches: (SC js number, control) pairs of the matching bindings
+        """
+        self.set_view_state(matches=matches)
+
+    def refresh_buttons(self, controls: Iterable[Tuple[int, Control]]) -> bool:
+        """
+        Re-read the displayed binding of some controls from the index, without repainting
+
+        Args:
+            controls: (SC js number, control) pairs
+
+        Returns:
+            True if any of them is a button on the diagram
+        """
+        refreshed = False
+        for sc_js_number, control in controls:
+            side_bindings = self.side_bindings(sc_js_number)
+            kind, button_num = control
+            if side_bindings is None or kind != KIND_BUTTON:
+                continue
+
+            on_control = self.binding_index.bindings_on(sc_js_number, control, self.mode)
+            if on_control:
+                side_bindings[button_num] = on_control[-1].action
+            else:
+                side_bindings.pop(button_num, None)
+            refreshed = True
+        return refreshed
+
+    def refresh_controls(self, bindings: List[Binding], sc_to_instance_map: Dict[int, int],
+                         conflicts: Optional[Dict] = None, matches: Optional[set] = None):
+        """
+        Redraw only the buttons the given bindings sit on
+
+        Call after the binding index was updated incrementally.
+
+        Args:
+            bindings: Bindings that were added, removed or changed
+            sc_to_instance_map: Mapping from SC js number to SDL instance ID
+            conflicts: New conflicts to highlight in the same repaint (None keeps the current ones)
+            matches: New search results to highlight in the same repaint (None keeps the current ones)
+        """
+        if self.binding_index is None:
+            return
+
+        self.sc_to_instance_map = sc_to_instance_map
+        touched = {binding_control(binding) for binding in bindings}
+        touched.discard(None)
+        self.set_view_state(changed=touched, conflicts=conflicts, matches=matches)
+
+    def set_mode(self, mode: ActionMode, changed: List[Tuple[int, Control]]):
+        """
+        Switch the shown mode, updating only the buttons that differ
+
+        Args:
+            mode: ActionMode to show
+            changed: (SC js number, control) pairs from BindingIndex.changed_controls
+        """
+        self.set_view_state(mode, changed)
+
+    def set_view_state(self, mode: Optional[ActionMode] = None, changed: Iterable[Tuple[int, Control]] = (),
+                       conflicts: Optional[Dict] = None, matches: Optional[set] = None):
+        """
+        Apply a mode switch, changed controls, conflicts and search results with one diagram repaint
+
+        Args:
+            mode: ActionMode to show (None keeps the current one)
+            changed: (SC js number, control) pairs whose displayed binding may differ
+            conflicts: (SC js number, control) -> conflicting actions (None keeps the current ones)
+            matches: (SC js number, control) pairs of the search results (None keeps the current ones)
+        """
+        if mode is not None:
+            self.mode = mode
+        if conflicts is not None:
+            self.conflicts = conflicts
+        if matches is not None:
+            self.search_matches = matches
+
+        refreshed = self.binding_index is not None and self.refresh_buttons(changed)
+        self.diagram.set_view_state(
+            bindings=(self.left_bindings, self.right_bindings) if refreshed else None,
+            conflicts=self.conflict_sides() if conflicts is not None else None,
+            matches=self.button_sides(matches) if matches is not None else None,
+        )
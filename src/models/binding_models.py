@@ -0,0 +1,101 @@
+"""
+Binding record models
+Compact storage for parsed Star Citizen rebinds
+"""
+import sys
+from typing import Callable, Iterable, List, Optional
+
+
+class Binding:
+    """A single rebind: an action bound to one input"""
+
+    __slots__ = ('action', 'input', 'multi_tap', 'device', 'actionmap')
+
+    def __init__(self, action: str, input: str, multi_tap: str = '', actionmap: str = ''):
+        """
+        Create a binding record
+
+        Action, input, multiTap and actionmap strings are interned, so the
+        thousands of repeats across a profile (and across merged files)
+        share one object.
+
+        Args:
+            action: SC action name, e.g. "v_pitch"
+            input: SC input string, e.g. "js2_y"
+            multi_tap: multiTap attribute of the rebind ('' if absent)
+            actionmap: Name of the enclosing <actionmap> ('' if unknown)
+        """
+        self.action = sys.intern(action)
+        self.input = sys.intern(input)
+        self.multi_tap = sys.intern(multi_tap)
+        # Device prefix ('js', 'kb', 'mo', ...) for cheap filtering
+        self.device = sys.intern(input[:2].lower())
+        # Where the action lives; not part of equality, which compares the rebind itself
+        self.actionmap = sys.intern(actionmap)
+
+    def key(self) -> tuple:
+        """Identity of the binding within a profile: (action, input)"""
+        return (self.action, self.input)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Binding):
+            return NotImplemented
+        return (self.action == other.action and self.input == other.input
+                and self.multi_tap == other.multi_tap)
+
+    def __hash__(self) -> int:
+        return hash((self.action, self.input, self.multi_tap))
+
+    def __repr__(self) -> str:
+        multi_tap = f", multi_tap={self.multi_tap!r}" if self.multi_tap else ""
+        return f"Binding({self.action!r}, {self.input!r}{multi_tap})"
+
+    def __getstate__(self):
+        return (self.action, self.input, self.multi_tap, self.actionmap)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+class BindingCollection(list):
+    """List of Binding records with filtering helpers"""
+
+    def filter(self, device: Optional[str] = None, action_prefix: Optional[str] = None,
+               predicate: Optional[Callable[[Binding], bool]] = None) -> 'BindingCollection':
+        """
+        Select bindings matching all given criteria
+
+        Args:
+            device: Device prefix to keep ('js', 'kb', 'mo')
+            action_prefix: Keep actions starting with this prefix
+            predicate: Extra test applied to each binding
+
+        Returns:
+            New BindingCollection with the matching bindings
+        """
+        selected: Iterable[Binding] = self
+        if device is not None:
+            selected = [binding for binding in selected if binding.device == device]
+        if action_prefix is not None:
+            selected = [binding for binding in selected if binding.action.startswith(action_prefix)]
+        if predicate is not None:
+            selected = [binding for binding in selected if predicate(binding)]
+        return BindingCollection(selected)
+
+    def actions(self) -> List[str]:
+        """
+        Get the distinct action names, in first-seen order
+
+        Returns:
+            List of action names
+        """
+        return list(dict.fromkeys(binding.action for binding in self))
+
+    def inputs(self) -> List[str]:
+        """
+        Get the distinct input strings, in first-seen order
+
+        Returns:
+            List of input strings
+        """
+        return list(dict.fromkeys(binding.input for binding in self))